@@ -46,8 +46,8 @@ class MilestonesStats(BedwarsStats):
         value_at_ratio = round(value_good * target_ratio / current_ratio)
 
         if self.session is not None:
-            session_good: int = value_good - self.session.data.__dict__[key_good]
-            session_bad: int = value_bad - self.session.data.__dict__[key_bad]
+            session_good: int = value_good - self.session.data.get(key_good)
+            session_bad: int = value_bad - self.session.data.get(key_bad)
             session_ratio = (session_good or 1) / (session_bad or 1)
 
             if session_good or session_bad:
@@ -79,7 +79,7 @@ class AverageCommandCog(commands.Cog):
 
         skin_model, hypixel_data = await asyncio.gather(
             lib.network.fetch_skin_model(uuid),
-            lib.network.fetch_hypixel_data(uuid)
+            lib.network.fetch_hypixel_data(uuid, stale_while_revalidate=True)
         )
 
         renderer = AverageStatsRenderer(skin_model, name, hypixel_data, lib.ModesEnum.OVERALL.value)
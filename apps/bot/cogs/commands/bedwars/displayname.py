@@ -19,8 +19,9 @@ class DisplayNameCommandCog(commands.Cog):
         name, uuid = await helper.interactions.fetch_player_info(player, interaction)
         hypixel_data = await lib.network.fetch_hypixel_data(uuid)
 
+        # Cached responses are shared, so they must not be mutated
         if not hypixel_data.get('player'):
-            hypixel_data['player'] = {}
+            hypixel_data = {**hypixel_data, 'player': {}}
 
         rendered = await render_displayname(name, hypixel_data)
         await interaction.followup.send(
@@ -1,84 +1,96 @@
 import asyncio
 import logging
-from copy import deepcopy
 from datetime import UTC, datetime, timedelta
 from typing import final
 
-import discord
 from discord.ext import commands, tasks
-from statalib.hypixel.lbs import LiveLeaderboardsRepo
-from statalib.hypixel.lbs.db import GuildLiveLeaderboard
+from statalib import config
+from statalib.hypixel.lbs import LeaderboardSnapshot, LiveLeaderboardsRepo
+from statalib.hypixel.lbs.models import GuildLeaderboardDelivery
 from typing_extensions import override
 
 import helper
+from helper.live_leaderboards import LiveLeaderboardDelivery, LiveLeaderboardUpdateReport
 
 logger = logging.getLogger(__name__)
 
-UPDATE_GAP = 60 * 60 * 24  # Seconds
+UPDATE_GAP = 60 * 60  # Seconds
+# Unchanged leaderboards are still delivered this often, since the uploaded
+# image URLs shown by the live leaderboards expire
+MAX_DELIVERY_AGE = 60 * 60 * 12  # Seconds
+LIVE_LEADERBOARD_PATHS = ("bedwars_level", "wins_new", "final_kills_new")
+DELIVERY_CONCURRENCY = 8  # Guilds updated at once
 
 
-class UpdateLiveLb:
-    def __init__(self, leaderboard_path: str, client: helper.Client) -> None:
-        self._lb_path: str = leaderboard_path
-        self.client: helper.Client = client
+def _is_due(
+    last_delivery: GuildLeaderboardDelivery | None,
+    digest: str | None,
+    update_dt: datetime,
+) -> bool:
+    return (
+        last_delivery is None
+        or last_delivery.digest != digest
+        or update_dt.timestamp() - last_delivery.delivered_at >= MAX_DELIVERY_AGE
+    )
 
-    async def _build_embeds_and_files(
-        self,
-    ) -> tuple[list[discord.Embed], list[discord.File]]:
-        return await helper.leaderboards.generate_embeds_for_leaderboard_path(
-            self._lb_path
-        )
 
-    async def _update_guild_live_lb(
+class UpdateLiveLb:
+    def __init__(
         self,
-        live_lb: GuildLiveLeaderboard,
-        embeds: list[discord.Embed],
-        files: list[discord.File],
-        update_dt: datetime,
+        leaderboard_path: str,
+        client: helper.Client,
+        snapshot: LeaderboardSnapshot | None = None,
     ) -> None:
-        channel = self.client.get_channel(live_lb.channel_id)
-
-        if not isinstance(channel, discord.TextChannel):
-            return
+        self._lb_path: str = leaderboard_path
+        self.client: helper.Client = client
+        self._snapshot: LeaderboardSnapshot | None = snapshot
 
-        lb_msg = channel.get_partial_message(live_lb.message_id)
+    async def update(self) -> LiveLeaderboardUpdateReport | None:
+        update_dt = datetime.now(UTC)
 
-        next_update = update_dt + timedelta(seconds=UPDATE_GAP)
-        content = (
-            f"Last updated <t:{int(update_dt.timestamp())}:R>\n"
-            + f"Next update <t:{int(next_update.timestamp())}:R>"
+        # Rendered once, every guild is sent the same images. Only the
+        # chunks that changed since the last update are rendered again
+        rendered = await helper.leaderboards.render_leaderboard_path(
+            self._lb_path, self._snapshot, incremental=True
         )
-
-        try:
-            # Make copy of files so that they arent modified by this call
-            # in such a case that new a message has to be made.
-            _ = await lb_msg.edit(
-                content=content, embeds=embeds, attachments=deepcopy(files)
-            )
-        except discord.errors.NotFound:
-            # Create new message
-            lb_msg = await channel.send(content=content, embeds=embeds, files=files)
-
-            live_lb.message_id = lb_msg.id
-            _ = await LiveLeaderboardsRepo.set_live_leaderboard(live_lb)
-
-    async def update(self) -> None:
-        update_dt = datetime.now(UTC)
-        embeds, files = await self._build_embeds_and_files()
+        await helper.leaderboards.store_rendered_chunks(self._lb_path, rendered)
 
         live_lbs = await LiveLeaderboardsRepo.get_all_live_lbs_for_lb_path(
             self._lb_path
         )
+        deliveries = await LiveLeaderboardsRepo.get_guild_deliveries(self._lb_path)
+
+        # Each guild is delivered to until it is sent the current leaderboard,
+        # so failed deliveries are retried without editing every other guild
+        due_live_lbs = [
+            live_lb for live_lb in live_lbs
+            if _is_due(deliveries.get(live_lb.guild_id), rendered.digest, update_dt)
+        ]
+        if not due_live_lbs:
+            logger.info(f"Live leaderboard '{self._lb_path}' is unchanged, skipping delivery")
+            return None
+
+        delivery = LiveLeaderboardDelivery(
+            self.client,
+            self._lb_path,
+            rendered,
+            concurrency=DELIVERY_CONCURRENCY,
+            storage_channel_id=config(
+                "global.support_server.channels.live_leaderboard_storage_channel_id"),
+        )
+        report = await delivery.deliver(due_live_lbs, update_dt)
 
-        for live_lb in live_lbs:
-            try:
-                await self._update_guild_live_lb(live_lb, embeds, files, update_dt)
-            except (
-                discord.errors.Forbidden,
-                discord.errors.HTTPException,
-                discord.errors.NotFound,
-            ) as exc:
-                logger.error("Failed to update live leaderboard:", exc_info=exc)
+        if report.delivered and rendered.digest is not None:
+            await LiveLeaderboardsRepo.set_guild_deliveries(
+                self._lb_path,
+                report.delivered,
+                GuildLeaderboardDelivery(rendered.digest, update_dt.timestamp()),
+            )
+
+        for guild_id, reason in report.failed.items():
+            logger.error(f"Failed to update live leaderboard of guild {guild_id}: {reason}")
+
+        return report
 
 
 @final
@@ -90,9 +102,11 @@ class UpdateLiveLeaderboardsCog(commands.Cog):
     async def update_live_leaderboards_loop(self):
         await self.client.wait_until_ready()
 
-        await UpdateLiveLb("bedwars_level", self.client).update()
-        await UpdateLiveLb("wins_new", self.client).update()
-        await UpdateLiveLb("final_kills_new", self.client).update()
+        # Every path is built from one snapshot, so shared leaders are fetched once
+        snapshot = await LeaderboardSnapshot.fetch(LIVE_LEADERBOARD_PATHS)
+
+        for lb_path in LIVE_LEADERBOARD_PATHS:
+            await UpdateLiveLb(lb_path, self.client, snapshot).update()
 
     @update_live_leaderboards_loop.error
     async def on_loop_error(self, error: BaseException):
@@ -112,13 +126,11 @@ class UpdateLiveLeaderboardsCog(commands.Cog):
 
     @update_live_leaderboards_loop.before_loop
     async def before_update_listings(self):
-        # Wait for next day to start
+        # Wait for next hour to start
         now = datetime.now(UTC)
-        tmr = datetime.now(UTC).replace(
-            day=now.day + 1, hour=0, minute=0, second=0, microsecond=0
-        )
+        next_hour = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
 
-        delta = tmr - now
+        delta = next_hour - now
         await asyncio.sleep(delta.total_seconds())
 
 
@@ -109,7 +109,7 @@ class QuestsCommandCog(commands.Cog):
 
         skin_model, hypixel_data = await asyncio.gather(
             lib.network.fetch_skin_model(uuid),
-            lib.network.fetch_hypixel_data(uuid),
+            lib.network.fetch_hypixel_data(uuid, stale_while_revalidate=True),
         )
 
         renderer = QuestStatsRenderer(skin_model, name, hypixel_data)
@@ -79,7 +79,7 @@ class ResourcesCommandCog(commands.Cog):
         name, uuid = await helper.interactions.fetch_player_info(player, interaction)
 
         hypixel_data, skin_model = await asyncio.gather(
-            lib.network.fetch_hypixel_data(uuid),
+            lib.network.fetch_hypixel_data(uuid, stale_while_revalidate=True),
             lib.network.fetch_skin_model(uuid)
         )
 
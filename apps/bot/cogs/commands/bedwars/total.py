@@ -153,7 +153,7 @@ class GenericStatsCommandCog(commands.Cog):
 
         skin_model, hypixel_data = await asyncio.gather(
             lib.network.fetch_skin_model(uuid),
-            lib.network.fetch_hypixel_data(uuid),
+            lib.network.fetch_hypixel_data(uuid, stale_while_revalidate=True),
         )
 
         if not dreams:
@@ -6,7 +6,7 @@ import discord
 from http.client import RemoteDisconnected
 from json import JSONDecodeError
 
-from aiohttp import ClientSession, ClientTimeout, ContentTypeError, ClientConnectionError
+from aiohttp import ClientTimeout, ContentTypeError, ClientConnectionError
 from discord import app_commands
 from discord.ext import commands
 from requests import ReadTimeout, ConnectTimeout
@@ -18,12 +18,13 @@ import helper
 class NumberDenickCommandCog(commands.Cog):
     async def fetch_denick_data(self, mode: str, count: int):
         try:
-            async with ClientSession() as session:
-                res = await session.get(
-                    url=f"https://api.antisniper.net/v2/other/denick/number/{mode}?value={count}",
-                    headers={"Apikey": os.getenv('API_KEY_ANTISNIPER') or ""},
-                    timeout=ClientTimeout(total=10)
-                )
+            session = lib.network.http_sessions.session("default")
+
+            async with session.get(
+                url=f"https://api.antisniper.net/v2/other/denick/number/{mode}?value={count}",
+                headers={"Apikey": os.getenv('API_KEY_ANTISNIPER') or ""},
+                timeout=ClientTimeout(total=10)
+            ) as res:
                 return await res.json()
         except (ReadTimeout, ConnectTimeout, TimeoutError, asyncio.TimeoutError,
                 JSONDecodeError, RemoteDisconnected, ContentTypeError, ClientConnectionError):
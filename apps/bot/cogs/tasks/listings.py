@@ -4,7 +4,7 @@ import logging
 from datetime import datetime
 from typing_extensions import override
 
-from aiohttp import ClientError, ClientSession, ClientTimeout
+from aiohttp import ClientError, ClientTimeout
 from discord.ext import commands, tasks
 
 import statalib as lib
@@ -32,45 +32,48 @@ class BotListingUpdatesCog(commands.Cog):
 
         client_id = self.client.user.id
 
-        async with ClientSession() as session:
-            res1 = await session.post(
-                url=f'https://top.gg/api/bots/{client_id}/stats',
-                data={'server_count': guild_count},
-                headers={'Authorization': self.TOPGG_TOKEN},
-                timeout=ClientTimeout(total=10)
-            )
-
-            res2 = await session.post(
-                url=f'https://discordbotlist.com/api/v1/bots/{client_id}/stats',
-                data={
-                    'guilds': guild_count,
-                    'users': total_users
-                },
-                headers={'Authorization': self.DBL_TOKEN},
-                timeout=ClientTimeout(total=10)
-            )
-
-            res3 = await session.post(
-                url=f'https://discords.com/bots/api/bot/{client_id}',
-                data={'server_count': guild_count},
-                headers={'Authorization': self.DISCORDS_TOKEN},
-                timeout=ClientTimeout(total=10)
-            )
-
-            res4 = await session.post(
-                url=f'https://api.botlist.me/api/v1/bots/{client_id}/stats',
-                data={'server_count': guild_count},
-                headers={'Authorization': self.BOTLIST_TOKEN},
-                timeout=ClientTimeout(total=10)
-            )
-
+        listings = (
+            (
+                f'https://top.gg/api/bots/{client_id}/stats',
+                {'server_count': guild_count},
+                self.TOPGG_TOKEN
+            ),
+            (
+                f'https://discordbotlist.com/api/v1/bots/{client_id}/stats',
+                {'guilds': guild_count, 'users': total_users},
+                self.DBL_TOKEN
+            ),
+            (
+                f'https://discords.com/bots/api/bot/{client_id}',
+                {'server_count': guild_count},
+                self.DISCORDS_TOKEN
+            ),
+            (
+                f'https://api.botlist.me/api/v1/bots/{client_id}/stats',
+                {'server_count': guild_count},
+                self.BOTLIST_TOKEN
+            ),
+        )
+
+        for url, data, token in listings:
+            await self._update_listing(url, data, token)
+
+
+    async def _update_listing(self, url: str, data: dict, token: str) -> None:
+        session = lib.network.http_sessions.session("default")
+
+        # Each response is released back to the shared session on its own,
+        # so a failed listing neither leaks a connection nor skips the others
         try:
-            res1.raise_for_status()
-            res2.raise_for_status()
-            res3.raise_for_status()
-            res4.raise_for_status()
-        except ClientError as exc:
-            logger.error("Bot listing update failed:", exc_info=exc)
+            async with session.post(
+                url=url,
+                data=data,
+                headers={'Authorization': token},
+                timeout=ClientTimeout(total=10)
+            ) as res:
+                res.raise_for_status()
+        except (ClientError, asyncio.TimeoutError) as exc:
+            logger.error(f"Bot listing update failed ({url}):", exc_info=exc)
 
 
     @update_listings_loop.error
@@ -1,4 +1,4 @@
-from . import interactions, views, leaderboards, emoji, embeds, handlers, tips
+from . import interactions, views, leaderboards, live_leaderboards, emoji, embeds, handlers, tips
 from .embeds import Embeds
 from .client import Client
 from .cooldowns import generic_command_cooldown
@@ -15,6 +15,7 @@ __all__ = [
     "username_autocompletion",
     "app_command",
     "leaderboards",
+    "live_leaderboards",
     "emoji",
     "embeds",
     "Embeds",
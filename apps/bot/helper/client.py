@@ -1,9 +1,10 @@
+import asyncio
 import json
 import logging
 from datetime import datetime, UTC
 
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 
 import statalib as lib
 from .views import PremiumInfoView
@@ -42,6 +43,31 @@ class Client(commands.AutoShardedBot):
         with open(f'{lib.REL_PATH}/database/uptime.json', 'w') as datafile:
             json.dump({"start_time": datetime.now(UTC).timestamp()}, datafile, indent=4)
 
+        _ = self.flush_command_usage_loop.start()
+
+        # Warmed in the background so startup isn't held up by recoloring
+        self._warm_theme_variants_task = asyncio.create_task(
+            asyncio.to_thread(lib.render.theme_variants.warm_theme_variants))
+
+
+    @tasks.loop(seconds=lib.usage.USAGE_FLUSH_INTERVAL)
+    async def flush_command_usage_loop(self):
+        await asyncio.to_thread(lib.usage.CommandMetricsRepo.flush_command_usage)
+
+
+    @flush_command_usage_loop.error
+    async def on_flush_command_usage_error(self, error):
+        logger.error("Failed to flush command usage", exc_info=error)
+        self.flush_command_usage_loop.restart()
+
+
+    async def close(self):
+        self.flush_command_usage_loop.cancel()
+        await super().close()
+
+        lib.usage.CommandMetricsRepo.flush_command_usage()
+        await lib.network.close_sessions()
+        await lib.db.close_pools()
 
     async def on_ready(self):
         logger.info(f'Logged in as {self.user} (ID: {self.user.id})\n------')
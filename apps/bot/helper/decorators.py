@@ -19,7 +19,7 @@ def update_command_usage_check(command_id: str, should_update: bool=True):
         return fake 
 
     def predicate(interaction: Interaction) -> Literal[True]:
-        lib.usage.CommandMetricsRepo.update_command_usage(command_id, interaction.user.id)
+        lib.usage.CommandMetricsRepo.record_command_usage(command_id, interaction.user.id)
         return True
 
     return predicate
@@ -56,7 +56,8 @@ def app_command(
         @app_commands.autocomplete(**autocompletes)
         @functools.wraps(command)
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
-            return await command(*args, **kwargs)
+            # One pooled connection and transaction for the whole interaction
+            return await lib.db.run_in_interaction_scope(command(*args, **kwargs))
 
         return wrapper  # type: ignore
     
@@ -66,3 +66,14 @@ class ErrorEmbeds:
         )
         return embed
 
+
+    @staticmethod
+    def renderer_unavailable() -> Embed:
+        """Rendering server unavailable error."""
+        embed = Embed(
+            title="Rendering Unavailable",
+            description="Stats images can't be rendered right now as the rendering "
+            + "service is having issues.\nPlease try again in a minute!",
+            color=config.embed_color("danger"),
+        )
+        return embed
@@ -13,6 +13,7 @@ from statalib.errors import (
     MissingPermissionsError,
     MojangInvalidResponseError,
     PlayerNotFoundError,
+    RendererUnavailableError,
     SessionNotFoundError,
     UserBlacklistedError,
 )
@@ -81,6 +82,14 @@ async def _handle_mojang_error(interaction: discord.Interaction):
         pass
 
 
+async def _handle_renderer_error(interaction: discord.Interaction):
+    try:
+        embed = ErrorEmbeds.renderer_unavailable()
+        _ = await interaction.edit_original_response(content=None, embed=embed)
+    except discord.errors.NotFound:
+        pass
+
+
 async def _handle_cooldown_error(
     interaction: discord.Interaction, error: discord.app_commands.CommandOnCooldown
 ) -> None:
@@ -143,6 +152,10 @@ async def handle_interaction_errors(
             await _handle_mojang_error(interaction)
             return
 
+        if isinstance(original, RendererUnavailableError):
+            await _handle_renderer_error(interaction)
+            return
+
     if isinstance(error, app_commands.CommandOnCooldown):
         await _handle_cooldown_error(interaction, error)
         return
@@ -1,73 +1,238 @@
+import asyncio
+import hashlib
 import logging
 import math
-from typing import AsyncGenerator
+from dataclasses import dataclass
+from io import BytesIO
+from typing import AsyncGenerator, AsyncIterator
 
 import discord
 import statalib as lib
-from statalib.hypixel.lbs import LeaderboardData, LeaderboardPlayerEntry
+from statalib.hypixel.lbs import (
+    LeaderboardData,
+    LeaderboardPlayerEntry,
+    LeaderboardSnapshot,
+    LiveLeaderboardsRepo,
+)
+from statalib.hypixel.lbs.models import LeaderboardChunk, leaderboard_chunk_digest
 
 from render.leaderboards import render_leaderboard_chunk
 
 
-async def generate_leaderboard_images(
-    lb: LeaderboardData,
-) -> AsyncGenerator[tuple[discord.File, int, int], None]:
-    players = lib.hypixel.lbs.fetch.fetch_leaderboard_players(lb)
-
-    entries_per_img = 10
-    total_entries = len(lb.leaders)
-    total_groups = math.ceil(total_entries / entries_per_img)
+async def _iter_entries(
+    entries: list[LeaderboardPlayerEntry],
+) -> AsyncGenerator[LeaderboardPlayerEntry, None]:
+    for entry in entries:
+        yield entry
 
-    i = 0
-    profiles: list[LeaderboardPlayerEntry] = []
-    async for profile in players:
-        logging.debug(f"Received profile: {profile.username} - {profile.value}")
-        profiles.append(profile)
 
-        if (i + 1) % entries_per_img == 0 or i + 1 == total_entries:
-            # Last partial set of entries
-            if (i + 1) % entries_per_img != 0 and i + 1 == total_entries:
-                starting_pos = (i + 1) - (i + 1) % entries_per_img + 1
-                image_index = total_groups - 1
-            else:
-                starting_pos = (i + 1) - entries_per_img + 1
-                image_index = int((i - (entries_per_img - 1)) / entries_per_img)
+ENTRIES_PER_IMAGE = 10
 
-            lb_img = await render_leaderboard_chunk(
-                lb,
-                profiles,
-                starting_pos=starting_pos,
-                include_header=i + 1 == entries_per_img,
-            )
 
-            file = discord.File(lb_img, filename=f"lb-{image_index}.png")
-            yield file, image_index + 1, total_groups
+def _chunk_options(image_index: int, profiles: list[LeaderboardPlayerEntry]) -> dict:
+    return {
+        "starting_pos": image_index * ENTRIES_PER_IMAGE + 1,
+        "include_header": image_index == 0 and len(profiles) == ENTRIES_PER_IMAGE,
+    }
 
-            profiles = []
 
-        i += 1
+async def _render_chunk(
+    lb: LeaderboardData, image_index: int, profiles: list[LeaderboardPlayerEntry]
+) -> bytes:
+    lb_img: BytesIO = await render_leaderboard_chunk(
+        lb, profiles, **_chunk_options(image_index, profiles)
+    )
+    return lb_img.getvalue()
 
 
+async def generate_leaderboard_pngs(
+    lb: LeaderboardData,
+    entries: list[LeaderboardPlayerEntry] | None = None,
+) -> AsyncGenerator[tuple[bytes, int, int], None]:
+    players: AsyncIterator[LeaderboardPlayerEntry]
+    if entries is None:
+        players = lib.hypixel.lbs.fetch.fetch_leaderboard_players(lb)
+        total_entries = len(lb.leaders)
+    else:
+        players = _iter_entries(entries)
+        total_entries = len(entries)
+
+    total_groups = math.ceil(total_entries / ENTRIES_PER_IMAGE)
+
+    # Each group is rendered while the players of the next groups arrive
+    renders: list[asyncio.Task[bytes]] = []
+    profiles: list[LeaderboardPlayerEntry] = []
+    rendered = 0
 
-async def generate_embeds_for_leaderboard_path(
-    lb_path: str,
-) -> tuple[list[discord.Embed], list[discord.File]]:
-    bedwars_lbs = await lib.hypixel.lbs.fetch_bedwars_leaderboards()
     try:
-        lb = [lb for lb in bedwars_lbs if lb.info.path == lb_path][0]
-    except IndexError as exc:
-        raise ValueError(f"Leaderboard path '{lb_path}' is invalid!") from exc
+        async for profile in players:
+            logging.debug(f"Received profile: {profile.username} - {profile.value}")
+            profiles.append(profile)
+
+            if len(profiles) == ENTRIES_PER_IMAGE:
+                renders.append(asyncio.create_task(_render_chunk(lb, len(renders), profiles)))
+                profiles = []
+
+            while rendered < len(renders) and renders[rendered].done():
+                rendered += 1
+                yield renders[rendered - 1].result(), rendered, total_groups
 
-    files: list[discord.File] = []
+        # Last partial set of entries
+        if profiles:
+            renders.append(asyncio.create_task(_render_chunk(lb, len(renders), profiles)))
 
-    async for image, _, _ in generate_leaderboard_images(lb):
-        files.append(image)
+        while rendered < len(renders):
+            rendered += 1
+            yield await renders[rendered - 1], rendered, total_groups
+    finally:
+        for render in renders:
+            render.cancel()
 
-    embeds = [
-        discord.Embed(color=0x202026).set_image(url=f"attachment://{file.filename}")
-        for file in files
+
+async def generate_leaderboard_images(
+    lb: LeaderboardData,
+    entries: list[LeaderboardPlayerEntry] | None = None,
+) -> AsyncGenerator[tuple[discord.File, int, int], None]:
+    async for image, image_number, total_groups in generate_leaderboard_pngs(lb, entries):
+        file = discord.File(BytesIO(image), filename=f"lb-{image_number - 1}.png")
+        yield file, image_number, total_groups
+
+
+@dataclass(frozen=True)
+class RenderedLeaderboard:
+    """The rendered images of a leaderboard, shared by every delivery."""
+    title: str
+    images: tuple[bytes, ...]
+    changed: bool = True
+    "Whether any image changed since the chunks were last stored."
+    chunks: tuple[LeaderboardChunk, ...] = ()
+    "The chunks of an incremental render."
+
+    @property
+    def digest(self) -> str | None:
+        """The digest of the chunks of an incremental render."""
+        if not self.chunks:
+            return None
+
+        return hashlib.sha256(
+            "".join(chunk.digest for chunk in self.chunks).encode()
+        ).hexdigest()
+
+    @property
+    def filenames(self) -> list[str]:
+        return [f"lb-{i}.png" for i in range(len(self.images))]
+
+    def files(self) -> list[discord.File]:
+        """Create new files of the images, files can only be sent once."""
+        return [
+            discord.File(BytesIO(image), filename=filename)
+            for image, filename in zip(self.images, self.filenames)
+        ]
+
+    def embeds(self, image_urls: list[str] | None = None) -> list[discord.Embed]:
+        """
+        Create the embeds showing the images.
+
+        :param image_urls: Already uploaded image URLs to show, instead of \
+            the attachments of the message.
+        """
+        if image_urls is None:
+            image_urls = [f"attachment://{filename}" for filename in self.filenames]
+
+        embeds = [
+            discord.Embed(color=0x202026).set_image(url=url) for url in image_urls
+        ]
+        embeds[0].title = self.title
+
+        return embeds
+
+
+async def _render_incrementally(
+    lb: LeaderboardData, entries: list[LeaderboardPlayerEntry]
+) -> tuple[tuple[LeaderboardChunk, ...], bool]:
+    previous = await LiveLeaderboardsRepo.get_leaderboard_chunks(lb.info.path)
+
+    groups = [
+        entries[i : i + ENTRIES_PER_IMAGE]
+        for i in range(0, len(entries), ENTRIES_PER_IMAGE)
+    ]
+    digests = [
+        leaderboard_chunk_digest(lb.info, group, **_chunk_options(i, group))
+        for i, group in enumerate(groups)
     ]
 
-    embeds[0].title = f"{lb.info.prefix} {lb.info.title} Leaderboard"
+    async def chunk_image(i: int) -> bytes:
+        if i < len(previous) and previous[i].digest == digests[i]:
+            return previous[i].image
+        return await _render_chunk(lb, i, groups[i])
+
+    images = tuple(await asyncio.gather(*map(chunk_image, range(len(groups)))))
+
+    chunks = tuple(LeaderboardChunk(digest, image) for digest, image in zip(digests, images))
+    return chunks, [chunk.digest for chunk in previous] != digests
+
+
+async def store_rendered_chunks(lb_path: str, rendered: RenderedLeaderboard) -> None:
+    """
+    Store the chunks of an incremental render, so the next incremental
+    render reuses them and compares against them.
+
+    :param lb_path: The path of the leaderboard.
+    :param rendered: The incrementally rendered leaderboard.
+    """
+    if rendered.changed and rendered.chunks:
+        await LiveLeaderboardsRepo.set_leaderboard_chunks(lb_path, list(rendered.chunks))
 
-    return embeds, files
+
+async def render_leaderboard_path(
+    lb_path: str,
+    snapshot: LeaderboardSnapshot | None = None,
+    incremental: bool = False,
+) -> RenderedLeaderboard:
+    """
+    Render every image of a leaderboard.
+
+    :param lb_path: The path of the leaderboard.
+    :param snapshot: Build the leaderboard from a snapshot instead of fetching it.
+    :param incremental: Only render the chunks that changed since the \
+        chunks were last stored, reusing the stored images of the other \
+        chunks. Store the chunks with `store_rendered_chunks`.
+    """
+    entries: list[LeaderboardPlayerEntry] | None = None
+
+    if snapshot is not None:
+        lb = snapshot.leaderboard(lb_path)
+        entries = snapshot.entries(lb_path)
+    else:
+        bedwars_lbs = await lib.hypixel.lbs.fetch_bedwars_leaderboards()
+        try:
+            lb = [lb for lb in bedwars_lbs if lb.info.path == lb_path][0]
+        except IndexError as exc:
+            raise ValueError(f"Leaderboard path '{lb_path}' is invalid!") from exc
+
+    title = f"{lb.info.prefix} {lb.info.title} Leaderboard"
+
+    if incremental:
+        if entries is None:
+            entries = [
+                p async for p in lib.hypixel.lbs.fetch.fetch_leaderboard_players(lb)
+            ]
+
+        chunks, changed = await _render_incrementally(lb, entries)
+        return RenderedLeaderboard(
+            title=title,
+            images=tuple(chunk.image for chunk in chunks),
+            changed=changed,
+            chunks=chunks,
+        )
+
+    images = [image async for image, _, _ in generate_leaderboard_pngs(lb, entries)]
+    return RenderedLeaderboard(title=title, images=tuple(images))
+
+
+async def generate_embeds_for_leaderboard_path(
+    lb_path: str,
+    snapshot: LeaderboardSnapshot | None = None,
+) -> tuple[list[discord.Embed], list[discord.File]]:
+    rendered = await render_leaderboard_path(lb_path, snapshot)
+    return rendered.embeds(), rendered.files()
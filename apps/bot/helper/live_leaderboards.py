@@ -0,0 +1,228 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import discord
+from statalib.hypixel.lbs import LiveLeaderboardsRepo
+from statalib.hypixel.lbs.models import GuildLiveLeaderboard
+
+from .leaderboards import RenderedLeaderboard
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LiveLeaderboardUpdateReport:
+    """The outcome of delivering a leaderboard to the subscribed guilds."""
+    leaderboard_path: str
+    guilds: int = 0
+    "The amount of live leaderboards delivered to."
+    delivered: list[int] = field(default_factory=list)
+    "The IDs of the guilds whose live leaderboard was updated."
+    uploads: int = 0
+    "The amount of times the images were uploaded."
+    retries: int = 0
+    "The amount of deliveries retried after being rate limited."
+    pruned: list[int] = field(default_factory=list)
+    "The IDs of the guilds whose live leaderboard was removed."
+    failed: dict[int, str] = field(default_factory=dict)
+    "The failure reason of each failed delivery, by guild ID."
+    duration: float = 0
+    "The time (in seconds) delivering took."
+
+    def summary(self) -> str:
+        return (
+            f"Live leaderboard '{self.leaderboard_path}': delivered "
+            f"{len(self.delivered)}/{self.guilds} in {self.duration:.2f}s "
+            f"({self.uploads} uploads, {self.retries} retries, "
+            f"{len(self.failed)} failed, {len(self.pruned)} pruned)"
+        )
+
+
+class _ZombieLeaderboard(Exception):
+    """The guild or channel of a live leaderboard no longer exists."""
+
+
+class _UndeliverableLeaderboard(Exception):
+    """The channel of a live leaderboard currently can't be updated."""
+
+
+class LiveLeaderboardDelivery:
+    """
+    Delivers a rendered leaderboard to every guild subscribed to it.
+
+    The images are uploaded once to a bot owned storage channel and the
+    guilds show the uploaded images by URL, so no guild depends on another
+    guild's message. The guilds are edited concurrently. Rate limited edits
+    are retried with exponential backoff, and live leaderboards of deleted
+    guilds or channels are pruned.
+    """
+
+    def __init__(
+        self,
+        client: discord.Client,
+        leaderboard_path: str,
+        rendered: RenderedLeaderboard,
+        concurrency: int = 8,
+        storage_channel_id: int | None = None,
+        max_attempts: int = 4,
+        backoff: float = 2,
+    ) -> None:
+        """
+        :param client: The Discord client to deliver with.
+        :param leaderboard_path: The path of the delivered leaderboard.
+        :param rendered: The rendered leaderboard to deliver.
+        :param concurrency: The maximum amount of guilds updated at once.
+        :param storage_channel_id: The bot owned channel the images are \
+            uploaded to once, for every guild to show by URL. If not \
+            provided, or the upload fails, each guild uploads the images.
+        :param max_attempts: The amount of attempts made per guild if rate limited.
+        :param backoff: The base delay (in seconds) between rate limited attempts.
+        """
+        self.client = client
+        self.leaderboard_path = leaderboard_path
+        self.rendered = rendered
+        self.concurrency = concurrency
+        self.storage_channel_id = storage_channel_id
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+
+    async def _send(
+        self,
+        live_lb: GuildLiveLeaderboard,
+        content: str,
+        image_urls: list[str] | None,
+    ) -> discord.Message:
+        guild = self.client.get_guild(live_lb.guild_id)
+        if guild is None:
+            raise _ZombieLeaderboard("Guild no longer exists")
+
+        if guild.unavailable:
+            raise _UndeliverableLeaderboard("Guild is unavailable")
+
+        channel = guild.get_channel(live_lb.channel_id)
+        if channel is None:
+            raise _ZombieLeaderboard("Channel no longer exists")
+
+        if not isinstance(channel, discord.TextChannel):
+            raise _UndeliverableLeaderboard("Channel is not a text channel")
+
+        if image_urls is None:
+            embeds, attachments = self.rendered.embeds(), self.rendered.files()
+        else:
+            embeds, attachments = self.rendered.embeds(image_urls), []
+
+        lb_msg = channel.get_partial_message(live_lb.message_id)
+
+        try:
+            return await lb_msg.edit(content=content, embeds=embeds, attachments=attachments)
+        except discord.errors.NotFound:
+            # Create new message, the files weren't sent by the failed edit
+            if image_urls is None:
+                attachments = self.rendered.files()
+
+            lb_msg = await channel.send(content=content, embeds=embeds, files=attachments)
+
+            live_lb.message_id = lb_msg.id
+            _ = await LiveLeaderboardsRepo.set_live_leaderboard(live_lb)
+
+            return lb_msg
+
+    async def _deliver(
+        self,
+        live_lb: GuildLiveLeaderboard,
+        content: str,
+        image_urls: list[str] | None,
+        report: LiveLeaderboardUpdateReport,
+    ) -> discord.Message | None:
+        for attempt in range(self.max_attempts):
+            try:
+                message = await self._send(live_lb, content, image_urls)
+
+                report.delivered.append(live_lb.guild_id)
+                if image_urls is None:
+                    report.uploads += 1
+
+                return message
+
+            except _ZombieLeaderboard as exc:
+                _ = await LiveLeaderboardsRepo.unset_live_leaderboard(
+                    live_lb.guild_id, self.leaderboard_path)
+                report.pruned.append(live_lb.guild_id)
+                logger.info(f"Pruned live leaderboard of guild {live_lb.guild_id}: {exc}")
+                return None
+
+            except discord.errors.HTTPException as exc:
+                if exc.status != 429 or attempt + 1 == self.max_attempts:
+                    report.failed[live_lb.guild_id] = f"{exc.status}: {exc.text}"
+                    return None
+
+                report.retries += 1
+                await asyncio.sleep(self.backoff * 2**attempt)
+
+            except _UndeliverableLeaderboard as exc:
+                report.failed[live_lb.guild_id] = str(exc)
+                return None
+
+        return None
+
+    async def _upload(self, report: LiveLeaderboardUpdateReport) -> list[str] | None:
+        if self.storage_channel_id is None:
+            return None
+
+        channel = self.client.get_channel(self.storage_channel_id)
+        if not isinstance(channel, discord.TextChannel):
+            logger.warning(
+                f"Live leaderboard storage channel {self.storage_channel_id} is unavailable")
+            return None
+
+        try:
+            message = await channel.send(
+                content=self.leaderboard_path, files=self.rendered.files())
+        except discord.errors.HTTPException as exc:
+            logger.warning(f"Failed to upload live leaderboard images: {exc.status}: {exc.text}")
+            return None
+
+        report.uploads += 1
+
+        attachments = {a.filename: a.url for a in message.attachments}
+        image_urls = [attachments.get(name) for name in self.rendered.filenames]
+
+        return None if None in image_urls else image_urls
+
+    async def deliver(
+        self,
+        live_lbs: list[GuildLiveLeaderboard],
+        update_dt: datetime,
+    ) -> LiveLeaderboardUpdateReport:
+        """
+        Deliver the leaderboard to every given live leaderboard.
+
+        :param live_lbs: The live leaderboards to update.
+        :param update_dt: The time the leaderboard was updated at.
+        :return LiveLeaderboardUpdateReport: The outcome of the delivery.
+        """
+        report = LiveLeaderboardUpdateReport(self.leaderboard_path, guilds=len(live_lbs))
+        started_at = time.perf_counter()
+
+        # No next update time is shown, unchanged leaderboards aren't edited
+        # so it would soon be in the past
+        content = f"Last updated <t:{int(update_dt.timestamp())}:R>"
+
+        image_urls = await self._upload(report) if live_lbs else None
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def deliver(live_lb: GuildLiveLeaderboard) -> None:
+            async with semaphore:
+                _ = await self._deliver(live_lb, content, image_urls, report)
+
+        _ = await asyncio.gather(*(deliver(live_lb) for live_lb in live_lbs))
+
+        report.duration = time.perf_counter() - started_at
+        logger.info(report.summary())
+
+        return report
@@ -1,11 +1,13 @@
+import asyncio
 import io
+import logging
 import typing
 
 import discord
 from discord.abc import MISSING # pyright:ignore[reportAny]
 from discord.interactions import Interaction
 
-from statalib import Mode, ModesEnum
+from statalib import Mode, ModesEnum, config
 from statalib.render2 import RenderingClient
 from typing_extensions import override
 
@@ -13,6 +15,11 @@ from helper.tips import random_tip_message
 
 from ._custom import CustomBaseView
 
+logger = logging.getLogger(__name__)
+
+# Strong references to pre-render tasks, the event loop only keeps weak ones
+_prerender_tasks: set[asyncio.Task[None]] = set()
+
 
 @typing.final
 class FractylModeSelect(discord.ui.Select['FractylModesView']):
@@ -99,6 +106,7 @@ class FractylModesView(CustomBaseView):
         selected_mode: Mode | None=None,
         *,
         timeout: int = 300,
+        prerender: bool | None = None,
     ) -> None:
         if modes is None:
             modes = ModesEnum.non_dream_modes()
@@ -113,6 +121,21 @@ class FractylModesView(CustomBaseView):
         self.background_img: bytes | None = background_img
         self.renderer: RenderingClient = renderer
         self.interaction_origin: Interaction = interaction_origin
+        self.modes: list[Mode] = modes
+        # Opt in, every other mode would otherwise be rendered for every command
+        self.prerender: bool = (
+            config("apps.bot.prerender_modes") if prerender is None else prerender)
+
+    async def _prerender_modes(self) -> None:
+        # Rendered into the render cache, so selecting a mode is served from memory
+        current_mode = self.renderer.mode or self.modes[0]
+        modes = [mode for mode in self.modes if mode != current_mode]
+
+        try:
+            _ = await self.renderer.render_modes(
+                modes, self.background_img, speculative=True)
+        except Exception as exc:
+            logger.warning(f"Failed to pre-render modes: {exc}")
 
     @override
     async def on_timeout(self) -> None:
@@ -143,3 +166,8 @@ class FractylModesView(CustomBaseView):
             view=self
         )
 
+        if self.prerender:
+            task = asyncio.create_task(self._prerender_modes())
+            _prerender_tasks.add(task)
+            task.add_done_callback(_prerender_tasks.discard)
+
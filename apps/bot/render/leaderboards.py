@@ -1,3 +1,7 @@
+import threading
+from typing import Callable, Hashable
+
+from cachetools import LRUCache
 from PIL import Image, ImageDraw
 from statalib import to_thread
 from statalib.hypixel.lbs import LeaderboardData, LeaderboardPlayerEntry
@@ -29,22 +33,64 @@ def draw_rounded_rect(
     draw.rounded_rectangle(box, radius=BG_RADIUS, fill=(0, 0, 0, BG_OPACITY))
 
 
-def draw_player_entry(
-    im: ImageRender,
-    draw: ImageDraw.ImageDraw,
-    player: LeaderboardPlayerEntry,
-    lb_position: int,
-    top: int,
-) -> None:
-    bottom = top + ROW_HEIGHT
-    text_y = calc_text_y(top)
+# Rounded rectangle boxes include their bottom edge, one pixel into the gap
+TILE_SIZE = (WIDTH, ROW_HEIGHT + 1)
 
-    draw_rounded_rect((0, top, WIDTH, bottom), draw)
+ROW_CACHE_SIZE = 256  # Rows, each tile is ~170 KiB
+HEADER_CACHE_SIZE = 32  # Leaderboard titles
+
+
+class _TileCache:
+    """
+    A bounded LRU of rendered row tiles, stored as raw RGBA bytes. Tiles are
+    rendered in worker threads, so access to the cache is locked.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self._tiles: LRUCache[Hashable, bytes] = LRUCache(maxsize)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, render: Callable[[], Image.Image]) -> Image.Image:
+        with self._lock:
+            tile_bytes = self._tiles.get(key)
+            if tile_bytes is not None:
+                self.hits += 1
+
+        if tile_bytes is not None:
+            return Image.frombytes("RGBA", TILE_SIZE, tile_bytes)
+
+        tile = render()
+        with self._lock:
+            self.misses += 1
+            self._tiles[key] = tile.tobytes()
+
+        return tile
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tiles.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+row_tiles = _TileCache(ROW_CACHE_SIZE)
+"Player rows without their position, by (username, rank prefix, value)."
+header_tiles = _TileCache(HEADER_CACHE_SIZE)
+"Leaderboard headers, by leaderboard title."
+
+
+def _new_tile() -> ImageRender:
+    im = ImageRender(Image.new("RGBA", TILE_SIZE, (0, 0, 0, 0)))
+    draw_rounded_rect((0, 0, WIDTH, ROW_HEIGHT), ImageDraw.Draw(im._image))
+    return im
+
+
+def _render_player_row(player: LeaderboardPlayerEntry) -> Image.Image:
+    im = _new_tile()
+    text_y = calc_text_y(0)
 
-    im.text.draw(
-        f"#{lb_position}",
-        {**DEFAULT_TEXT_OPTS, "position": (90, text_y), "align": "right"},
-    )
     im.text.draw(
         f'{player.rank_info["formatted_prefix"]}{player.username}',
         {**DEFAULT_TEXT_OPTS, "position": (120, text_y)},
@@ -52,13 +98,12 @@ def draw_player_entry(
     im.text.draw(
         player.value, {**DEFAULT_TEXT_OPTS, "position": (650, text_y), "align": "left"}
     )
+    return im._image
 
 
-def draw_header(
-    leaderboard: LeaderboardData, im: ImageRender, draw: ImageDraw.ImageDraw
-) -> None:
+def _render_header(title: str) -> Image.Image:
+    im = _new_tile()
     header_y = calc_text_y(0)
-    draw_rounded_rect((0, 0, WIDTH, ROW_HEIGHT), draw)
 
     im.text.draw(
         "Pos",
@@ -68,9 +113,34 @@ def draw_header(
     im.text.draw("Player", {**DEFAULT_TEXT_OPTS, "position": (120, header_y)})
 
     im.text.draw(
-        f"{leaderboard.info.title}",
+        f"{title}",
         {**DEFAULT_TEXT_OPTS, "position": (650, header_y), "align": "left"},
     )
+    return im._image
+
+
+def draw_player_entry(
+    im: ImageRender,
+    player: LeaderboardPlayerEntry,
+    lb_position: int,
+    top: int,
+) -> None:
+    key = (player.username, player.rank_info["formatted_prefix"], player.value)
+    row = row_tiles.get(key, lambda: _render_player_row(player))
+
+    # Rows don't overlap, so pasting the tile matches drawing the row in place
+    im._image.paste(row, (0, top))
+
+    # The position is the only part of a row that moves between renders
+    im.text.draw(
+        f"#{lb_position}",
+        {**DEFAULT_TEXT_OPTS, "position": (90, calc_text_y(top)), "align": "right"},
+    )
+
+
+def draw_header(leaderboard: LeaderboardData, im: ImageRender) -> None:
+    title = leaderboard.info.title
+    im._image.paste(header_tiles.get(title, lambda: _render_header(title)), (0, 0))
 
 
 @to_thread
@@ -89,15 +159,14 @@ def render_leaderboard_chunk(
             (0, 0, 0, 0),
         )
     )
-    draw = ImageDraw.Draw(im._image)
 
     if include_header:
-        draw_header(leaderboard, im, draw)
+        draw_header(leaderboard, im)
 
     for i, player in enumerate(players):
         y = (i + int(include_header)) * (ROW_HEIGHT + GAP)
         lb_position = starting_pos + i
 
-        draw_player_entry(im, draw, player, lb_position, y)
+        draw_player_entry(im, player, lb_position, y)
 
     return im.to_bytes()
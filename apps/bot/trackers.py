@@ -3,6 +3,7 @@ import asyncio
 import logging
 import sqlite3
 import time
+from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta, timezone
 from typing_extensions import override
 
@@ -28,63 +29,6 @@ logger = logging.getLogger("statalytics.trackers")
 logger.setLevel(logging.DEBUG)
 
 
-"""
-This query is designed to find data from the `rotational_info` table that needs
-to be reset based on the reset times configured in the `configured_reset_times`
-and `default_reset_times` tables. The query uses `LEFT JOIN` to combine data
-from the `rotational_info`, `linked_accounts`, `configured_reset_times`, and
-`default_reset_times` tables.
-
-The `configured_reset_times` table stores reset times configured by Discord ID,
-while the `default_reset_times` table stores default reset times by player UUID.
-
-The query uses data from the `configured_reset_times` table if it is
-available for the respective Discord ID; otherwise, it uses data from
-the `default_reset_times` table.
-
-The formula `reset_hour - timezone + (reset_minute / 60)` calculates the hour
-of day as a decimal, so it would be 13.5 for 1:30pm UTC 0. The query checks if
-the formula result value from either the `configured_reset_times` or
-`default_reset_times` tables, equals x, where x is a parameter passed to the
-query. The query also accounts for the 24-hour wrap-around, ensuring that
-values like 24 are treated as 0. If neither the `configured_reset_times` nor
-the `default_reset_times` tables have data for the respective Discord ID or
-player UUID, then the query returns a value of 0.
-
-The result of the query is a set of player uuids that meet the criteria.
-You can use this result set to find and process data from the `rotational_info`
-table that needs to be reset based on the configured reset times.
-"""
-
-
-query = """
-WITH ResetTimes AS (
-  SELECT
-    rotational_info.uuid,
-    COALESCE(
-      configured_reset_times.reset_hour
-        - configured_reset_times.timezone
-            + configured_reset_times.reset_minute / 60.0,
-      default_reset_times.reset_hour
-        - default_reset_times.timezone
-        + default_reset_times.reset_minute / 60.0,
-      0
-    ) + 24 AS reset_time
-  FROM
-    rotational_info
-  LEFT JOIN linked_accounts
-    ON rotational_info.uuid = linked_accounts.uuid
-  LEFT JOIN configured_reset_times
-    ON linked_accounts.discord_id = configured_reset_times.discord_id
-  LEFT JOIN default_reset_times
-    ON rotational_info.uuid = default_reset_times.uuid
-)
-SELECT DISTINCT uuid
-FROM ResetTimes
-WHERE ROUND(reset_time - 24 * CAST(reset_time / 24 AS INTEGER), 3) = ?;
-"""
-
-
 class Client(commands.AutoShardedBot):
     def __init__(self):
         super().__init__(intents=None, command_prefix="$")
@@ -94,8 +38,15 @@ class Client(commands.AutoShardedBot):
 
     @override
     async def setup_hook(self) -> None:
+        # Backfill reset slots of players tracked before slots existed
+        await asyncio.to_thread(statalib.reset_slots.rebuild_reset_slots)
         _ = reset_trackers_loop.start()
 
+    @override
+    async def close(self) -> None:
+        await super().close()
+        await statalib.network.close_sessions()
+
 
 client = Client()
 
@@ -107,123 +58,245 @@ async def on_command_error(_, __):
     return
 
 
-async def reset_trackers():
-    fetched_players: list[str] = []
+@dataclass
+class SlotResetMetrics:
+    """Progress of resetting the trackers that are due in a single reset slot."""
+    slot: str
+    "The UTC time of day (HH:MM) of the reset slot."
+    due: int = 0
+    "The amount of players with automatic reset access that are due."
+    fetched: int = 0
+    "The amount of players whose Hypixel data was fetched."
+    fetch_failed: int = 0
+    "The amount of players whose Hypixel data couldn't be fetched."
+    reset: int = 0
+    "The amount of players whose trackers were reset."
+    write_failed: int = 0
+    "The amount of players whose trackers failed to be written."
+    conflicts: int = 0
+    "The amount of trackers that were skipped since historical data exists."
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def backlog(self) -> int:
+        """The amount of players that still have to be processed."""
+        return self.due - self.reset - self.fetch_failed - self.write_failed
+
+    def summary(self) -> str:
+        elapsed = time.monotonic() - self.started_at
+        return (
+            f"[{self.slot}] {self.reset}/{self.due} reset, {self.fetched} fetched, "
+            f"{self.fetch_failed + self.write_failed} failed, {self.conflicts} conflicts, "
+            f"{self.backlog} remaining ({elapsed:.1f}s)"
+        )
 
-    auto_reset_config: dict = (
-        statalib.config("apps.bot.tracker_resetting.automatic") or {}
-    )
 
-    utc_now = datetime.now(UTC)
+_resetting_config: dict = statalib.config("apps.bot.tracker_resetting") or {}
 
-    with statalib.db.db_connect() as conn:
-        cursor = conn.cursor()
+active_slots: dict[str, SlotResetMetrics] = {}
+_slot_tasks: set[asyncio.Task] = set()
 
-        # Calculate the time using sqlite for mathmatical consistency
-        calculated_time = cursor.execute(
-            f"SELECT ROUND({utc_now.hour} + {utc_now.minute} / 60.0, 3)"
-        ).fetchone()[0]
 
-        players_to_reset: list[tuple[str]] = cursor.execute(
-            query, (calculated_time,)
-        ).fetchall()
+def reset_player_trackers(
+    uuid: statalib.PlayerUUID, hypixel_data: dict, timezone: datetime
+) -> int:
+    """
+    Archive and refresh every due rotation of a player, each rotation in its
+    own savepoint of the current transaction.
 
-    logger.info(f"Total trackers to reset: {len(players_to_reset) // 4}")
+    :param uuid: the uuid of the player whos trackers are being reset
+    :param hypixel_data: the current hypixel data of the player
+    :param timezone: the current time of the player's configured timezone
+    :return int: the amount of rotations skipped since historical data exists
+    """
+    resetting = rotational.RotationalResetting(uuid)
+    yesterday_dt = timezone - timedelta(days=1)
 
-    for uuid in players_to_reset:
-        uuid = uuid[0]
+    def reset_rotational(rotation_type: rotational.RotationType) -> int:
+        try:
+            with statalib.db.transaction():
+                snapshot_id = resetting.archive_rotational_data(
+                    period_id=rotational.HistoricalRotationPeriodID(
+                        rotation_type, datetime_info=yesterday_dt
+                    ),
+                    current_hypixel_data=hypixel_data,
+                )
+                resetting.refresh_rotational_data(
+                    rotation_type=rotation_type, current_hypixel_data=hypixel_data
+                )
+        except sqlite3.IntegrityError:
+            logger.warning(
+                f"Auto reset for {rotation_type.value} tracker failed. "
+                + f"UUID: {uuid} / Reason: historical data exists"
+            )
+            return 1
 
-        # Prevent refetching data for multiple trackers
-        if uuid in fetched_players:
-            continue
+        logger.debug(
+            f"Auto reset {rotation_type.value} tracker. "
+            + f"UUID: {uuid} / Snapshot ID: {snapshot_id}"
+        )
+        return 0
 
-        try:
-            start_time = time.time()
+    conflicts = reset_rotational(rotational.RotationType.DAILY)  # Reset daily
+
+    if timezone.weekday() == 6:
+        conflicts += reset_rotational(rotational.RotationType.WEEKLY)  # Reset weekly
 
-            # Ensure user has access
-            if not rotational.has_auto_reset_access(uuid, auto_reset_config):
-                continue
+    if timezone.day == 1:
+        conflicts += reset_rotational(rotational.RotationType.MONTHLY)  # Reset monthly
+
+    if timezone.timetuple().tm_yday == 1:
+        conflicts += reset_rotational(rotational.RotationType.YEARLY)  # Reset yearly
 
-            logger.info(f"Resetting trackers for: {uuid}")
-            reset_time = rotational.get_dynamic_reset_time(uuid)
+    return conflicts
 
-            # Get respective datatime object
-            tz_now = datetime.now(
-                timezone(timedelta(hours=reset_time.utc_offset))
-            ).replace(hour=reset_time.reset_hour % 24)
 
-            fetched_players.append(uuid)  # Prevent duplicate fetching
+def write_reset_batch(
+    batch: list[tuple[str, dict, datetime]]
+) -> tuple[int, list[Exception]]:
+    """
+    Reset the trackers of many players in a single transaction, each player
+    in its own savepoint so a failing player only rolls back their own resets.
 
+    :param batch: the uuid, hypixel data, and timezone of each player
+    :return tuple: the amount of rotations skipped since historical data \
+        exists, and the error of each player that failed to reset
+    """
+    conflicts = 0
+    errors: list[Exception] = []
+
+    with statalib.db.transaction():
+        for uuid, hypixel_data, tz_now in batch:
+            try:
+                with statalib.db.transaction():
+                    conflicts += reset_player_trackers(uuid, hypixel_data, tz_now)
+            except Exception as error:
+                logger.warning(f"Failed to reset trackers. UUID: {uuid} / Error: {error}")
+                errors.append(error)
+
+    return conflicts, errors
+
+
+async def _fetch_player(
+    candidate: rotational.AutoResetCandidate,
+    semaphore: asyncio.Semaphore,
+    write_queue: asyncio.Queue,
+    metrics: SlotResetMetrics
+) -> None:
+    reset_time = candidate.reset_time
+
+    # Get respective datatime object
+    tz_now = datetime.now(
+        timezone(timedelta(hours=reset_time.utc_offset))
+    ).replace(hour=reset_time.reset_hour % 24)
+
+    async with semaphore:
+        try:
             hypixel_data = await statalib.network.fetch_hypixel_data_rate_limit_safe(
-                uuid, attempts=15
+                candidate.uuid, attempts=15,
+                priority=statalib.network.RequestPriority.TRACKER_RESET
             )  # Mildly important that it succeeds
+        except Exception as error:
+            metrics.fetch_failed += 1
+            await helper.handlers.log_error_msg(client, error)
+            return
 
-            if not hypixel_data.get("success"):
-                logger.warning(f"Hypixel request unsuccessful: {hypixel_data}")
-                continue
+    if not hypixel_data.get("success"):
+        metrics.fetch_failed += 1
+        logger.warning(f"Hypixel request unsuccessful: {hypixel_data}")
+        return
 
-            client.dispatch(
-                "tracker_reset", uuid=uuid, hypixel_data=hypixel_data, timezone=tz_now
-            )
+    metrics.fetched += 1
+    await write_queue.put((candidate.uuid, hypixel_data, tz_now))
+
+
+async def _write_resets(write_queue: asyncio.Queue, metrics: SlotResetMetrics) -> None:
+    batch_size: int = _resetting_config.get("write_batch_size", 50)
+    done = False
+
+    while not done:
+        batch = [await write_queue.get()]
+
+        # Collect whatever else is ready, without holding up a partial batch
+        while len(batch) < batch_size and not write_queue.empty():
+            batch.append(write_queue.get_nowait())
+
+        if batch[-1] is None:  # All fetches finished
+            done = True
+            batch.pop()
 
+        if not batch:
+            continue
+
+        try:
+            conflicts, errors = await asyncio.to_thread(write_reset_batch, batch)
         except Exception as error:
+            metrics.write_failed += len(batch)
             await helper.handlers.log_error_msg(client, error)
+            continue
 
-        # limit requests to 1 per 2 seconds
-        time_elapsed = time.time() - start_time
-        await asyncio.sleep(2 - time_elapsed)
+        metrics.conflicts += conflicts
+        metrics.reset += len(batch) - len(errors)
+        metrics.write_failed += len(errors)
 
+        for error in errors:
+            await helper.handlers.log_error_msg(client, error)
 
-@tasks.loop(minutes=1)
-async def reset_trackers_loop():
-    logger.info("Scheduled tracker reset event starting...")
-    await reset_trackers()
 
+async def reset_trackers():
+    utc_now = datetime.now(UTC)
 
-@client.event
-async def on_tracker_reset(
-    uuid: statalib.PlayerUUID, hypixel_data: dict, timezone: datetime
-) -> None:
-    """
-    :param uuid: the uuid of the player whos trackers are being reset
-    :param hypixel_data: the current hypixel data of the player
-    :param timezone: the current time of the player's configured timezone
-    """
-    resetting = rotational.RotationalResetting(uuid)
-    yesterday_dt = timezone - timedelta(days=1)
+    candidates = await asyncio.to_thread(
+        rotational.get_due_auto_reset_candidates, utc_now)
 
-    def reset_rotational(rotation_type: rotational.RotationType) -> None:
-        try:
-            snapshot_id = resetting.archive_rotational_data(
-                period_id=rotational.HistoricalRotationPeriodID(
-                    rotation_type, datetime_info=yesterday_dt
-                ),
-                current_hypixel_data=hypixel_data,
-            )
-            resetting.refresh_rotational_data(
-                rotation_type=rotation_type, current_hypixel_data=hypixel_data
-            )
-        except sqlite3.IntegrityError:
-            return logger.warning(
-                f"Auto reset for {rotation_type.value} tracker failed. "
-                + f"UUID: {uuid} / Reason: historical data exists"
-            )
+    metrics = SlotResetMetrics(slot=utc_now.strftime("%H:%M"), due=len(candidates))
+    backlog = sum(slot.backlog for slot in active_slots.values())
 
-        logger.debug(
-            f"Auto reset {rotation_type.value} tracker. "
-            + f"UUID: {uuid} / Snapshot ID: {snapshot_id}"
-        )
+    logger.info(
+        f"[{metrics.slot}] Total players to reset: {metrics.due} "
+        f"(backlog from previous slots: {backlog})"
+    )
 
-    reset_rotational(rotational.RotationType.DAILY)  # Reset daily
+    if not candidates:
+        return
 
-    if timezone.weekday() == 6:
-        reset_rotational(rotational.RotationType.WEEKLY)  # Reset weekly
+    active_slots[metrics.slot] = metrics
 
-    if timezone.day == 1:
-        reset_rotational(rotational.RotationType.MONTHLY)  # Reset monthly
+    semaphore = asyncio.Semaphore(_resetting_config.get("fetch_concurrency", 10))
+    write_queue: asyncio.Queue = asyncio.Queue()
+    writer = asyncio.create_task(_write_resets(write_queue, metrics))
 
-    if timezone.timetuple().tm_yday == 1:
-        reset_rotational(rotational.RotationType.YEARLY)  # Reset yearly
+    try:
+        await asyncio.gather(*(
+            _fetch_player(candidate, semaphore, write_queue, metrics)
+            for candidate in candidates
+        ))
+    finally:
+        await write_queue.put(None)
+        await writer
+
+        del active_slots[metrics.slot]
+        logger.info(metrics.summary())
+
+
+async def _run_reset_slot() -> None:
+    try:
+        await reset_trackers()
+    except Exception as error:
+        await helper.handlers.log_error_msg(client, error)
+
+
+@tasks.loop(minutes=1)
+async def reset_trackers_loop():
+    logger.info("Scheduled tracker reset event starting...")
+
+    # Slots run in the background so a slow slot can't delay the next one
+    task = asyncio.create_task(_run_reset_slot())
+    _slot_tasks.add(task)
+    task.add_done_callback(_slot_tasks.discard)
+
+    for slot in active_slots.values():
+        logger.info(slot.summary())
 
 
 @reset_trackers_loop.before_loop
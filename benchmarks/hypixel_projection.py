@@ -0,0 +1,153 @@
+"""
+Compare raw Hypixel player responses with their Bedwars only projection.
+
+Reports the serialized and compressed (redis tier) size of each response,
+the memory held by the in-process player cache when full of either, and
+the throughput of projecting and decoding responses.
+
+Usage (from the repository root):
+    python -m benchmarks.hypixel_projection [--players N] [--fixture FILE]
+
+A real response saved with `--fixture` gives the most accurate numbers,
+otherwise a synthetic response sized like a long time player is used.
+"""
+
+import argparse
+import json
+import random
+import time
+import tracemalloc
+
+from statalib.hypixel.projection import project_hypixel_data
+from statalib.player_cache import compress_player_data, decompress_player_data
+
+
+_GAMES = (
+    "Bedwars", "SkyWars", "Duels", "Arcade", "HungerGames", "MurderMystery",
+    "BuildBattle", "UHC", "TNTGames", "Walls3", "MCGO", "Battleground",
+    "SuperSmash", "GingerBread", "Paintball", "Quake", "VampireZ", "Arena",
+    "Walls", "SkyClash", "Housing", "Pit", "WoolGames", "SpeedUHC", "TrueCombat"
+)
+
+
+def _random_stats(prefix: str, amount: int) -> dict:
+    return {
+        f"{prefix}_{i}_{random.choice(('wins', 'kills', 'deaths', 'games'))}":
+            int(random.lognormvariate(4, 2))
+        for i in range(amount)
+    }
+
+
+def synthetic_player_response() -> dict:
+    stats = {game: _random_stats(game.lower(), random.randint(50, 250)) for game in _GAMES}
+    stats["Bedwars"] = {
+        **_random_stats("bedwars", 1200),
+        "Experience": 2_500_000,
+        "packages": [f"package_{i}" for i in range(400)],
+        "favourites_2": ",".join(["wool"] * 21),
+        "activeProjectileTrail": "projectile_trail_none"
+    }
+
+    quest_names = [f"bedwars_quest_{i}" for i in range(12)]
+    quest_names += [f"{game.lower()}_quest_{i}" for game in _GAMES for i in range(20)]
+
+    quests = {
+        quest: {"completions": [
+            {"time": random.randint(1_500_000_000_000, 1_700_000_000_000)}
+            for _ in range(random.randint(0, 30))
+        ]}
+        for quest in quest_names
+    }
+
+    return {
+        "success": True,
+        "player": {
+            "uuid": "5513729a18b14486b623db7a60a24653",
+            "displayname": "Player",
+            "newPackageRank": "MVP_PLUS",
+            "rankPlusColor": "GOLD",
+            "networkExp": 87_654_321.5,
+            "karma": 123_456_789,
+            "stats": stats,
+            "quests": quests,
+            "achievements": {
+                **_random_stats("achievement", 600), "bedwars_level": 1000},
+            "achievementsOneTime": [f"achievement_{i}" for i in range(400)],
+            "socialMedia": {"links": {"DISCORD": "player"}},
+            "petStats": {f"pet_{i}": _random_stats("pet", 6) for i in range(60)},
+            "challenges": {"all_time": _random_stats("challenge", 300)},
+            "parkourCompletions": {
+                f"lobby_{i}": [{"timeStart": 0, "timeTook": 1}] * 3 for i in range(40)}
+        }
+    }
+
+
+def _retained_memory(payload: str, players: int) -> int:
+    tracemalloc.start()
+    cached = [json.loads(payload) for _ in range(players)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del cached
+    return size
+
+
+def _rate(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return iterations / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--players", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--fixture", help="A raw Hypixel player response JSON file")
+    args = parser.parse_args()
+
+    if args.fixture:
+        with open(args.fixture) as file:
+            raw = json.load(file)
+    else:
+        random.seed(0)
+        raw = synthetic_player_response()
+
+    projected = project_hypixel_data(raw)
+
+    raw_json, projected_json = json.dumps(raw), json.dumps(projected)
+    raw_compressed = compress_player_data(raw)
+    projected_compressed = compress_player_data(projected)
+
+    raw_memory = _retained_memory(raw_json, args.players)
+    projected_memory = _retained_memory(projected_json, args.players)
+
+    project_rate = _rate(lambda: project_hypixel_data(raw), args.iterations)
+    raw_decode_rate = _rate(lambda: decompress_player_data(raw_compressed), args.iterations)
+    projected_decode_rate = _rate(
+        lambda: decompress_player_data(projected_compressed), args.iterations)
+    fetch_path_rate = _rate(
+        lambda: compress_player_data(project_hypixel_data(json.loads(raw_json))),
+        args.iterations)
+    raw_fetch_path_rate = _rate(
+        lambda: compress_player_data(json.loads(raw_json)), args.iterations)
+
+    print(f"Raw JSON size:              {len(raw_json) / 1024:.1f} KiB")
+    print(f"Projected JSON size:        {len(projected_json) / 1024:.1f} KiB "
+          f"({len(projected_json) / len(raw_json):.0%})")
+    print(f"Raw redis entry:            {len(raw_compressed) / 1024:.1f} KiB")
+    print(f"Projected redis entry:      {len(projected_compressed) / 1024:.1f} KiB "
+          f"({len(projected_compressed) / len(raw_compressed):.0%})")
+    print(f"Raw memory tier:            {raw_memory / 1024**2:.1f} MiB "
+          f"({args.players:,} players)")
+    print(f"Projected memory tier:      {projected_memory / 1024**2:.1f} MiB "
+          f"({projected_memory / raw_memory:.0%})")
+    print(f"Projection:                 {project_rate:,.0f} responses/s")
+    print(f"Raw redis decode:           {raw_decode_rate:,.0f} responses/s")
+    print(f"Projected redis decode:     {projected_decode_rate:,.0f} responses/s")
+    print(f"Raw fetch to cache:         {raw_fetch_path_rate:,.0f} responses/s")
+    print(f"Projected fetch to cache:   {fetch_path_rate:,.0f} responses/s")
+
+
+if __name__ == "__main__":
+    main()
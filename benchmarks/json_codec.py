@@ -0,0 +1,98 @@
+"""
+Compare the decode and encode times of every installed JSON codec.
+
+Decodes and encodes a Hypixel player response and a Hypixel leaderboards
+response with each codec, and decodes the player response straight into
+its Bedwars projection.
+
+Usage (from the repository root):
+    python -m benchmarks.json_codec [--iterations N]
+        [--player-fixture FILE] [--leaderboard-fixture FILE]
+
+Recorded responses passed as fixtures give the most accurate numbers,
+otherwise synthetic responses are used.
+"""
+
+import argparse
+import json
+import random
+import time
+import uuid
+
+from statalib.codec import available_codecs
+from statalib.hypixel.projection import ProjectedHypixelData, project_hypixel_data
+
+from benchmarks.hypixel_projection import synthetic_player_response
+
+
+_GAMES = ("BEDWARS", "SKYWARS", "DUELS", "ARCADE", "MURDER_MYSTERY", "BUILD_BATTLE")
+
+
+def synthetic_leaderboards_response() -> dict:
+    leaderboards = {
+        game: [
+            {
+                "path": f"{game.lower()}_stat_{i}",
+                "prefix": random.choice(("Overall", "Weekly", "Monthly")),
+                "title": f"Stat {i}",
+                "location": "1,2,3",
+                "count": 100,
+                "leaders": [str(uuid.uuid4()) for _ in range(100)]
+            }
+            for i in range(6)
+        ]
+        for game in _GAMES
+    }
+
+    return {"success": True, "leaderboards": leaderboards}
+
+
+def _load_fixture(path: str | None, default) -> bytes:
+    if path:
+        with open(path, "rb") as file:
+            return file.read()
+    return json.dumps(default()).encode()
+
+
+def _per_call(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--player-fixture", help="A raw Hypixel player response JSON file")
+    parser.add_argument("--leaderboard-fixture", help="A raw Hypixel leaderboards JSON file")
+    args = parser.parse_args()
+
+    random.seed(0)
+    fixtures = {
+        "player": _load_fixture(args.player_fixture, synthetic_player_response),
+        "leaderboards": _load_fixture(
+            args.leaderboard_fixture, synthetic_leaderboards_response)
+    }
+
+    for name, payload in fixtures.items():
+        print(f"{name} ({len(payload) / 1024:.1f} KiB)")
+
+        for codec in available_codecs().values():
+            document = codec.loads(payload)
+
+            decode = _per_call(lambda: codec.loads(payload), args.iterations)
+            encode = _per_call(lambda: codec.dumps(document), args.iterations)
+            print(f"  {codec.name:<8} decode {decode * 1000:7.3f} ms  "
+                  f"encode {encode * 1000:7.3f} ms")
+
+            if name == "player":
+                projected = _per_call(
+                    lambda: project_hypixel_data(
+                        codec.loads_typed(payload, ProjectedHypixelData)),
+                    args.iterations)
+                print(f"  {codec.name:<8} decode into projection {projected * 1000:7.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
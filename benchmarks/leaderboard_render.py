@@ -0,0 +1,104 @@
+"""
+Compare leaderboard chunk render times with a cold and a warm row cache.
+
+Renders every chunk of a synthetic 100 player leaderboard with empty row
+and header caches, then renders them again with the caches filled, the
+way a live leaderboard refresh does when its players barely moved.
+
+Usage (from the repository root):
+    python -m benchmarks.leaderboard_render [--iterations N]
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from statalib.common import REL_PATH
+from statalib.hypixel.lbs.models import (
+    LEADERBOARD_TYPES,
+    LeaderboardData,
+    LeaderboardPlayerEntry
+)
+
+# The renderers live in the bot app, which isn't a package
+sys.path.append(f"{REL_PATH}/apps/bot")
+
+from render import leaderboards  # noqa: E402
+
+
+_PREFIXES = ("", "§a[VIP] ", "§a[VIP§6+§a] ", "§b[MVP] ", "§b[MVP§c+§b] ", "§6[MVP§c++§6] ")
+_ENTRIES_PER_CHUNK = 10
+
+
+def synthetic_leaderboard(players: int = 100) -> tuple[LeaderboardData, list]:
+    lb = LeaderboardData(
+        info=LEADERBOARD_TYPES["wins_new"],
+        count=players,
+        leaders=tuple(str(i) for i in range(players))
+    )
+    entries = [
+        LeaderboardPlayerEntry(
+            uuid=str(i),
+            username=f"Player{random.randint(0, 10**6)}",
+            rank_info={"formatted_prefix": random.choice(_PREFIXES)},
+            value=f"{random.randint(10_000, 50_000):,}"
+        )
+        for i in range(players)
+    ]
+    return lb, entries
+
+
+def _render_all(lb: LeaderboardData, entries: list) -> None:
+    render_chunk = leaderboards.render_leaderboard_chunk.__wrapped__
+
+    for i in range(0, len(entries), _ENTRIES_PER_CHUNK):
+        render_chunk(lb, entries[i:i + _ENTRIES_PER_CHUNK], i + 1, include_header=i == 0)
+
+
+def _timed(func, iterations: int, before=None) -> float:
+    total = 0
+    for _ in range(iterations):
+        if before is not None:
+            before()
+
+        start = time.perf_counter()
+        func()
+        total += time.perf_counter() - start
+
+    return total / iterations
+
+
+def _clear_caches() -> None:
+    leaderboards.row_tiles.clear()
+    leaderboards.header_tiles.clear()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args()
+
+    random.seed(0)
+    lb, entries = synthetic_leaderboard()
+    chunks = -(-len(entries) // _ENTRIES_PER_CHUNK)
+
+    cold = _timed(lambda: _render_all(lb, entries), args.iterations, _clear_caches)
+
+    _render_all(lb, entries)
+    warm = _timed(lambda: _render_all(lb, entries), args.iterations)
+
+    # Players moving around the leaderboard only change their positions
+    shuffled = random.sample(entries, len(entries))
+    moved = _timed(lambda: _render_all(lb, shuffled), args.iterations)
+
+    for name, elapsed in (("cold", cold), ("warm", warm), ("warm, reordered", moved)):
+        print(f"{name:<16} {elapsed * 1000:8.2f} ms per leaderboard  "
+              f"{elapsed / chunks * 1000:7.2f} ms per chunk")
+
+    print(f"row cache: {leaderboards.row_tiles.hits} hits, "
+          f"{leaderboards.row_tiles.misses} misses")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Compare renderer request bandwidth and latency with inline and referenced assets.
+
+Sends renders with a skin model and a background image to a local
+stand-in rendering server, once inlining every asset and once sending
+assets by reference, optionally with simulated network latency and
+bandwidth between the client and the server.
+
+Usage (from the repository root):
+    python -m benchmarks.renderer_assets [--renders N] [--users N]
+        [--latency MS] [--bandwidth MBIT]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+
+from aiohttp import web
+
+from statalib.http_sessions import close_sessions
+from statalib.render2 import PlaceholderValues, RenderCache, RendererAssetStore, RenderingClient
+
+from tests.renderer_stub import RendererStub
+
+
+class _BenchmarkClient(RenderingClient):
+    def __init__(self, skin: bytes, store: RendererAssetStore) -> None:
+        super().__init__("bedwars", RenderCache(1, 1), store)
+        self.skin = skin
+
+    def placeholder_values(self) -> PlaceholderValues:
+        placeholder_values = PlaceholderValues.new(
+            text={"wins#text": f"{random.randint(0, 10**5):,}"})
+        placeholder_values.add_skin_model(self.skin)
+        return placeholder_values
+
+
+def _network_middleware(latency: float, bandwidth: float):
+    @web.middleware
+    async def simulate_network(request: web.Request, handler):
+        body = await request.read()
+        await asyncio.sleep(latency + (len(body) * 8 / bandwidth if bandwidth else 0))
+        return await handler(request)
+
+    return simulate_network
+
+
+async def _run(
+    store: RendererAssetStore, renders: list[tuple[bytes, bytes]], args
+) -> tuple[RendererStub, float]:
+    stub = RendererStub()
+    os.environ["RENDERER_HOSTNAME"] = await stub.start(
+        [_network_middleware(args.latency / 1000, args.bandwidth * 1_000_000)])
+
+    try:
+        started_at = time.perf_counter()
+        for skin, background in renders:
+            await _BenchmarkClient(skin, store).render(background, bypass_cache=True)
+        elapsed = time.perf_counter() - started_at
+    finally:
+        await close_sessions()
+        await stub.stop()
+
+    return stub, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--renders", type=int, default=200)
+    parser.add_argument("--users", type=int, default=20, help="Unique skins and backgrounds")
+    parser.add_argument("--latency", type=float, default=0, help="Simulated latency (ms)")
+    parser.add_argument("--bandwidth", type=float, default=0,
+                        help="Simulated bandwidth (Mbit/s), unlimited by default")
+    args = parser.parse_args()
+
+    random.seed(0)
+    users = [
+        (random.randbytes(12 * 1024), random.randbytes(400 * 1024))
+        for _ in range(args.users)
+    ]
+    renders = [random.choice(users) for _ in range(args.renders)]
+
+    for name, store in (
+        ("inline", RendererAssetStore(enabled=False)),
+        ("referenced", RendererAssetStore(theme_refs=False)),
+    ):
+        stub, elapsed = asyncio.run(_run(store, renders, args))
+        print(f"{name:<11} {stub.stats.bytes_received / 1024 / 1024:8.2f} MiB sent  "
+              f"{elapsed / args.renders * 1000:7.2f} ms per render  "
+              f"({stub.stats.uploads} uploads)")
+
+
+if __name__ == "__main__":
+    main()
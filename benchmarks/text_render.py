@@ -0,0 +1,99 @@
+"""
+Microbenchmarks of the Minecraft color coded text rendering path.
+
+Times tokenizing, laying out and drawing a mix of usernames, formatted
+levels and progress bars, with cold and warm layout caches, against the
+previous approach of splitting with `split_string` and measuring every
+segment on each call.
+
+Usage (from the repository root):
+    python -m benchmarks.text_render [--iterations N]
+"""
+
+import argparse
+import random
+import time
+
+from PIL import Image
+
+from statalib.assets import ASSET_LOADER
+from statalib.color import COLOR_CODE_MAP
+from statalib.render import Prestige
+from statalib.render.splitting import split_string
+from statalib.render.text import dummy_draw, render_mc_text
+from statalib.render.tokenizer import layout_text, tokenize
+
+
+_PREFIXES = ("&7", "&a[VIP] ", "&a[VIP&6+&a] ", "&b[MVP] ", "&b[MVP&c+&b] ", "&6[MVP&c++&6] ")
+
+
+def synthetic_texts(amount: int = 200) -> list[str]:
+    texts = []
+    for _ in range(amount):
+        level = random.randint(0, 5000)
+        texts.extend((
+            f"{random.choice(_PREFIXES)}Player{random.randint(0, 10**6)}",
+            f"{Prestige.format_level(level)} {random.choice(_PREFIXES)}Player",
+            f"{Prestige.format_level(level)} &b{'|' * 12}&7{'|' * 13} "
+            f"{Prestige.format_level(level + 1)}",
+            f"&fProgress: &d{random.randint(0, 5000):,} &f/ &a5,000",
+        ))
+    return texts
+
+
+def _legacy_layout(text: str, font) -> tuple:
+    bits = tuple(split_string(text, tuple(COLOR_CODE_MAP.keys())))
+    actual_text = ''.join([bit[0] for bit in bits])
+
+    widths = [int(dummy_draw.textlength(bit[0], font=font)) for bit in bits]
+    return bits, widths, dummy_draw.textlength(actual_text, font=font)
+
+
+def _per_text(func, texts: list[str], iterations: int, before=None) -> float:
+    total = 0
+    for _ in range(iterations):
+        if before is not None:
+            before()
+
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        total += time.perf_counter() - start
+
+    return total / (iterations * len(texts))
+
+
+def _clear_caches() -> None:
+    tokenize.cache_clear()
+    layout_text.cache_clear()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    random.seed(0)
+    texts = synthetic_texts()
+    font = ASSET_LOADER.load_font("main.ttf", 20)
+    image = Image.new("RGBA", (1000, 40))
+
+    results = {
+        "legacy split + measure": _per_text(
+            lambda text: _legacy_layout(text, font), texts, args.iterations),
+        "tokenize (cold)": _per_text(tokenize, texts, args.iterations, _clear_caches),
+        "layout (cold)": _per_text(
+            lambda text: layout_text(text, font), texts, args.iterations, _clear_caches),
+        "layout (warm)": _per_text(lambda text: layout_text(text, font), texts, args.iterations),
+        "render_mc_text (warm)": _per_text(
+            lambda text: render_mc_text(text, (500, 5), image, font, shadow_offset=(2, 2)),
+            texts, args.iterations),
+    }
+
+    print(f"{len(texts)} texts, {args.iterations} iterations")
+    for name, elapsed in results.items():
+        print(f"  {name:<24} {elapsed * 1_000_000:8.2f} µs per text")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Time loading dynamically colored theme backgrounds with and without the variant cache.
+
+Loads the background of a dynamically colored theme for random rank and
+prestige colors, recoloring on every load as before, then through the
+variant cache from memory and from disk.
+
+Usage (from the repository root):
+    python -m benchmarks.theme_variants [--loads N] [--theme ID]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+
+from statalib.assets import ASSET_LOADER
+from statalib.render.theme_variants import (
+    PLACEHOLDER_RGB, ThemeVariantCache, prestige_colors, rank_colors)
+from statalib.render.tools import recolor_pixels
+
+
+def _per_load(load, colors: list[tuple], before=None) -> float:
+    if before is not None:
+        before()
+
+    started_at = time.perf_counter()
+    for rank_rgb, prestige_rgb in colors:
+        load(rank_rgb, prestige_rgb)
+
+    return (time.perf_counter() - started_at) / len(colors)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--loads", type=int, default=500)
+    parser.add_argument("--theme", default="mosaic")
+    args = parser.parse_args()
+
+    random.seed(0)
+    image_path = f"bg/total/themes/{args.theme}.png"
+    colors = [
+        (random.choice(rank_colors()), random.choice(prestige_colors()))
+        for _ in range(args.loads)
+    ]
+
+    def recolor(rank_rgb, prestige_rgb):
+        return recolor_pixels(
+            ASSET_LOADER.load_image(image_path).convert("RGBA"),
+            rgb_from=PLACEHOLDER_RGB, rgb_to=(rank_rgb, prestige_rgb))
+
+    memory = ThemeVariantCache(1024 * 1024 * 1024)
+
+    with tempfile.TemporaryDirectory() as disk_dir:
+        disk = ThemeVariantCache(1024 * 1024 * 1024, disk_dir)
+        for rank_rgb, prestige_rgb in set(colors):
+            _ = disk.get(image_path, rank_rgb, prestige_rgb)
+
+        results = {
+            "recolor every load": _per_load(recolor, colors),
+            "variant cache (cold)": _per_load(
+                lambda *rgb: memory.get(image_path, *rgb), colors),
+            "variant cache (memory)": _per_load(
+                lambda *rgb: memory.get(image_path, *rgb), colors),
+            "variant cache (disk cold)": _per_load(
+                lambda *rgb: disk.get(image_path, *rgb), colors, disk.clear),
+        }
+
+    print(f"{args.loads} loads of {image_path}, {len(set(colors))} distinct variants")
+    for name, elapsed in results.items():
+        print(f"  {name:<24} {elapsed * 1000:8.3f} ms per load")
+
+
+if __name__ == "__main__":
+    main()
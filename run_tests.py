@@ -8,9 +8,9 @@ load_dotenv(f"{REL_PATH}/.env.test")
 
 failures = 0
 
-def run_test_suite(start_dir: str) -> int:
+def run_test_suite(start_dir: str, top_level_dir: str | None = None) -> int:
     loader = unittest.TestLoader()
-    suite = loader.discover(start_dir)
+    suite = loader.discover(start_dir, top_level_dir=top_level_dir)
 
     print(f"Running: {start_dir}")
     test_result = unittest.TextTestRunner().run(suite)
@@ -18,6 +18,7 @@ def run_test_suite(start_dir: str) -> int:
     return len(test_result.failures)
 
 failures += run_test_suite("tests/test_statalib")
+failures += run_test_suite("tests/test_bot", top_level_dir=".")
 if os.path.exists("apps/website/tests"):
     failures += run_test_suite("apps/website/tests/")
 
@@ -6,6 +6,26 @@ CREATE TABLE IF NOT EXISTS live_leaderboards (
     PRIMARY KEY (guild_id, leaderboard_path)
 );
 
+-- The last rendered chunk images of each live leaderboard path, so that
+-- unchanged chunks aren't rendered again, see `LiveLeaderboardsRepo`
+CREATE TABLE IF NOT EXISTS live_leaderboard_chunks (
+    leaderboard_path TEXT,
+    chunk_index INTEGER,
+    digest TEXT NOT NULL,
+    image BLOB NOT NULL,
+    PRIMARY KEY (leaderboard_path, chunk_index)
+);
+
+-- The last successful delivery to each live leaderboard, so an unchanged
+-- leaderboard is only delivered to the live leaderboards that are stale
+CREATE TABLE IF NOT EXISTS live_leaderboard_guild_deliveries (
+    guild_id INTEGER,
+    leaderboard_path TEXT,
+    digest TEXT NOT NULL,
+    delivered_at REAL NOT NULL, -- UNIX timestamp
+    PRIMARY KEY (guild_id, leaderboard_path)
+);
+
 CREATE TABLE IF NOT EXISTS autofill (
     discord_id INTEGER PRIMARY KEY,
     uuid TEXT,
@@ -51,6 +71,15 @@ CREATE TABLE IF NOT EXISTS default_reset_times (
     reset_minute INTEGER DEFAULT 0
 );
 
+-- Materialized from the reset time tables, see `statalib.reset_slots`
+CREATE TABLE IF NOT EXISTS reset_slots (
+    uuid TEXT NOT NULL,
+    reset_slot INTEGER NOT NULL, -- UTC minute of day (0-1439)
+    PRIMARY KEY (uuid, reset_slot)
+);
+
+CREATE INDEX IF NOT EXISTS idx_reset_slots_reset_slot ON reset_slots (reset_slot);
+
 
 CREATE TABLE IF NOT EXISTS growth_data (
     timestamp REAL,
@@ -0,0 +1,45 @@
+"""
+Check the materialized reset slots against the original reset time query.
+
+Usage (from the repository root):
+    python -m scripts.check_reset_slots [--db PATH] [--rebuild]
+"""
+
+import argparse
+import sys
+
+import statalib as lib
+from statalib import reset_slots
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", default=lib.config.DB_FILE_PATH,
+                        help="The database file to check.")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Rebuild every reset slot before checking.")
+    args = parser.parse_args()
+
+    lib.db.setup_database_schema(db_fp=args.db)
+
+    with lib.db.get_pool(args.db).connection() as conn:
+        cursor = conn.cursor()
+
+        if args.rebuild:
+            reset_slots.rebuild_reset_slots(cursor=cursor)
+
+        mismatches = reset_slots.check_reset_slot_consistency(cursor=cursor)
+
+    for slot, (missing, unexpected) in sorted(mismatches.items()):
+        print(f"{slot // 60:02}:{slot % 60:02} UTC: "
+              f"missing {sorted(missing)}, unexpected {sorted(unexpected)}")
+
+    if mismatches:
+        print(f"{len(mismatches):,} inconsistent reset slots.")
+        sys.exit(1)
+
+    print("Reset slots are consistent.")
+
+
+if __name__ == "__main__":
+    main()
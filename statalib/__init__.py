@@ -7,6 +7,7 @@ loading assets, calculating statistics, session stats, themes, and more.
 
 from . import (
     accounts,
+    codec,
     db,
     errors,
     fmt,
@@ -15,6 +16,7 @@ from . import (
     network,
     redis_ext,
     render,
+    reset_slots,
     rotational_stats,
     sessions,
     stats_snapshot,
@@ -36,6 +38,7 @@ __all__ = [
     "Mode",
     "ModesEnum",
     "accounts",
+    "codec",
     "db",
     "errors",
     "fmt",
@@ -43,6 +46,7 @@ __all__ = [
     "loggers",
     "network",
     "render",
+    "reset_slots",
     "rotational_stats",
     "sessions",
     "stats_snapshot",
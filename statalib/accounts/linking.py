@@ -7,6 +7,7 @@ import mcfetch
 
 from ..aliases import HypixelData, PlayerName, PlayerUUID
 from ..db import Cursor, ensure_cursor
+from ..reset_slots import refresh_reset_slots
 from ..sessions import SessionManager
 from ..usage import insert_growth_data
 from .permissions import AccountPermissions
@@ -96,6 +97,9 @@ class AccountLinking:
         if not linked_data:
             insert_growth_data(self._discord_user_id, "add", "linked", cursor=cursor)
 
+        # The configured reset time of the user now applies to the new player
+        refresh_reset_slots([uuid, linked_data and linked_data[1]], cursor=cursor)
+
     @ensure_cursor
     def unlink_account(self, *, cursor: Cursor = None) -> str | None:
         """
@@ -116,6 +120,7 @@ class AccountLinking:
             )
 
             insert_growth_data(self._discord_user_id, "remove", "linked", cursor=cursor)
+            refresh_reset_slots([current_data[0]], cursor=cursor)
             return current_data[0]
 
         return None
@@ -99,6 +99,33 @@ def get_exclusive_theme_ids() -> list[str]:
     return [theme.id for theme in get_exclusive_themes()]
 
 
+@ensure_cursor
+def get_most_used_themes(limit: int | None = None, *, cursor: Cursor = None) -> list[Theme]:
+    """
+    Get the themes most users have set as their active theme.
+
+    :param limit: The maximum amount of themes to return, unlimited by default.
+    :return list[Theme]: The themes, most used first.
+    """
+    rows: list[tuple[str, int]] = cursor.execute(
+        "SELECT selected_theme, COUNT(*) FROM themes_data "
+        "WHERE selected_theme IS NOT NULL "
+        "GROUP BY selected_theme ORDER BY COUNT(*) DESC",
+    ).fetchall()
+
+    most_used = []
+    for theme_id, _ in rows:
+        try:
+            most_used.append(get_theme_by_id(theme_id))
+        except ThemeNotFoundError:
+            continue  # Removed from the config
+
+        if limit is not None and len(most_used) >= limit:
+            break
+
+    return most_used
+
+
 @dataclass
 class ThemesData:
     """Represents the themes data for a user."""
@@ -0,0 +1,200 @@
+"""
+Pluggable JSON codec used for API responses and cache payloads.
+
+The fastest installed backend is used, `orjson` or `msgspec` if either
+is installed, otherwise the standard library `json` module. The backend
+can be pinned with the `global.json_codec` config option.
+"""
+
+import json
+import logging
+from json import JSONDecodeError
+from typing import Any, TypeVar
+
+from aiohttp import ClientResponse
+from aiohttp_client_cache.response import CachedResponse
+
+from .cfg import config
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class JsonCodec:
+    """Standard library JSON codec, the base of every other codec."""
+    name = "json"
+    "The name of the codec's backend."
+    supports_typed_decoding = False
+    "Whether `loads_typed` decodes straight into the given type."
+
+    def loads(self, data: bytes | str) -> Any:
+        """
+        Decode a JSON document.
+
+        :param data: The JSON document.
+        :raises JSONDecodeError: The document is not valid JSON.
+        """
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        """
+        Encode an object as a compact UTF-8 JSON document.
+
+        :param obj: The object to encode.
+        """
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    def loads_typed(self, data: bytes | str, type_: type[T]) -> T:
+        """
+        Decode a JSON document into the given type, only decoding the
+        fields of the type if the backend supports it. Otherwise the whole
+        document is decoded and returned as is.
+
+        :param data: The JSON document.
+        :param type_: The type (a `TypedDict` for example) to decode into.
+        :raises JSONDecodeError: The document is not valid JSON.
+        """
+        return self.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """JSON codec backed by `orjson`."""
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+        self._orjson = orjson
+
+    def loads(self, data: bytes | str) -> Any:
+        # orjson's decode error is a subclass of `JSONDecodeError`
+        return self._orjson.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj, option=self._orjson.OPT_NON_STR_KEYS)
+
+
+class MsgspecCodec(JsonCodec):
+    """JSON codec backed by `msgspec`, supports typed decoding."""
+    name = "msgspec"
+    supports_typed_decoding = True
+
+    def __init__(self) -> None:
+        import msgspec
+        self._msgspec = msgspec
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+        self._typed_decoders: dict[Any, msgspec.json.Decoder] = {}
+
+    def loads(self, data: bytes | str) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._msgspec.DecodeError as exc:
+            raise JSONDecodeError(str(exc), str(data[:64]), 0) from exc
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads_typed(self, data: bytes | str, type_: type[T]) -> T:
+        decoder = self._typed_decoders.get(type_)
+        if decoder is None:
+            decoder = self._typed_decoders[type_] = self._msgspec.json.Decoder(type_)
+
+        try:
+            return decoder.decode(data)
+        except self._msgspec.ValidationError:
+            # Unexpected field types, the caller still gets the whole document
+            return self.loads(data)
+        except self._msgspec.DecodeError as exc:
+            raise JSONDecodeError(str(exc), str(data[:64]), 0) from exc
+
+
+_CODEC_TYPES: dict[str, type[JsonCodec]] = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "json": JsonCodec
+}
+"Every codec by backend name, in order of preference."
+
+
+def available_codecs() -> dict[str, JsonCodec]:
+    """Get an instance of every codec whose backend is installed."""
+    codecs = {}
+
+    for name, codec_type in _CODEC_TYPES.items():
+        try:
+            codecs[name] = codec_type()
+        except ImportError:
+            pass
+
+    return codecs
+
+
+def get_codec(name: str="auto") -> JsonCodec:
+    """
+    Get a codec by backend name.
+
+    :param name: The name of the backend, or `auto` for the fastest \
+        installed backend. Falls back to the standard library codec if \
+        the backend isn't installed.
+    """
+    codecs = available_codecs()
+
+    if name == "auto":
+        return next(iter(codecs.values()))
+
+    if name not in codecs:
+        logger.warning(f"JSON codec '{name}' is unavailable, using '{JsonCodec.name}'")
+        return codecs[JsonCodec.name]
+
+    return codecs[name]
+
+
+def _configured_codec_name() -> str:
+    try:
+        return config("global.json_codec") or "auto"
+    except KeyError:
+        return "auto"
+
+
+json_codec = get_codec(_configured_codec_name())
+"The process wide JSON codec."
+
+
+def loads(data: bytes | str) -> Any:
+    """
+    Decode a JSON document using the process wide codec.
+
+    :param data: The JSON document.
+    :raises JSONDecodeError: The document is not valid JSON.
+    """
+    return json_codec.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Encode an object as a compact UTF-8 JSON document using the process
+    wide codec.
+
+    :param obj: The object to encode.
+    """
+    return json_codec.dumps(obj)
+
+
+async def read_response_json(
+    response: ClientResponse | CachedResponse, loads=loads
+) -> Any:
+    """
+    Read and decode the JSON body of a response, including responses
+    served by `aiohttp_client_cache`, which always decode with `json`.
+
+    :param response: The (possibly cached) response to read.
+    :param loads: The function used to decode the body.
+    :raises ContentTypeError: The response isn't a JSON response.
+    """
+    if isinstance(response, CachedResponse):
+        body = (await response.read()).strip()
+        return loads(body) if body else None
+
+    return await response.json(loads=loads)
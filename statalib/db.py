@@ -1,13 +1,547 @@
 """Database related functionality."""
 
+import asyncio
 import functools
+import queue
 import sqlite3
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Generator, Iterator, TypeVar
+
 import aiosqlite
 from aiosqlite import Cursor as AsyncCursor
 from sqlite3 import Cursor
 
 from .common import REL_PATH
 from .cfg import config
+from .errors import DatabasePoolTimeoutError
+
+
+DEFAULT_POOL_SETTINGS = {
+    "pool_size": 8,
+    "checkout_timeout": 30,
+    "mmap_size": 268435456,  # 256 MiB
+    "cache_size": -16000,  # ~16 MiB (negative values are in KiB)
+    "busy_timeout": 5000  # Milliseconds
+}
+"Fallback connection pool settings used when `global.database` is not configured."
+
+
+T = TypeVar("T")
+
+
+def _pool_settings() -> dict:
+    try:
+        configured: dict = config("global.database") or {}
+    except KeyError:
+        configured = {}
+
+    return {**DEFAULT_POOL_SETTINGS, **configured}
+
+
+@dataclass
+class PoolMetrics:
+    """A snapshot of connection pool metrics."""
+    size: int
+    "The maximum amount of connections per side (sync / async) of the pool."
+    open_connections: int
+    "The amount of connections that are currently open."
+    in_use: int
+    "The amount of connections that are currently checked out."
+    checkouts: int
+    "The total amount of connections handed out by the pool."
+    reentrant_checkouts: int
+    "The total amount of checkouts served by a connection already held by the caller."
+    timeouts: int
+    "The total amount of checkouts that gave up waiting for a connection."
+    total_wait: float
+    "The total time (in seconds) spent waiting for a connection."
+    max_wait: float
+    "The longest time (in seconds) spent waiting for a connection."
+
+    @property
+    def average_wait(self) -> float:
+        """The average time (in seconds) spent waiting for a connection."""
+        return self.total_wait / (self.checkouts or 1)
+
+
+@dataclass
+class _HeldConnection:
+    connection: sqlite3.Connection | aiosqlite.Connection
+    owner: object | None = None
+    depth: int = 0
+
+
+def _current_owner() -> object:
+    # Context variables are copied into child tasks and `to_thread` workers,
+    # which must not share the connection held by their parent.
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+
+    return task or threading.current_thread()
+
+
+class ConnectionPool:
+    """
+    A pool of long lived database connections.
+
+    Connections have their PRAGMAs applied once when they are opened and are
+    then reused across calls. A connection that is checked out is held for the
+    current thread / task, so nested checkouts reuse it (wrapped in a savepoint)
+    rather than opening a second connection.
+    """
+    def __init__(
+        self,
+        db_fp: str,
+        size: int | None=None,
+        checkout_timeout: float | None=None,
+        pragmas: dict[str, int | str] | None=None
+    ) -> None:
+        """
+        Initialize the pool, no connections are opened until they are needed.
+
+        :param db_fp: The path to the database file.
+        :param size: The maximum amount of sync and async connections (each).
+        :param checkout_timeout: How long to wait (in seconds) for a free \
+            connection before raising `DatabasePoolTimeoutError`.
+        :param pragmas: Override the configured per-connection PRAGMA values.
+        """
+        settings = _pool_settings()
+
+        self.db_fp = db_fp
+        self.size: int = size or settings["pool_size"]
+        self.checkout_timeout: float = checkout_timeout or settings["checkout_timeout"]
+
+        self._pragmas: dict[str, int | str] = {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "mmap_size": settings["mmap_size"],
+            "cache_size": settings["cache_size"],
+            "busy_timeout": settings["busy_timeout"],
+            **(pragmas or {})
+        }
+
+        self._lock = threading.Lock()
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._open = 0
+        self._held: ContextVar[_HeldConnection | None] = ContextVar(
+            f"db_pool_held_{id(self)}", default=None)
+
+        self._async_idle: list[aiosqlite.Connection] = []
+        self._async_open = 0
+        self._async_semaphore: asyncio.Semaphore | None = None
+        self._async_loop: asyncio.AbstractEventLoop | None = None
+        self._async_held: ContextVar[_HeldConnection | None] = ContextVar(
+            f"db_pool_async_held_{id(self)}", default=None)
+
+        self._checkouts = 0
+        self._reentrant_checkouts = 0
+        self._timeouts = 0
+        self._in_use = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _pragma_statements(self) -> list[str]:
+        return [f"PRAGMA {key} = {value}" for key, value in self._pragmas.items()]
+
+    def _record_checkout(self, waited: float) -> None:
+        with self._lock:
+            self._checkouts += 1
+            self._in_use += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+
+    def _record_checkin(self) -> None:
+        with self._lock:
+            self._in_use -= 1
+
+    def metrics(self) -> PoolMetrics:
+        """Get a snapshot of the pool's metrics."""
+        with self._lock:
+            return PoolMetrics(
+                size=self.size,
+                open_connections=self._open + self._async_open,
+                in_use=self._in_use,
+                checkouts=self._checkouts,
+                reentrant_checkouts=self._reentrant_checkouts,
+                timeouts=self._timeouts,
+                total_wait=self._total_wait,
+                max_wait=self._max_wait
+            )
+
+    # Sync connections
+
+    def _open_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_fp, check_same_thread=False)
+
+        for statement in self._pragma_statements():
+            conn.execute(statement)
+
+        return conn
+
+    def _checkout(self) -> sqlite3.Connection:
+        start = time.perf_counter()
+
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_open = self._open < self.size
+                if can_open:
+                    self._open += 1
+
+            if can_open:
+                try:
+                    conn = self._open_connection()
+                except BaseException:
+                    with self._lock:
+                        self._open -= 1
+                    raise
+            else:
+                try:
+                    conn = self._idle.get(timeout=self.checkout_timeout)
+                except queue.Empty as exc:
+                    with self._lock:
+                        self._timeouts += 1
+                    raise DatabasePoolTimeoutError(
+                        f"No database connection became available within "
+                        f"{self.checkout_timeout} seconds.") from exc
+
+        self._record_checkout(time.perf_counter() - start)
+        return conn
+
+    def _try_checkout(self, reserve: int=0) -> sqlite3.Connection | None:
+        # Non blocking checkout that leaves `reserve` connections for others
+        with self._lock:
+            if self._in_use >= self.size - reserve:
+                return None
+
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_open = self._open < self.size
+                if can_open:
+                    self._open += 1
+
+            if not can_open:
+                return None
+
+            try:
+                conn = self._open_connection()
+            except BaseException:
+                with self._lock:
+                    self._open -= 1
+                raise
+
+        self._record_checkout(0.0)
+        return conn
+
+    def _checkin(self, conn: sqlite3.Connection) -> None:
+        self._record_checkin()
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Check out a connection for the current thread / task.
+
+        The changes are committed once the outermost checkout exits, or rolled
+        back if it exits with an exception. Nested checkouts reuse the held
+        connection inside of a savepoint.
+        """
+        held = self._held.get()
+
+        if held is not None and held.owner is _current_owner():
+            with self._lock:
+                self._reentrant_checkouts += 1
+            yield from self._savepoint(held)
+            return
+
+        conn = self._checkout()
+        token = self._held.set(_HeldConnection(conn, _current_owner()))
+
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._held.reset(token)
+            self._checkin(conn)
+
+    @staticmethod
+    def _savepoint(held: _HeldConnection) -> Iterator[sqlite3.Connection]:
+        held.depth += 1
+        name = f"sp_{held.depth}"
+
+        # A savepoint outside of a transaction commits itself on release
+        if not held.connection.in_transaction:
+            held.connection.execute("BEGIN")
+
+        held.connection.execute(f"SAVEPOINT {name}")
+        try:
+            yield held.connection
+        except BaseException:
+            held.connection.execute(f"ROLLBACK TO {name}")
+            held.connection.execute(f"RELEASE {name}")
+            raise
+        else:
+            held.connection.execute(f"RELEASE {name}")
+        finally:
+            held.depth -= 1
+
+    async def run_in_scope(self, coro: Awaitable[T]) -> T:
+        """
+        Run a coroutine as a single unit of work on one held connection.
+
+        Every sync checkout made by the coroutine's task reuses the same
+        connection, and pending changes are committed once per suspension
+        of the coroutine rather than once per call. The write lock is never
+        held while the coroutine is awaiting, so other tasks on the event
+        loop can't end up blocked behind it. Everything is rolled back to
+        the last commit if the coroutine raises.
+
+        If the pool has no spare connection the coroutine simply runs
+        unscoped, falling back to a checkout per call.
+
+        :param coro: The coroutine to run.
+        """
+        held = self._held.get()
+        if held is not None and held.owner is _current_owner():
+            return await coro  # Already scoped
+
+        # Always leave a connection free for unscoped checkouts
+        conn = self._try_checkout(reserve=1)
+        if conn is None:
+            return await coro
+
+        token = self._held.set(_HeldConnection(conn, _current_owner()))
+
+        try:
+            result = await _CommitOnSuspend(coro, conn)
+            conn.commit()
+            return result
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._held.reset(token)
+            self._checkin(conn)
+
+    # Async connections
+
+    async def _bind_to_running_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._async_loop is loop:
+            return
+
+        # Loop bound primitives can't be shared across event loops
+        stale_connections, self._async_idle = self._async_idle, []
+        for conn in stale_connections:
+            await conn.close()
+
+        with self._lock:
+            self._async_open -= len(stale_connections)
+
+        self._async_loop = loop
+        self._async_semaphore = asyncio.Semaphore(self.size)
+
+    async def _open_async_connection(self) -> aiosqlite.Connection:
+        conn = aiosqlite.connect(self.db_fp)
+        conn.daemon = True  # Idle connections shouldn't keep the process alive
+        await conn
+
+        for statement in self._pragma_statements():
+            await conn.execute(statement)
+
+        return conn
+
+    async def _async_checkout(self) -> aiosqlite.Connection:
+        await self._bind_to_running_loop()
+        start = time.perf_counter()
+
+        try:
+            await asyncio.wait_for(
+                self._async_semaphore.acquire(), timeout=self.checkout_timeout)
+        except asyncio.TimeoutError as exc:
+            with self._lock:
+                self._timeouts += 1
+            raise DatabasePoolTimeoutError(
+                f"No database connection became available within "
+                f"{self.checkout_timeout} seconds.") from exc
+
+        try:
+            if self._async_idle:
+                conn = self._async_idle.pop()
+            else:
+                conn = await self._open_async_connection()
+                with self._lock:
+                    self._async_open += 1
+        except BaseException:
+            self._async_semaphore.release()
+            raise
+
+        self._record_checkout(time.perf_counter() - start)
+        return conn
+
+    def _async_checkin(self, conn: aiosqlite.Connection) -> None:
+        self._record_checkin()
+        self._async_idle.append(conn)
+        self._async_semaphore.release()
+
+    @asynccontextmanager
+    async def async_connection(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        *Uses aiosqlite*
+        Check out a connection for the current task.
+
+        The changes are committed once the outermost checkout exits, or rolled
+        back if it exits with an exception. Nested checkouts within the same
+        task reuse the held connection inside of a savepoint.
+        """
+        held = self._async_held.get()
+
+        if held is not None and held.owner is asyncio.current_task():
+            with self._lock:
+                self._reentrant_checkouts += 1
+
+            held.depth += 1
+            name = f"sp_{held.depth}"
+
+            if not held.connection.in_transaction:
+                await held.connection.execute("BEGIN")
+
+            await held.connection.execute(f"SAVEPOINT {name}")
+            try:
+                yield held.connection
+            except BaseException:
+                await held.connection.execute(f"ROLLBACK TO {name}")
+                await held.connection.execute(f"RELEASE {name}")
+                raise
+            else:
+                await held.connection.execute(f"RELEASE {name}")
+            finally:
+                held.depth -= 1
+            return
+
+        conn = await self._async_checkout()
+        token = self._async_held.set(_HeldConnection(conn, asyncio.current_task()))
+
+        try:
+            yield conn
+            await conn.commit()
+        except BaseException:
+            await conn.rollback()
+            raise
+        finally:
+            self._async_held.reset(token)
+            self._async_checkin(conn)
+
+    def close(self) -> None:
+        """Close all idle sync connections."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+
+            conn.close()
+            with self._lock:
+                self._open -= 1
+
+    async def aclose(self) -> None:
+        """Close all idle sync and async connections."""
+        self.close()
+
+        idle, self._async_idle = self._async_idle, []
+        for conn in idle:
+            await conn.close()
+
+        with self._lock:
+            self._async_open -= len(idle)
+
+
+class _CommitOnSuspend:
+    # Drives a coroutine, committing pending changes whenever it suspends
+    def __init__(self, coro: Awaitable[T], conn: sqlite3.Connection) -> None:
+        self._coro = coro.__await__()
+        self._conn = conn
+
+    def __await__(self) -> Generator[Any, Any, T]:
+        value, error = None, None
+
+        while True:
+            try:
+                if error is not None:
+                    yielded = self._coro.throw(error)
+                else:
+                    yielded = self._coro.send(value)
+            except StopIteration as exc:
+                return exc.value
+
+            if self._conn.in_transaction:
+                self._conn.commit()
+
+            try:
+                value, error = (yield yielded), None
+            except GeneratorExit:
+                self._coro.close()
+                raise
+            except BaseException as exc:
+                value, error = None, exc
+
+
+_pools: dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_fp: str | None=None) -> ConnectionPool:
+    """
+    Get the connection pool for a database file, creating it if needed.
+
+    :param db_fp: The path to the database file, defaults to the configured one.
+    """
+    db_fp = db_fp or config.DB_FILE_PATH
+
+    with _pools_lock:
+        pool = _pools.get(db_fp)
+        if pool is None:
+            pool = _pools[db_fp] = ConnectionPool(db_fp)
+
+    return pool
+
+
+async def close_pools() -> None:
+    """Close the idle connections of every pool, should be called on shutdown."""
+    for pool in list(_pools.values()):
+        await pool.aclose()
+
+
+async def run_in_interaction_scope(coro: Awaitable[T]) -> T:
+    """
+    Run a coroutine (usually an interaction handler) as one unit of work
+    on the configured pool. See `ConnectionPool.run_in_scope`.
+
+    :param coro: The coroutine to run.
+    """
+    return await get_pool().run_in_scope(coro)
+
+
+@contextmanager
+def transaction() -> Iterator[sqlite3.Connection]:
+    """
+    Group the `ensure_cursor` calls made inside of the block into a single
+    transaction on one pooled connection.
+    """
+    with get_pool().connection() as conn:
+        yield conn
 
 
 def db_connect() -> sqlite3.Connection:
@@ -19,7 +553,7 @@ def ensure_cursor(func):
     """
     Decorator to ensure a database cursor is resolved.
 
-    If the `cursor` argument is `None`, a new db connection and cursor
+    If the `cursor` argument is `None`, a pooled db connection and cursor
     will be acquired, otherwise the passed `cursor` argument will be used.
     """
     @functools.wraps(func)
@@ -28,8 +562,8 @@ def ensure_cursor(func):
         if cursor:  # Use provided cursor.
             return func(*args, **kwargs)
 
-        # Create a new db connection and cursor object.
-        with db_connect() as conn:
+        # Acquire a pooled db connection and create a cursor object.
+        with get_pool().connection() as conn:
             cursor = conn.cursor()
             kwargs['cursor'] = cursor
             return func(*args, **kwargs)
@@ -42,7 +576,7 @@ def async_ensure_cursor(func):
     *Uses aiosqlite*
     Decorator to ensure a database cursor is resolved.
 
-    If the `cursor` argument is `None`, a new db connection and cursor
+    If the `cursor` argument is `None`, a pooled db connection and cursor
     will be acquired, otherwise the passed `cursor` argument will be used.
     Automatically commits the changes.
     """
@@ -52,17 +586,13 @@ def async_ensure_cursor(func):
         if cursor:  # Use provided cursor.
             return await func(*args, **kwargs)
 
-        # Create a new db connection and cursor object.
-        async with aiosqlite.connect(config.DB_FILE_PATH) as conn:
+        # Acquire a pooled db connection and create a cursor object.
+        async with get_pool().async_connection() as conn:
             cursor = await conn.cursor()
             cursor.row_factory = aiosqlite.Row
             kwargs['cursor'] = cursor
 
-            result = await func(*args, **kwargs)
-
-            await conn.commit()
-
-            return result
+            return await func(*args, **kwargs)
 
     return wrapper
 
@@ -88,5 +618,12 @@ def setup_database_schema(
 __all__ = [
     'db_connect',
     'ensure_cursor',
+    'async_ensure_cursor',
+    'get_pool',
+    'close_pools',
+    'run_in_interaction_scope',
+    'transaction',
+    'ConnectionPool',
+    'PoolMetrics',
     'Cursor',
 ]
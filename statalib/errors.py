@@ -53,3 +53,9 @@ class DataNotFoundError(Exception):
 
 class BackgroundPropertiesNotFoundError(Exception):
     """No properties were found for the provided background ID."""
+
+class DatabasePoolTimeoutError(Exception):
+    """No pooled database connection became available in time."""
+
+class RendererUnavailableError(Exception):
+    """No rendering server replica is currently available."""
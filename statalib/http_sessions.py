@@ -0,0 +1,144 @@
+"""
+Process wide HTTP session registry, keeping one keep-alive session per
+upstream service. Exposed through `statalib.network`.
+"""
+
+import asyncio
+from typing import Literal
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+from aiohttp_client_cache import CacheBackend
+from aiohttp_client_cache.session import CachedSession
+
+from .cfg import config
+
+
+Upstream = Literal["hypixel", "mojang", "skins", "renderer", "default"]
+
+DEFAULT_UPSTREAM_SETTINGS: dict[str, dict[str, float]] = {
+    "hypixel": {"limit_per_host": 20, "timeout": 5},
+    "mojang": {"limit_per_host": 10, "timeout": 5},
+    "skins": {"limit_per_host": 20, "timeout": 5},
+    "renderer": {"limit_per_host": 32, "timeout": 10},
+    "default": {"limit_per_host": 10, "timeout": 10},
+}
+"Fallback settings of each upstream used when `global.network.upstreams` is not configured."
+
+_COMMON_SETTINGS = {
+    "ttl_dns_cache": 300,  # Seconds
+    "keepalive_timeout": 60  # Seconds
+}
+
+
+def _upstream_settings(upstream: Upstream) -> dict[str, float]:
+    try:
+        configured: dict = config(f"global.network.upstreams.{upstream}") or {}
+    except KeyError:
+        configured = {}
+
+    return {
+        **_COMMON_SETTINGS,
+        **DEFAULT_UPSTREAM_SETTINGS.get(upstream, DEFAULT_UPSTREAM_SETTINGS["default"]),
+        **configured
+    }
+
+
+class SessionRegistry:
+    """
+    Lazily creates and holds a shared `ClientSession` per upstream, backed
+    by a connector with per host connection limits and DNS caching, so
+    that connections are kept alive between requests.
+
+    Sessions returned by the registry must not be closed by the caller,
+    the registry is closed once on shutdown with `close()`.
+    """
+    def __init__(self) -> None:
+        self._connectors: dict[str, TCPConnector] = {}
+        self._sessions: dict[tuple[str, int | None], ClientSession] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        # Sessions are bound to the loop they were created on
+        if self._loop is not loop:
+            self._connectors.clear()
+            self._sessions.clear()
+            self._loop = loop
+
+    def _connector(self, upstream: Upstream) -> TCPConnector:
+        connector = self._connectors.get(upstream)
+
+        if connector is None or connector.closed:
+            settings = _upstream_settings(upstream)
+            connector = self._connectors[upstream] = TCPConnector(
+                limit_per_host=int(settings["limit_per_host"]),
+                ttl_dns_cache=settings["ttl_dns_cache"],
+                keepalive_timeout=settings["keepalive_timeout"]
+            )
+
+        return connector
+
+    def _get_or_create(
+        self, upstream: Upstream, cache: CacheBackend | None
+    ) -> ClientSession | CachedSession:
+        self._bind_loop()
+
+        key = (upstream, None if cache is None else id(cache))
+        session = self._sessions.get(key)
+
+        if session is None or session.closed:
+            options = {
+                "connector": self._connector(upstream),
+                "connector_owner": False,
+                "timeout": ClientTimeout(total=_upstream_settings(upstream)["timeout"])
+            }
+
+            if cache is None:
+                session = ClientSession(**options)
+            else:
+                session = CachedSession(cache=cache, **options)
+
+            self._sessions[key] = session
+
+        return session
+
+    def session(self, upstream: Upstream) -> ClientSession:
+        """
+        Get the shared session of an upstream.
+
+        :param upstream: The upstream service the session is used for.
+        """
+        return self._get_or_create(upstream, None)
+
+    def cached_session(self, upstream: Upstream, cache: CacheBackend) -> CachedSession:
+        """
+        Get the shared caching session of an upstream and cache backend.
+        The session shares its connections with the upstream's session.
+
+        :param upstream: The upstream service the session is used for.
+        :param cache: The cache backend the session should use.
+        """
+        return self._get_or_create(upstream, cache)
+
+    async def close(self) -> None:
+        """Close every session and its connections, should be called on shutdown."""
+        sessions = list(self._sessions.values())
+        connectors = list(self._connectors.values())
+        self._sessions.clear()
+        self._connectors.clear()
+
+        for session in sessions:
+            await session.close()
+
+        for connector in connectors:
+            await connector.close()
+
+
+http_sessions = SessionRegistry()
+"The process wide session registry."
+
+
+async def close_sessions() -> None:
+    """Close the process wide session registry, should be called on shutdown."""
+    await http_sessions.close()
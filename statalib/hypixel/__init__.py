@@ -9,6 +9,12 @@ from .projected_stats import ProjectedStats
 from .leveling import Leveling
 from .quests import get_quests_data
 from .ranks import get_rank_info, RankInfo, PlayerRank
+from .projection import (
+    decode_hypixel_data,
+    project_hypixel_data,
+    ProjectedHypixelData,
+    ProjectedPlayerData
+)
 from .utils import *
 from . import lbs
 
@@ -21,5 +27,9 @@ __all__ = [
     'get_rank_info',
     'RankInfo',
     'PlayerRank',
+    'decode_hypixel_data',
+    'project_hypixel_data',
+    'ProjectedHypixelData',
+    'ProjectedPlayerData',
     'lbs'
 ]
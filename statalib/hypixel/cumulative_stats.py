@@ -5,7 +5,7 @@ from ..common import Mode, ModesEnum
 from ..aliases import HypixelData
 from .bedwars_stats import BedwarsStats
 from .leveling import Leveling
-from ..stats_snapshot import BedwarsStatsSnapshot
+from ..stats_snapshot import BedwarsStatsSnapshot, MODE_STAT_KEYS
 
 
 class CumulativeStats(BedwarsStats):
@@ -27,6 +27,12 @@ class CumulativeStats(BedwarsStats):
 
         self._bedwars_stats_snapshot: BedwarsStatsSnapshot = bedwars_stats_snapshot
 
+        # Difference of every tracked stat at once
+        self._cum_mode_stats = (
+            BedwarsStatsSnapshot.from_bedwars_data(self._bedwars_data)
+            - bedwars_stats_snapshot
+        ).mode_view(gamemode)
+
         self.wins_local: int = self._get_mode_stats_local('wins_bedwars')
         self.losses_local: int = self._get_mode_stats_local('losses_bedwars')
 
@@ -68,11 +74,16 @@ class CumulativeStats(BedwarsStats):
 
 
     def _get_mode_stats_local(self, key: str, default=0) -> int:
+        if self._gamemode.is_compound:
+            return default  # Compound modes aren't tracked by snapshots
         prefix = self._gamemode.prefix
-        return self._bedwars_stats_snapshot.__dict__.get(f'{prefix}{key}', default)
+        return self._bedwars_stats_snapshot.get(f'{prefix}{key}', default)
 
 
     def _calc_cum(self, key: str) -> int:
+        if self._cum_mode_stats.is_tracked and key in MODE_STAT_KEYS:
+            return self._cum_mode_stats[key]
+
         hypixel_value = self._get_mode_stats(key)
         local_value = self._get_mode_stats_local(key)
 
@@ -1,15 +1,22 @@
 """Functionality for fetching and processing Hypixel leaderboard data."""
 
+from .crawler import CrawlStats, LeaderboardCrawler, leaderboard_crawler
 from .fetch import fetch_bedwars_leaderboards
 from .values import BedwarsQualifyingValueFormatter
 from .models import LeaderboardData, LeaderboardPlayerEntry, LEADERBOARD_TYPES
 from .db import LiveLeaderboardsRepo
+from .snapshot import LeaderboardProfile, LeaderboardSnapshot
 
 __all__ = [
+    "CrawlStats",
+    "LeaderboardCrawler",
+    "leaderboard_crawler",
     "fetch_bedwars_leaderboards",
     "LeaderboardData",
     "LeaderboardPlayerEntry",
     "BedwarsQualifyingValueFormatter",
     "LiveLeaderboardsRepo",
+    "LeaderboardProfile",
+    "LeaderboardSnapshot",
     "LEADERBOARD_TYPES"
 ]
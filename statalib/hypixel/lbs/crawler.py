@@ -0,0 +1,220 @@
+"""Concurrent crawling of leaderboard player profiles."""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import AsyncGenerator, Sequence
+
+from aiohttp import ClientTimeout
+from aiohttp_client_cache import SQLiteBackend
+from cachetools import TTLCache
+
+from ..projection import decode_hypixel_data
+from ..utils import get_player_dict
+from ...aliases import HypixelPlayerData, PlayerUUID
+from ...cfg import config
+from ...codec import read_response_json
+from ...common import REL_PATH
+from ...http_sessions import http_sessions
+from ...rate_limiting import RequestPriority, hypixel_rate_limiter
+from .models import LeaderboardData, LeaderboardPlayerEntry
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CRAWLER_SETTINGS = {
+    "concurrency": 8,  # Player requests in flight per crawl
+    "profile_cache_size": 1024,  # Players
+    "profile_cache_ttl": 3600,  # Seconds
+    "response_ttl": 3600  # Seconds
+}
+"Fallback crawler settings used when `global.leaderboard_crawler` is not configured."
+
+
+def _crawler_settings() -> dict:
+    try:
+        configured: dict = config("global.leaderboard_crawler") or {}
+    except KeyError:
+        configured = {}
+
+    return {**DEFAULT_CRAWLER_SETTINGS, **configured}
+
+
+player_response_cache = SQLiteBackend(
+    cache_name=f'{REL_PATH}/database/.cache/hypixel_player_cache',
+    expire_after=_crawler_settings()["response_ttl"]
+)
+"""
+The response cache of leaderboard player requests. Players are cached for
+an hour by default, the interval live leaderboards are refreshed at.
+"""
+
+
+@dataclass
+class CrawlStats:
+    """Timing and request counts of a single leaderboard crawl."""
+    crawl_name: str
+    "The name of the crawl, the path of the crawled leaderboard for example."
+    players: int = 0
+    "The amount of players yielded."
+    requests: int = 0
+    "The amount of players requested from Hypixel."
+    cache_hits: int = 0
+    "The amount of players served by the response cache."
+    reused: int = 0
+    "The amount of players reused from previous crawls."
+    elapsed: float = 0
+    "The total time (in seconds) the crawl took."
+    first_player_after: float | None = None
+    "The time (in seconds) until the first player was yielded."
+
+
+class LeaderboardCrawler:
+    """
+    Fetches the players of leaderboards concurrently, while yielding them
+    in leaderboard order. Requests wait for the Hypixel rate limiter at
+    leaderboard priority, so crawls only use the leaderboard share of the
+    rate limit.
+
+    Player data is kept between crawls for a while, since the same players
+    appear on many leaderboards.
+    """
+    def __init__(
+        self,
+        concurrency: int,
+        profile_cache_size: int=1024,
+        profile_cache_ttl: float=3600
+    ) -> None:
+        """
+        :param concurrency: The maximum amount of player requests in flight \
+            per crawl.
+        :param profile_cache_size: The maximum amount of players kept \
+            between crawls.
+        :param profile_cache_ttl: How long (in seconds) players are kept \
+            between crawls.
+        """
+        self.concurrency = concurrency
+        self._profiles: TTLCache[PlayerUUID, HypixelPlayerData] = TTLCache(
+            profile_cache_size, profile_cache_ttl)
+
+        self.last_stats: CrawlStats | None = None
+        "The stats of the last finished crawl."
+
+    @classmethod
+    def from_config(cls) -> 'LeaderboardCrawler':
+        """Create a crawler using the configured settings."""
+        settings = _crawler_settings()
+
+        return cls(
+            concurrency=settings["concurrency"],
+            profile_cache_size=settings["profile_cache_size"],
+            profile_cache_ttl=settings["profile_cache_ttl"]
+        )
+
+    async def _fetch_player_data(
+        self, uuid: PlayerUUID, stats: CrawlStats
+    ) -> HypixelPlayerData:
+        player_data = self._profiles.get(uuid)
+        if player_data is not None:
+            stats.reused += 1
+            return player_data
+
+        session = http_sessions.cached_session("hypixel", player_response_cache)
+        url = f"https://api.hypixel.net/player?uuid={uuid}"
+
+        cached_res = await session.cache.get_response(session.cache.create_key("GET", url))
+        if not cached_res or cached_res.is_expired:
+            await hypixel_rate_limiter.acquire(RequestPriority.LEADERBOARD)
+
+        async with session.get(
+            url=url,
+            headers={"API-Key": os.getenv("API_KEY_HYPIXEL")},
+            timeout=ClientTimeout(5)
+        ) as res:
+            if res.from_cache is False:
+                stats.requests += 1
+                await hypixel_rate_limiter.record_response(res.status, res.headers)
+            else:
+                stats.cache_hits += 1
+
+            hypixel_data = await read_response_json(res, loads=decode_hypixel_data)
+
+        player_data = get_player_dict(hypixel_data)
+        if player_data:
+            self._profiles[uuid] = player_data
+
+        return player_data
+
+    async def crawl_players(
+        self, uuids: Sequence[PlayerUUID], crawl_name: str
+    ) -> AsyncGenerator[HypixelPlayerData, None]:
+        """
+        Fetch the data of every given player, yielding it in the given
+        order. Players further down the list keep being fetched while the
+        caller handles the yielded players.
+
+        :param uuids: The UUIDs of the players to fetch.
+        :param crawl_name: The name of the crawl used by its stats.
+        :yield dict: The 'player' key of each player's Hypixel response.
+        """
+        stats = CrawlStats(crawl_name)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        started_at = time.perf_counter()
+
+        async def fetch(uuid: PlayerUUID) -> HypixelPlayerData:
+            async with semaphore:
+                return await self._fetch_player_data(uuid, stats)
+
+        tasks = [asyncio.ensure_future(fetch(uuid)) for uuid in uuids]
+
+        try:
+            for task in tasks:
+                player_data = await task
+                if stats.first_player_after is None:
+                    stats.first_player_after = time.perf_counter() - started_at
+
+                stats.players += 1
+                yield player_data
+        finally:
+            for task in tasks:
+                if task.done() and not task.cancelled():
+                    _ = task.exception()  # Mark failures of skipped players as retrieved
+                else:
+                    task.cancel()
+
+            stats.elapsed = time.perf_counter() - started_at
+            self.last_stats = stats
+
+            logger.info(
+                f"Crawled {stats.players}/{len(tasks)} players of "
+                f"'{stats.crawl_name}' in {stats.elapsed:.2f}s "
+                f"({stats.requests} requests, {stats.cache_hits} cached, "
+                f"{stats.reused} reused)"
+            )
+
+    async def crawl(
+        self, leaderboard: LeaderboardData
+    ) -> AsyncGenerator[LeaderboardPlayerEntry, None]:
+        """
+        Fetch every player of a leaderboard, yielding them in leaderboard
+        order. Players further down the leaderboard keep being fetched while
+        the caller handles the yielded players.
+
+        :param leaderboard: The Hypixel leaderboard object containing leaders to fetch.
+        :yield LeaderboardPlayerEntry: Relevant data for the leaderboard player, including
+            the associated value that qualifies the player for the leaderboard.
+        """
+        players = self.crawl_players(leaderboard.leaders, leaderboard.info.path)
+
+        try:
+            async for player_data in players:
+                yield LeaderboardPlayerEntry.build(player_data, leaderboard)
+        finally:
+            await players.aclose()
+
+
+leaderboard_crawler = LeaderboardCrawler.from_config()
+"The crawler shared by every leaderboard, so players are reused between them."
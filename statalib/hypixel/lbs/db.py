@@ -5,7 +5,7 @@ from enum import Enum
 import aiosqlite
 
 from ...db import AsyncCursor, async_ensure_cursor
-from .models import GuildLiveLeaderboard
+from .models import GuildLeaderboardDelivery, GuildLiveLeaderboard, LeaderboardChunk
 
 
 class SetLiveLbResult(Enum):
@@ -62,6 +62,13 @@ class LiveLeaderboardsRepo:
         )
         live_lb_row = await cursor.fetchone()
 
+        # The new message hasn't been delivered to
+        _ = await cursor.execute(
+            "DELETE FROM live_leaderboard_guild_deliveries "
+            + "WHERE guild_id = ? AND leaderboard_path = ?",
+            [lb.guild_id, lb.leaderboard_path],
+        )
+
         try:
             if live_lb_row is None:
                 _ = await cursor.execute(
@@ -118,6 +125,11 @@ class LiveLeaderboardsRepo:
             "DELETE FROM live_leaderboards WHERE guild_id = ? AND leaderboard_path = ?",
             [guild_id, leaderboard_path],
         )
+        _ = await cursor.execute(
+            "DELETE FROM live_leaderboard_guild_deliveries "
+            + "WHERE guild_id = ? AND leaderboard_path = ?",
+            [guild_id, leaderboard_path],
+        )
 
         return GuildLiveLeaderboard(**dict(live_lb_row))
 
@@ -187,3 +199,103 @@ class LiveLeaderboardsRepo:
 
         live_lb_rows = await cursor.fetchall()
         return [GuildLiveLeaderboard(**dict(row)) for row in live_lb_rows]
+
+    @async_ensure_cursor
+    @staticmethod
+    async def get_leaderboard_chunks(
+        leaderboard_path: str,
+        *,
+        cursor: AsyncCursor = None,
+    ) -> list[LeaderboardChunk]:
+        """
+        Get the last rendered chunks of a leaderboard path, in order.
+
+        :param leaderboard_path: The leaderboard path of the chunks.
+        """
+        cursor = await cursor.execute(
+            "SELECT digest, image FROM live_leaderboard_chunks "
+            + "WHERE leaderboard_path = ? ORDER BY chunk_index",
+            [leaderboard_path],
+        )
+
+        chunk_rows = await cursor.fetchall()
+        return [LeaderboardChunk(row["digest"], row["image"]) for row in chunk_rows]
+
+    @async_ensure_cursor
+    @staticmethod
+    async def set_leaderboard_chunks(
+        leaderboard_path: str,
+        chunks: list[LeaderboardChunk],
+        *,
+        cursor: AsyncCursor = None,
+    ) -> None:
+        """
+        Replace the last rendered chunks of a leaderboard path.
+
+        :param leaderboard_path: The leaderboard path of the chunks.
+        :param chunks: The rendered chunks, in order.
+        """
+        _ = await cursor.execute(
+            "DELETE FROM live_leaderboard_chunks WHERE leaderboard_path = ?",
+            [leaderboard_path],
+        )
+        _ = await cursor.executemany(
+            "INSERT INTO live_leaderboard_chunks "
+            + "(leaderboard_path, chunk_index, digest, image) VALUES (?, ?, ?, ?)",
+            [
+                (leaderboard_path, i, chunk.digest, chunk.image)
+                for i, chunk in enumerate(chunks)
+            ],
+        )
+
+    @async_ensure_cursor
+    @staticmethod
+    async def get_guild_deliveries(
+        leaderboard_path: str,
+        *,
+        cursor: AsyncCursor = None,
+    ) -> dict[int, GuildLeaderboardDelivery]:
+        """
+        Get the last successful delivery of a leaderboard path to each
+        guild's live leaderboard.
+
+        :param leaderboard_path: The leaderboard path of the live leaderboards.
+        :return dict[int, GuildLeaderboardDelivery]: The deliveries, by guild ID.
+        """
+        cursor = await cursor.execute(
+            "SELECT guild_id, digest, delivered_at FROM live_leaderboard_guild_deliveries "
+            + "WHERE leaderboard_path = ?",
+            [leaderboard_path],
+        )
+
+        delivery_rows = await cursor.fetchall()
+        return {
+            row["guild_id"]: GuildLeaderboardDelivery(row["digest"], row["delivered_at"])
+            for row in delivery_rows
+        }
+
+    @async_ensure_cursor
+    @staticmethod
+    async def set_guild_deliveries(
+        leaderboard_path: str,
+        guild_ids: list[int],
+        delivery: GuildLeaderboardDelivery,
+        *,
+        cursor: AsyncCursor = None,
+    ) -> None:
+        """
+        Record a successful delivery of a leaderboard path to guilds' live
+        leaderboards.
+
+        :param leaderboard_path: The leaderboard path of the live leaderboards.
+        :param guild_ids: The IDs of the guilds the leaderboard was delivered to.
+        :param delivery: The delivered digest and time of the delivery.
+        """
+        _ = await cursor.executemany(
+            "INSERT OR REPLACE INTO live_leaderboard_guild_deliveries "
+            + "(guild_id, leaderboard_path, digest, delivered_at) VALUES (?, ?, ?, ?)",
+            [
+                (guild_id, leaderboard_path, delivery.digest, delivery.delivered_at)
+                for guild_id in guild_ids
+            ],
+        )
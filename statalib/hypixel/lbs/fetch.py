@@ -1,33 +1,34 @@
 """Functions for fetcting leaderboards and leaderboard players."""
 
 import os
-import time
 import asyncio
 from typing import Any, AsyncGenerator
 from json import JSONDecodeError
 
-from aiohttp import ClientResponse, ClientSession, ClientError, ClientTimeout
-from aiohttp_client_cache import SQLiteBackend
-from aiohttp_client_cache.response import CachedResponse
-from aiohttp_client_cache.session import CachedSession
+from aiohttp import ClientError, ClientTimeout
 
-from ..utils import get_player_dict
-from ...common import REL_PATH
+from ...codec import read_response_json
+from ...http_sessions import http_sessions
+from ...rate_limiting import RequestPriority, hypixel_rate_limiter
+from .crawler import leaderboard_crawler
 from .models import LeaderboardData, LeaderboardPlayerEntry
 
 
 
 async def _fetch_hypixel_leaderboards(attempts: int=3, _attempt: int=1) -> dict[str, Any]:
     try:
-        async with ClientSession() as session:
-            res = await session.get("https://api.hypixel.net/v2/leaderboards", headers={
-                "Api-Key": os.getenv("API_KEY_HYPIXEL")
-            }, timeout=5)
+        session = http_sessions.session("hypixel")
+        await hypixel_rate_limiter.acquire(RequestPriority.LEADERBOARD)
+
+        async with session.get("https://api.hypixel.net/v2/leaderboards", headers={
+            "Api-Key": os.getenv("API_KEY_HYPIXEL")
+        }, timeout=ClientTimeout(5)) as res:
+            await hypixel_rate_limiter.record_response(res.status, res.headers)
 
             if not res.ok:
                 raise ClientError(f"Got unexpected non-ok status: {res.status}")
 
-            data: dict[str, Any] = await res.json()
+            data: dict[str, Any] = await read_response_json(res)
             return data
     except (ClientError, TimeoutError, JSONDecodeError):
         if _attempt == attempts:
@@ -47,54 +48,18 @@ async def fetch_bedwars_leaderboards() -> list[LeaderboardData]:
     data = await _fetch_hypixel_leaderboards()
     return _deserialize_bedwars_leaderboard_data(data)
 
-_player_session = SQLiteBackend(
-    cache_name=f'{REL_PATH}/database/.cache/hypixel_player_cache',
-    expire_after=60*60*24
-)
-
-async def fetch_leaderboard_players(
+def fetch_leaderboard_players(
     leaderboard: LeaderboardData
 ) -> AsyncGenerator[LeaderboardPlayerEntry, None]:
     """
-    A generator to fetch all players in a given leaderboard,
-    waiting at least 1.5 seconds between each real request.
-    Players are cached for 24 hours.
+    A generator to fetch all players in a given leaderboard using the shared
+    `leaderboard_crawler`. Players are fetched concurrently, waiting for the
+    Hypixel rate limiter (at leaderboard priority) before each real request,
+    and are yielded in leaderboard order. Player responses are cached for
+    `global.leaderboard_crawler.response_ttl` seconds (an hour by default).
 
     :param leaderboard: The Hypixel leaderboard object containing leaders to fetch.
     :yield LeaderboardPlayerEntry: Relevant data for the leaderboard player, including
         the associated value that qualifies the player for the leaderboard.
     """
-    last_req_ts = 0
-
-    async with CachedSession(cache=_player_session) as session:
-        session: CachedSession
-
-        for uuid in leaderboard.leaders:
-            url = f"https://api.hypixel.net/player?uuid={uuid}" 
-
-            cache_key = session.cache.create_key("GET", url)
-            cached_res = await session.cache.get_response(cache_key)
-
-            if not cached_res or cached_res.is_expired:
-                # Production key: 600 requests per 300 seconds (5 minutes)
-                # Don't want to max out, use 33% capacity instead
-                max_sleep = 1.5  # Seconds
-                reduce_by = time.time() - last_req_ts
-
-                await asyncio.sleep(max(0, max_sleep - reduce_by))
-
-            res: ClientResponse | CachedResponse = await session.get(
-                url=url,
-                headers={"API-Key": os.getenv("API_KEY_HYPIXEL")},
-                timeout=ClientTimeout(5)
-            )
-
-            if res.from_cache is False:
-                last_req_ts = time.time()
-
-            hypixel_data = await res.json()
-            player_data = get_player_dict(hypixel_data) 
-
-            profile = LeaderboardPlayerEntry.build(player_data, leaderboard)
-            yield profile
-
+    return leaderboard_crawler.crawl(leaderboard)
@@ -1,5 +1,7 @@
 """Hypixel leaderboard data models."""
 
+import hashlib
+import json
 from dataclasses import dataclass
 from typing import Any 
 
@@ -93,6 +95,48 @@ class LeaderboardPlayerEntry:
         )
 
 
+LEADERBOARD_CHUNK_RENDER_VERSION = 1
+"Bump whenever the look of leaderboard chunks changes, so they are rendered again."
+
+
+@dataclass(frozen=True)
+class LeaderboardChunk:
+    """A rendered chunk (group of entries) of a live leaderboard."""
+    digest: str
+    "The digest of everything the chunk was rendered from."
+    image: bytes
+    "The rendered PNG image of the chunk."
+
+
+def leaderboard_chunk_digest(
+    info: LeaderboardInfo,
+    entries: list[LeaderboardPlayerEntry],
+    starting_pos: int,
+    include_header: bool
+) -> str:
+    """
+    Get the digest of everything a leaderboard chunk is rendered from, two
+    chunks with the same digest render to the same image.
+
+    :param info: The information of the leaderboard.
+    :param entries: The entries of the chunk.
+    :param starting_pos: The leaderboard position of the first entry.
+    :param include_header: Whether the chunk includes the leaderboard header.
+    """
+    rows = [
+        [entry.uuid, entry.username, entry.rank_info["formatted_prefix"], entry.value]
+        for entry in entries
+    ]
+    payload = json.dumps([
+        LEADERBOARD_CHUNK_RENDER_VERSION,
+        [info.path, info.prefix, info.title] if include_header else None,
+        starting_pos,
+        rows
+    ])
+
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
 @dataclass
 class GuildLiveLeaderboard:
     """A Discord guild live leaderboard configuration."""
@@ -106,6 +150,14 @@ class GuildLiveLeaderboard:
     "The ID of the live leaderboard's Discord message."
 
 
+@dataclass(frozen=True)
+class GuildLeaderboardDelivery:
+    """The last successful delivery of a leaderboard to a guild's live leaderboard."""
+    digest: str
+    "The digest of the delivered leaderboard."
+    delivered_at: float
+    "The UNIX timestamp of the delivery."
+
 
 LEADERBOARD_TYPES = {
     "bedwars_level": LeaderboardInfo("bedwars_level", "Current", "Level", (0, 0, 0)),
@@ -0,0 +1,158 @@
+"""
+Snapshots of every Bedwars leaderboard sharing a single profile store.
+
+The same players appear on many leaderboards, so a snapshot fetches the
+leaderboards once, fetches every unique leader once, and builds the entries
+of every leaderboard from the shared profiles.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Iterable
+
+from ..ranks import RankInfo, get_rank_info
+from ...aliases import HypixelPlayerData, PlayerUUID
+from .crawler import CrawlStats, LeaderboardCrawler, leaderboard_crawler
+from .fetch import fetch_bedwars_leaderboards
+from .models import LEADERBOARD_TYPES, LeaderboardData, LeaderboardPlayerEntry
+from .values import BedwarsQualifyingValueFormatter
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LeaderboardProfile:
+    """The compact data of a leaderboard player, shared by every leaderboard."""
+    uuid: str
+    "The UUID of the leaderboard player."
+    username: str
+    "The username of the leaderboard player."
+    rank_info: RankInfo
+    "The rank information of the leaderboard player."
+    values: dict[str, str]
+    "The leaderboard qualifying values of the player, by leaderboard path."
+
+    @staticmethod
+    def build(player_data: HypixelPlayerData, paths: Iterable[str]) -> 'LeaderboardProfile':
+        """
+        Build a new `LeaderboardProfile` object from hypixel player data.
+
+        :param player_data: The hypixel player data of the leaderboard player.
+        :param paths: The leaderboard paths to store qualifying values for.
+        """
+        formatter = BedwarsQualifyingValueFormatter(player_data)
+
+        return LeaderboardProfile(
+            uuid=player_data["uuid"],
+            username=player_data["displayname"],
+            rank_info=get_rank_info(player_data),
+            values={path: formatter.call_formatter(path) for path in paths}
+        )
+
+    def entry(self, path: str) -> LeaderboardPlayerEntry:
+        """
+        Get the player's entry on a leaderboard.
+
+        :param path: The path of the leaderboard.
+        """
+        return LeaderboardPlayerEntry(
+            uuid=self.uuid,
+            username=self.username,
+            rank_info=self.rank_info,
+            value=self.values[path]
+        )
+
+
+class LeaderboardSnapshot:
+    """The leaderboards and leader profiles fetched in a single cycle."""
+    def __init__(
+        self,
+        leaderboards: dict[str, LeaderboardData],
+        profiles: dict[PlayerUUID, LeaderboardProfile],
+        crawl_stats: CrawlStats | None=None
+    ) -> None:
+        """
+        :param leaderboards: The leaderboards of the snapshot, by path.
+        :param profiles: The profiles of every leader, by their UUID as \
+            listed on the leaderboards.
+        :param crawl_stats: The stats of the crawl fetching the profiles.
+        """
+        self.leaderboards = leaderboards
+        self.profiles = profiles
+        self.crawl_stats = crawl_stats
+
+        self.created_at = time.time()
+        "The UNIX timestamp the snapshot was created at."
+
+    @property
+    def leader_slots(self) -> int:
+        """The sum of the sizes of every leaderboard."""
+        return sum(len(lb.leaders) for lb in self.leaderboards.values())
+
+    @classmethod
+    async def fetch(
+        cls,
+        paths: Iterable[str] | None=None,
+        crawler: LeaderboardCrawler=leaderboard_crawler
+    ) -> 'LeaderboardSnapshot':
+        """
+        Fetch the leaderboards and then every unique leader once.
+
+        :param paths: The leaderboard paths to include, defaults to every \
+            path in `LEADERBOARD_TYPES`.
+        :param crawler: The crawler used to fetch the leaders.
+        """
+        paths = list(LEADERBOARD_TYPES if paths is None else paths)
+
+        leaderboards: dict[str, LeaderboardData] = {}
+        for lb in await fetch_bedwars_leaderboards():
+            if lb.info.path in paths:
+                leaderboards.setdefault(lb.info.path, lb)
+
+        # Leaders are fetched in leaderboard order, keeping the first occurrence
+        unique_leaders = list(dict.fromkeys(
+            uuid for lb in leaderboards.values() for uuid in lb.leaders))
+
+        # Keyed by the leaderboard's UUIDs, which may be formatted differently
+        profiles: dict[PlayerUUID, LeaderboardProfile] = {}
+        players = crawler.crawl_players(unique_leaders, "snapshot")
+
+        i = 0
+        async for player_data in players:
+            if "uuid" in player_data:
+                profiles[unique_leaders[i]] = LeaderboardProfile.build(player_data, leaderboards)
+            i += 1
+
+        snapshot = cls(leaderboards, profiles, crawler.last_stats)
+        logger.info(
+            f"Leaderboard snapshot of {len(leaderboards)} leaderboards fetched "
+            f"{len(unique_leaders)} unique leaders for {snapshot.leader_slots} slots")
+
+        return snapshot
+
+    def leaderboard(self, path: str) -> LeaderboardData:
+        """
+        Get a leaderboard of the snapshot.
+
+        :param path: The path of the leaderboard.
+        :raises ValueError: The leaderboard isn't part of the snapshot.
+        """
+        try:
+            return self.leaderboards[path]
+        except KeyError as exc:
+            raise ValueError(f"Leaderboard path '{path}' is invalid!") from exc
+
+    def entries(self, path: str) -> list[LeaderboardPlayerEntry]:
+        """
+        Get the entries of a leaderboard in leaderboard order, built from the
+        shared profiles. Leaders whose profile couldn't be fetched are skipped.
+
+        :param path: The path of the leaderboard.
+        :raises ValueError: The leaderboard isn't part of the snapshot.
+        """
+        return [
+            self.profiles[uuid].entry(path)
+            for uuid in self.leaderboard(path).leaders if uuid in self.profiles
+        ]
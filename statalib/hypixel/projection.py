@@ -0,0 +1,139 @@
+"""
+Trimmed projection of Hypixel player responses, keeping only the fields
+read by Statalytics. Full player responses hold the stats of every game
+and are mostly dead weight once fetched.
+
+Projected responses keep the shape of the raw response, so they can be
+passed to anything expecting raw Hypixel data.
+"""
+
+from typing import Any, TypedDict
+
+from ..aliases import BedwarsData, HypixelData
+from ..codec import json_codec
+
+
+PROJECTED_RESPONSE_KEYS = ("success", "cause", "throttle")
+"The top level keys of a Hypixel response kept by the projection."
+
+PROJECTED_PLAYER_KEYS = (
+    "uuid",
+    "displayname",
+    "rank",
+    "monthlyPackageRank",
+    "packageRank",
+    "newPackageRank",
+    "rankPlusColor",
+    "monthlyRankColor",
+    "prefix"
+)
+"The scalar keys of the 'player' key kept by the projection."
+
+PROJECTED_QUEST_PREFIX = "bedwars_"
+"Only quests starting with this prefix are kept by the projection."
+
+
+class ProjectedStatsData(TypedDict, total=False):
+    """The kept 'player'>'stats' data."""
+    Bedwars: BedwarsData
+
+
+class ProjectedAchievementsData(TypedDict, total=False):
+    """The kept 'player'>'achievements' data."""
+    bedwars_level: int
+
+
+class ProjectedSocialMediaData(TypedDict, total=False):
+    """The kept 'player'>'socialMedia' data."""
+    links: dict[str, str]
+
+
+class ProjectedPlayerData(TypedDict, total=False):
+    """The kept 'player' data of a Hypixel response."""
+    uuid: str
+    displayname: str
+    rank: str
+    monthlyPackageRank: str
+    packageRank: str
+    newPackageRank: str
+    rankPlusColor: str
+    monthlyRankColor: str
+    prefix: str
+    stats: ProjectedStatsData
+    quests: dict[str, dict[str, Any]]
+    achievements: ProjectedAchievementsData
+    socialMedia: ProjectedSocialMediaData
+
+
+class ProjectedHypixelData(TypedDict, total=False):
+    """A projected Hypixel player response."""
+    success: bool
+    cause: str
+    throttle: bool
+    player: ProjectedPlayerData | None
+
+
+def project_player_data(hypixel_player_data: dict[str, Any]) -> ProjectedPlayerData:
+    """
+    Project the 'player' key of a Hypixel response.
+
+    :param hypixel_player_data: The 'player' key of the raw Hypixel response.
+    """
+    projected: ProjectedPlayerData = {
+        key: hypixel_player_data[key]
+        for key in PROJECTED_PLAYER_KEYS if key in hypixel_player_data
+    }
+
+    bedwars_data = (hypixel_player_data.get("stats") or {}).get("Bedwars")
+    projected["stats"] = {} if bedwars_data is None else {"Bedwars": bedwars_data}
+
+    projected["quests"] = {
+        quest: quest_data
+        for quest, quest_data in (hypixel_player_data.get("quests") or {}).items()
+        if quest.startswith(PROJECTED_QUEST_PREFIX)
+    }
+
+    achievements = hypixel_player_data.get("achievements") or {}
+    if "bedwars_level" in achievements:
+        projected["achievements"] = {"bedwars_level": achievements["bedwars_level"]}
+
+    links = (hypixel_player_data.get("socialMedia") or {}).get("links")
+    if links:
+        projected["socialMedia"] = {"links": links}
+
+    return projected
+
+
+def project_hypixel_data(hypixel_data: HypixelData) -> ProjectedHypixelData:
+    """
+    Project a raw Hypixel player response down to the data Statalytics
+    uses, keeping the shape of the raw response. Projecting a projected
+    response returns an equal response.
+
+    :param hypixel_data: The raw Hypixel API JSON response.
+    """
+    projected: ProjectedHypixelData = {
+        key: hypixel_data[key]
+        for key in PROJECTED_RESPONSE_KEYS if key in hypixel_data
+    }
+
+    if "player" in hypixel_data:
+        hypixel_player_data = hypixel_data["player"]
+        projected["player"] = (
+            None if hypixel_player_data is None
+            else project_player_data(hypixel_player_data)
+        )
+
+    return projected
+
+
+def decode_hypixel_data(payload: bytes | str) -> ProjectedHypixelData:
+    """
+    Decode a raw Hypixel player response JSON document straight into its
+    projection. Codecs supporting typed decoding skip the unused data
+    while decoding, rather than decoding the whole document first.
+
+    :param payload: The raw Hypixel API JSON response body.
+    :raises JSONDecodeError: The payload is not valid JSON.
+    """
+    return project_hypixel_data(json_codec.loads_typed(payload, ProjectedHypixelData))
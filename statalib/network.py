@@ -5,20 +5,43 @@ Module for handling API requests to Hypixel as well as skin model fetching.
 import asyncio
 import logging
 import os
-from typing import Literal
+import time
+from typing import Awaitable, Callable, Hashable, Literal, TypeVar
 from os import getenv
 from json import JSONDecodeError
 from http.client import RemoteDisconnected
 
 from requests import ReadTimeout, ConnectTimeout
-from aiohttp import ClientSession, ContentTypeError
+from aiohttp import ClientSession, ClientTimeout, ContentTypeError
 from aiohttp_client_cache import SQLiteBackend
 from aiohttp_client_cache.session import CachedSession
 
 from .cfg import config
 from .common import REL_PATH
 from .errors import HypixelInvalidResponseError, HypixelRateLimitedError
+from .player_cache import (
+    DEFAULT_PLAYER_CACHE_SETTINGS,
+    CacheTierMetrics,
+    TieredPlayerCache,
+    hypixel_player_cache
+)
+from .rate_limiting import (
+    DEFAULT_RATE_LIMIT_SETTINGS,
+    HypixelRateLimiter,
+    RateLimiterMetrics,
+    RequestPriority,
+    hypixel_rate_limiter
+)
+from .http_sessions import (
+    DEFAULT_UPSTREAM_SETTINGS,
+    SessionRegistry,
+    Upstream,
+    http_sessions,
+    close_sessions
+)
 from .aliases import HypixelData, PlayerUUID
+from .codec import loads, read_response_json
+from .hypixel.projection import decode_hypixel_data
 from .rotational_stats import async_reset_rotational_stats_if_whitelisted
 
 
@@ -34,32 +57,176 @@ mojang_session = SQLiteBackend(
     cache_name=f'{REL_PATH}/.cache/mojang_cache', expire_after=60)
 
 
+class TokenBucket:
+    """
+    Async token bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `capacity`,
+    allowing short bursts while keeping the long term average at `rate`.
+    """
+    def __init__(self, rate: float, capacity: float | None=None) -> None:
+        """
+        :param rate: The amount of tokens that refill per second.
+        :param capacity: The maximum amount of tokens that can be stored \
+            (the burst size), defaults to `rate`.
+        """
+        self.rate = rate
+        self.capacity = capacity or rate
+
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    @property
+    def available(self) -> float:
+        """The amount of tokens that are currently available."""
+        self._refill()
+        return self._tokens
+
+    async def acquire(self, tokens: float=1) -> None:
+        """
+        Wait until the requested amount of tokens is available and take them.
+        Waiters are served in order.
+
+        :param tokens: The amount of tokens to take.
+        """
+        async with self._lock:
+            self._refill()
+
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+
+            self._tokens -= tokens
+
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls sharing a key into a single in-flight call,
+    whose result (or exception) is shared by every caller.
+    """
+    def __init__(self) -> None:
+        self._flights: dict[Hashable, asyncio.Future] = {}
+
+        self.calls = 0
+        "The total amount of calls made."
+        self.saved_calls = 0
+        "The amount of calls that were served by an in-flight call."
+
+    @property
+    def in_flight(self) -> int:
+        """The amount of calls that are currently in flight."""
+        return len(self._flights)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._flights
+
+    def _forget(self, key: Hashable, flight: asyncio.Future) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+        # Mark the exception as retrieved in case every caller was cancelled
+        if not flight.cancelled():
+            _ = flight.exception()
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Call a function, or join the in-flight call of the same key.
+
+        Cancelling a caller doesn't cancel the shared call for the others.
+
+        :param key: The key identifying identical calls.
+        :param func: The function to call if no call is in flight.
+        """
+        flight = self._flights.get(key)
+        self.calls += 1
+
+        if flight is None or flight.get_loop() is not asyncio.get_running_loop():
+            flight = self._flights[key] = asyncio.ensure_future(func())
+            flight.add_done_callback(lambda f: self._forget(key, f))
+        else:
+            self.saved_calls += 1
+
+        return await asyncio.shield(flight)
+
+
+hypixel_request_flights = SingleFlight()
+"Coalesces concurrent Hypixel player requests for the same player."
+
+
 SkinStyle = Literal[
     "fullbody", "bust", "frontfull", "fullbodyiso", "head", "face", "headiso", "skin"
 ]
 
 
+async def is_response_cached(session: ClientSession | CachedSession, url: str) -> bool:
+    """
+    Check whether a GET request would be served from the session's cache.
+
+    :param session: The session the request would be made with.
+    :param url: The URL of the request.
+    """
+    if not isinstance(session, CachedSession):
+        return False
+
+    cached_res = await session.cache.get_response(session.cache.create_key("GET", url))
+    return cached_res is not None and not cached_res.is_expired
+
+
+def __hypixel_player_url(uuid: str) -> str:
+    return f"https://api.hypixel.net/player?uuid={uuid}"
+
+
+def __schedule_tracker_reset(uuid: str, hypixel_data: HypixelData) -> None:
+    # reset trackers using the data if they are due
+    _ = asyncio.ensure_future(
+        async_reset_rotational_stats_if_whitelisted(uuid, hypixel_data)
+    )
+
+
 async def __make_hypixel_request(
     session: ClientSession | CachedSession,
-    uuid: str
+    uuid: str,
+    priority: RequestPriority,
+    projected: bool
 ) -> HypixelData:
     api_key = getenv('API_KEY_HYPIXEL')
 
     options = {
-        'url': f"https://api.hypixel.net/player?uuid={uuid}",
+        'url': __hypixel_player_url(uuid),
         'headers': {"API-Key": api_key},
-        'timeout': 5
+        'timeout': ClientTimeout(total=5)
     }
 
+    cached = await is_response_cached(session, options['url'])
+    if not cached:
+        await hypixel_rate_limiter.acquire(priority)
+
+    if isinstance(session, CachedSession) and session.cache is stats_session:
+        hypixel_player_cache.record_cold_lookup(cached)
+
     # fetch hypixel data
-    res = await session.get(**options)
-    hypixel_data = await res.json()
+    async with session.get(**options) as res:
+        hypixel_data = await read_response_json(
+            res, loads=decode_hypixel_data if projected else loads)
 
-    # reset trackers using the data if they are due
-    _ = asyncio.ensure_future(
-        async_reset_rotational_stats_if_whitelisted(uuid, hypixel_data)
-    )
+        if not getattr(res, 'from_cache', False):
+            await hypixel_rate_limiter.record_response(res.status, res.headers)
+
+            # Throttle responses are expected to be a 429, but don't rely on it
+            if hypixel_data.get('throttle') and res.status != 429:
+                await hypixel_rate_limiter.throttle()
 
+    __schedule_tracker_reset(uuid, hypixel_data)
     return hypixel_data
 
 
@@ -68,27 +235,108 @@ async def fetch_hypixel_data(
     cache: bool = True,
     cached_session: SQLiteBackend = stats_session,
     retries: int = 3,
-    retry_delay: int = 5
+    retry_delay: int = 5,
+    priority: RequestPriority = RequestPriority.INTERACTIVE,
+    stale_while_revalidate: bool = False,
+    projected: bool = True
 ) -> HypixelData:
     """
     Fetch a player's Hypixel data from Hypixel's API.
     Supports caching and request retry system.
 
+    Responses are decoded straight into the data Statalytics uses by
+    `decode_hypixel_data` unless the raw response is requested.
+    Projected responses of the default stats cache are held in
+    `hypixel_player_cache` in front of the SQLite cache, which keeps the
+    raw responses, uncached fetches replace them. Concurrent
+    fetches of the same player share a single request, see
+    `hypixel_request_flights` for the amount of requests saved. Requests
+    that aren't cached wait for `hypixel_rate_limiter`.
+
     :param uuid: The player UUID of the respective player.
     :param cache: Whether or not to use the cache.
     :param cached_session: Use a custom cache instead of the default stats cache.
     :param retries: The number of retries in before terminating the request.
     :param retry_delay: The delay (in seconds) between request retries.
+    :param priority: The rate limiting priority of the request.
+    :param stale_while_revalidate: Return a stale cached response within the \
+        stale grace period immediately, refreshing it in the background.
+    :param projected: Whether to return the projected response rather \
+        than the raw response, raw responses bypass `hypixel_player_cache`.
     :return dict: The Hypixel API player data response.
     """
+    tiered = cached_session is stats_session
+
+    # Uncached callers must not be served a cached response
+    key = (uuid, id(cached_session) if cache else None, projected)
+
+    def fetch() -> Awaitable[HypixelData]:
+        return __fetch_hypixel_data(
+            uuid, cache, cached_session, retries, retry_delay, priority, projected)
+
+    if tiered and cache and projected:
+        cached = await hypixel_player_cache.get_entry(
+            uuid, allow_stale=stale_while_revalidate)
+
+        if cached is not None and cached.age <= hypixel_player_cache.fresh_ttl:
+            __schedule_tracker_reset(uuid, cached.hypixel_data)
+            return cached.hypixel_data
+
+        if cached is not None:
+            # The refresh still feeds the tracker reset check once it lands
+            if key not in hypixel_request_flights and key not in __background_refreshes:
+                __schedule_background_refresh(key, fetch)
+            return cached.hypixel_data
+
+    elif tiered:
+        await hypixel_player_cache.invalidate(uuid)
+        await stats_session.delete_url(__hypixel_player_url(uuid))
+
+    return await hypixel_request_flights.do(key, fetch)
+
+
+__background_refreshes: dict[Hashable, asyncio.Task] = {}
+
+
+def __schedule_background_refresh(
+    key: Hashable, fetch: Callable[[], Awaitable[HypixelData]]
+) -> None:
+    async def refresh() -> None:
+        try:
+            await hypixel_request_flights.do(key, fetch)
+        except Exception as exc:
+            logger.warning(f"Background Hypixel refresh failed: {exc!r}")
+
+    __background_refreshes[key] = asyncio.create_task(refresh())
+    __background_refreshes[key].add_done_callback(
+        lambda _: __background_refreshes.pop(key, None))
+
+
+async def __fetch_hypixel_data(
+    uuid: PlayerUUID,
+    cache: bool,
+    cached_session: SQLiteBackend,
+    retries: int,
+    retry_delay: int,
+    priority: RequestPriority,
+    projected: bool
+) -> HypixelData:
     for attempt in range(retries + 1):
         try:
-            if not cache:
-                async with ClientSession() as session:
-                    return await __make_hypixel_request(session, uuid)
+            tiered = cached_session is stats_session
+
+            if not cache or (tiered and not hypixel_player_cache.cold_tier):
+                session = http_sessions.session("hypixel")
+            else:
+                session = http_sessions.cached_session("hypixel", cached_session)
 
-            async with CachedSession(cache=cached_session) as session:
-                return await __make_hypixel_request(session, uuid)
+            hypixel_data = await __make_hypixel_request(
+                session, uuid, priority, projected)
+
+            if tiered and projected and hypixel_data.get('success'):
+                await hypixel_player_cache.set(uuid, hypixel_data)
+
+            return hypixel_data
 
         except (ReadTimeout, ConnectTimeout, TimeoutError, asyncio.TimeoutError,
                 JSONDecodeError, RemoteDisconnected, ContentTypeError) as exc:
@@ -108,7 +356,9 @@ async def fetch_hypixel_data_rate_limit_safe(
     retries: int = 3,
     retry_delay: int = 5,
     attempts: int=5,
-    attempt_delay: int=20
+    attempt_delay: int=20,
+    priority: RequestPriority = RequestPriority.INTERACTIVE,
+    projected: bool = True
 ) -> HypixelData:
     """
     Rate limit safe version of `~fetch_hypixel_data()`.
@@ -119,19 +369,24 @@ async def fetch_hypixel_data_rate_limit_safe(
     :param retries: The number of retries in the case of failed network requests.
     :param retry_delay: Delay (in seconds) between failed network request retries.
     :param attempts: The amount of attempts to make if you are rate limited.
-    :param attempt_delay: Delay (in seconds) between attempts made if rate limited.
+    :param attempt_delay: Deprecated, attempts made if rate limited wait \
+        for the rate limit to reset using `hypixel_rate_limiter` instead.
+    :param priority: The rate limiting priority of the request.
+    :param projected: Whether to return the projected response rather \
+        than the raw response.
     :return dict: The Hypixel API player data response.
     """
     for attempt in range(attempts + 1):
         hypixel_data = await fetch_hypixel_data(
-            uuid, cache, cached_session, retries, retry_delay)
+            uuid, cache, cached_session, retries, retry_delay, priority,
+            projected=projected)
 
         if not hypixel_data.get('success') and hypixel_data.get('throttle'):
             if attempt < attempts:
+                # The rate limiter holds the next attempt until the limit resets
                 logger.warning(
                     'We are being rate limited by hypixel. ' +
-                    f'Retrying in {attempt_delay} seconds...')
-                await asyncio.sleep(attempt_delay)
+                    'Retrying once the rate limit resets...')
             else:
                 raise HypixelRateLimitedError('Maximum number of retries exceeded.')
 
@@ -161,16 +416,17 @@ async def fetch_skin_model(
     """
     options = {
         'url': f'{SKIN_API_HOSTNAME}/{style}/{uuid}',
-        'timeout': 5,
+        'timeout': ClientTimeout(total=5),
         'headers': {
             'User-Agent': f'Statalytics {config("apps.bot.version")}'
         }
     }
 
     try:
-        async with CachedSession(cache=skin_session) as session:
-            res_content = (await session.get(**options)).content
-            return await res_content.read()
+        session = http_sessions.cached_session("skins", skin_session)
+
+        async with session.get(**options) as res:
+            return await res.content.read()
 
     # except (ReadTimeout, ConnectTimeout, TimeoutError, asyncio.TimeoutError):
     except Exception:  # shit just wasnt working idk why
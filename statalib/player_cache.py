@@ -0,0 +1,271 @@
+"""
+Tiered cache of Hypixel player responses, an in-process LRU of parsed
+responses in front of a compressed redis layer shared by every process.
+Exposed through `statalib.network`.
+"""
+
+import logging
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+
+from cachetools import TTLCache
+from redis.exceptions import RedisError
+
+from .aliases import HypixelData, PlayerUUID
+from .cfg import config
+from .codec import dumps, loads
+from .redis_ext.client import RedisClient, binary_redis_client
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_PLAYER_CACHE_SETTINGS = {
+    "memory_size": 2048,  # Players
+    "memory_ttl": 300,  # Seconds
+    "stale_grace": 300,  # Seconds stale entries are kept for stale-while-revalidate
+    "redis": False,
+    "redis_ttl": 300,  # Seconds
+    "cold_tier": True  # Fall back to the SQLite response cache
+}
+"Fallback player cache settings used when `global.hypixel_cache` is not configured."
+
+
+def _player_cache_settings() -> dict:
+    try:
+        configured: dict = config("global.hypixel_cache") or {}
+    except KeyError:
+        configured = {}
+
+    return {**DEFAULT_PLAYER_CACHE_SETTINGS, **configured}
+
+
+@dataclass
+class CacheTierMetrics:
+    """The hit and miss counts of a cache tier."""
+    hits: int = 0
+    "The amount of lookups served by the tier."
+    misses: int = 0
+    "The amount of lookups the tier couldn't serve."
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of lookups served by the tier."""
+        return self.hits / ((self.hits + self.misses) or 1)
+
+
+@dataclass
+class CachedPlayer:
+    """A cached Hypixel player response."""
+    hypixel_data: HypixelData
+    "The Hypixel player response."
+    fetched_at: float
+    "The UNIX timestamp the response was fetched at."
+
+    @property
+    def age(self) -> float:
+        """The age (in seconds) of the response."""
+        return time.time() - self.fetched_at
+
+
+_FETCHED_AT_STRUCT = struct.Struct("<d")
+
+
+def compress_player_data(hypixel_data: HypixelData, fetched_at: float=0) -> bytes:
+    """Serialize and compress a Hypixel player response."""
+    return _FETCHED_AT_STRUCT.pack(fetched_at) + zlib.compress(dumps(hypixel_data))
+
+
+def decompress_player_data(payload: bytes) -> CachedPlayer:
+    """Decompress and deserialize a Hypixel player response."""
+    (fetched_at,) = _FETCHED_AT_STRUCT.unpack_from(payload)
+    hypixel_data = loads(zlib.decompress(payload[_FETCHED_AT_STRUCT.size:]))
+
+    return CachedPlayer(hypixel_data, fetched_at)
+
+
+class TieredPlayerCache:
+    """
+    Caches Hypixel player responses by player UUID in two tiers:
+
+    1. An in-process LRU holding the parsed responses.
+    2. Optionally, redis holding compressed responses, shared by every process.
+
+    Responses are fresh for `memory_ttl` seconds, and are kept for another
+    `stale_grace` seconds to be served stale while they are revalidated.
+    Responses returned by the cache are shared and must not be mutated.
+    """
+    TIERS = ("memory", "redis", "cold")
+
+    def __init__(
+        self,
+        memory_size: int,
+        memory_ttl: float,
+        stale_grace: float=0,
+        redis_client: RedisClient | None=None,
+        redis_ttl: int=300,
+        redis_key_prefix: str="statalytics:hypixel_player:",
+        cold_tier: bool=True
+    ) -> None:
+        """
+        :param memory_size: The maximum amount of players held in memory.
+        :param memory_ttl: How long (in seconds) responses are fresh for.
+        :param stale_grace: How long (in seconds) responses are kept after \
+            they become stale.
+        :param redis_client: The binary redis client to use for the redis \
+            tier, the tier is disabled if not provided.
+        :param redis_ttl: How long (in seconds) responses are fresh for in \
+            redis, they are kept for the stale grace period as well.
+        :param redis_key_prefix: The prefix of the redis keys of players.
+        :param cold_tier: Whether the SQLite response cache should be used \
+            after the other tiers miss.
+        """
+        self._memory: TTLCache[PlayerUUID, CachedPlayer] = TTLCache(
+            memory_size, memory_ttl + stale_grace)
+        self._redis_client = redis_client
+        self._redis_ttl = redis_ttl
+
+        self._redis_key_prefix = redis_key_prefix
+
+        self.fresh_ttl = memory_ttl
+        "How long (in seconds) responses are fresh for."
+        self.stale_grace = stale_grace
+        "How long (in seconds) stale responses are kept for."
+
+        self.cold_tier = cold_tier
+        self._metrics = {tier: CacheTierMetrics() for tier in self.TIERS}
+
+    @classmethod
+    def from_config(cls) -> 'TieredPlayerCache':
+        """Create a player cache using the configured settings."""
+        settings = _player_cache_settings()
+
+        return cls(
+            memory_size=settings["memory_size"],
+            memory_ttl=settings["memory_ttl"],
+            stale_grace=settings["stale_grace"],
+            redis_client=binary_redis_client if settings["redis"] else None,
+            redis_ttl=settings["redis_ttl"],
+            cold_tier=settings["cold_tier"]
+        )
+
+    def _redis_key(self, uuid: PlayerUUID) -> str:
+        return f"{self._redis_key_prefix}{uuid}"
+
+    def _is_usable(self, cached: CachedPlayer, allow_stale: bool) -> bool:
+        max_age = self.fresh_ttl + self.stale_grace if allow_stale else self.fresh_ttl
+        return cached.age <= max_age
+
+    async def get(self, uuid: PlayerUUID) -> HypixelData | None:
+        """
+        Get a player's fresh cached response from the fastest tier holding it.
+
+        :param uuid: The UUID of the respective player.
+        :return dict | None: The cached response if any tier holds a fresh one.
+        """
+        cached = await self.get_entry(uuid, allow_stale=False)
+        return None if cached is None else cached.hypixel_data
+
+    async def get_entry(
+        self, uuid: PlayerUUID, allow_stale: bool=True
+    ) -> CachedPlayer | None:
+        """
+        Get a player's cached response along with its age from the fastest
+        tier holding it.
+
+        :param uuid: The UUID of the respective player.
+        :param allow_stale: Whether responses within the stale grace period \
+            should be returned.
+        :return CachedPlayer | None: The cached response if any tier holds it.
+        """
+        cached = self._memory.get(uuid)
+        if cached is not None and self._is_usable(cached, allow_stale):
+            self._metrics["memory"].hits += 1
+            return cached
+
+        self._metrics["memory"].misses += 1
+
+        if self._redis_client is None:
+            return None
+
+        try:
+            payload = await self._redis_client.client.get(self._redis_key(uuid))
+        except RedisError as exc:
+            logger.warning(f"Redis player cache unavailable: {exc}")
+            payload = None
+
+        if payload is None:
+            self._metrics["redis"].misses += 1
+            return None
+
+        cached = decompress_player_data(payload)
+        if not self._is_usable(cached, allow_stale):
+            self._metrics["redis"].misses += 1
+            return None
+
+        self._metrics["redis"].hits += 1
+
+        self._memory[uuid] = cached
+        return cached
+
+    async def set(self, uuid: PlayerUUID, hypixel_data: HypixelData) -> None:
+        """
+        Cache a player's response in every tier.
+
+        :param uuid: The UUID of the respective player.
+        :param hypixel_data: The Hypixel player response.
+        """
+        fetched_at = time.time()
+        self._memory[uuid] = CachedPlayer(hypixel_data, fetched_at)
+
+        if self._redis_client is None:
+            return
+
+        try:
+            await self._redis_client.client.set(
+                self._redis_key(uuid),
+                compress_player_data(hypixel_data, fetched_at),
+                ex=int(self._redis_ttl + self.stale_grace)
+            )
+        except RedisError as exc:
+            logger.warning(f"Redis player cache unavailable: {exc}")
+
+    async def invalidate(self, uuid: PlayerUUID) -> None:
+        """
+        Remove a player's response from every tier.
+
+        :param uuid: The UUID of the respective player.
+        """
+        self._memory.pop(uuid, None)
+
+        if self._redis_client is None:
+            return
+
+        try:
+            await self._redis_client.client.delete(self._redis_key(uuid))
+        except RedisError as exc:
+            logger.warning(f"Redis player cache unavailable: {exc}")
+
+    def record_cold_lookup(self, hit: bool) -> None:
+        """
+        Record a lookup of the cold (SQLite) tier.
+
+        :param hit: Whether the response was served from the cold tier.
+        """
+        if hit:
+            self._metrics["cold"].hits += 1
+        else:
+            self._metrics["cold"].misses += 1
+
+    def metrics(self) -> dict[str, CacheTierMetrics]:
+        """Get a snapshot of the metrics of each tier."""
+        return {
+            tier: CacheTierMetrics(metrics.hits, metrics.misses)
+            for tier, metrics in self._metrics.items()
+        }
+
+
+hypixel_player_cache = TieredPlayerCache.from_config()
+"The cache in front of `fetch_hypixel_data`."
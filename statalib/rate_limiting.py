@@ -0,0 +1,336 @@
+"""
+Priority aware rate limiting of the Hypixel API key, shared by every
+Hypixel call site. Exposed through `statalib.network`.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Mapping
+
+from redis.exceptions import RedisError
+
+from .cfg import config
+from .redis_ext.client import RedisClient, redis_client as main_redis_client
+
+
+logger = logging.getLogger(__name__)
+
+
+class RequestPriority(IntEnum):
+    """The priority of a Hypixel request, lower values are served first."""
+    INTERACTIVE = 0
+    TRACKER_RESET = 1
+    LEADERBOARD = 2
+
+
+DEFAULT_RATE_LIMIT_SETTINGS = {
+    "limit": 600,  # Requests per window
+    "window": 300,  # Seconds
+    "throttle_fallback": 20,  # Seconds, used if a throttle response has no reset header
+    "shared": False,  # Share the quota with other processes through redis
+    "reserves": {
+        "interactive": 5,
+        "tracker_reset": 60,
+        "leaderboard": 200
+    }
+}
+"Fallback rate limit settings used when `global.hypixel_rate_limit` is not configured."
+
+
+def _rate_limit_settings() -> dict:
+    try:
+        configured: dict = config("global.hypixel_rate_limit") or {}
+    except KeyError:
+        configured = {}
+
+    return {**DEFAULT_RATE_LIMIT_SETTINGS, **configured}
+
+
+class _LocalQuota:
+    """The remaining requests of the current window, as seen by this process."""
+    def __init__(self, limit: int, window: float) -> None:
+        self.limit = limit
+        self.window = window
+
+        self.remaining = limit
+        self.reset_at = time.time() + window
+
+    async def take(self, reserve: int) -> float:
+        now = time.time()
+        if now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = now + self.window
+
+        if self.remaining > reserve:
+            self.remaining -= 1
+            return 0
+
+        return self.reset_at - now
+
+    async def update(self, remaining: int, reset_in: float) -> None:
+        reset_at = time.time() + reset_in
+
+        # Requests still in flight aren't counted by Hypixel yet, so within
+        # the same window never assume more quota than counted locally
+        if reset_at <= self.reset_at + 1:
+            remaining = min(remaining, self.remaining)
+
+        self.remaining = remaining
+        self.reset_at = reset_at
+
+
+_TAKE_SCRIPT = """
+local remaining = tonumber(redis.call('HGET', KEYS[1], 'remaining'))
+local reset_at = tonumber(redis.call('HGET', KEYS[1], 'reset_at'))
+local now = tonumber(ARGV[1])
+
+if not remaining or not reset_at or now >= reset_at then
+  remaining = tonumber(ARGV[2])
+  reset_at = now + tonumber(ARGV[3])
+end
+
+local wait = 0
+if remaining > tonumber(ARGV[4]) then
+  remaining = remaining - 1
+else
+  wait = reset_at - now
+end
+
+redis.call('HSET', KEYS[1], 'remaining', remaining, 'reset_at', tostring(reset_at))
+return tostring(wait)
+"""
+
+_UPDATE_SCRIPT = """
+local current_remaining = tonumber(redis.call('HGET', KEYS[1], 'remaining'))
+local current_reset_at = tonumber(redis.call('HGET', KEYS[1], 'reset_at'))
+local remaining = tonumber(ARGV[2])
+local reset_at = tonumber(ARGV[1]) + tonumber(ARGV[3])
+
+if current_remaining and current_reset_at and reset_at <= current_reset_at + 1 then
+  remaining = math.min(remaining, current_remaining)
+end
+
+redis.call('HSET', KEYS[1], 'remaining', remaining, 'reset_at', tostring(reset_at))
+return remaining
+"""
+
+
+class _RedisQuota(_LocalQuota):
+    """
+    The remaining requests of the current window, shared by every process
+    using the same redis key. Falls back to the local quota if redis is
+    unavailable.
+    """
+    def __init__(
+        self, limit: int, window: float, redis_client: RedisClient, key: str
+    ) -> None:
+        super().__init__(limit, window)
+        self._redis_client = redis_client
+        self._key = key
+
+    async def take(self, reserve: int) -> float:
+        try:
+            wait = await self._redis_client.client.eval(
+                _TAKE_SCRIPT, 1, self._key, time.time(), self.limit, self.window, reserve)
+            return float(wait)
+        except RedisError as exc:
+            logger.warning(f"Shared Hypixel quota unavailable, using local quota: {exc}")
+            return await super().take(reserve)
+
+    async def update(self, remaining: int, reset_in: float) -> None:
+        await super().update(remaining, reset_in)
+
+        try:
+            await self._redis_client.client.eval(
+                _UPDATE_SCRIPT, 1, self._key, time.time(), remaining, reset_in)
+        except RedisError as exc:
+            logger.warning(f"Shared Hypixel quota unavailable, using local quota: {exc}")
+
+
+@dataclass
+class RateLimiterMetrics:
+    """A snapshot of rate limiter metrics."""
+    granted: dict[RequestPriority, int]
+    "The amount of requests granted per priority."
+    waiting: int
+    "The amount of requests currently waiting for quota."
+    throttled: int
+    "The amount of throttle responses received."
+    total_wait: float
+    "The total time (in seconds) spent waiting for quota."
+
+
+class HypixelRateLimiter:
+    """
+    Hands out the requests of the Hypixel API key's rate limit window in
+    priority order. Each priority may only use the window's quota while
+    more than its reserve is remaining, so that background work always
+    leaves room for interactive requests.
+
+    The quota is corrected with the `RateLimit-Remaining` and
+    `RateLimit-Reset` headers of every response, and can optionally be
+    shared with other processes through redis.
+    """
+    def __init__(
+        self,
+        limit: int,
+        window: float,
+        reserves: Mapping[RequestPriority, int] | None=None,
+        throttle_fallback: float=20,
+        redis_client: RedisClient | None=None,
+        redis_key: str="statalytics:hypixel_rate_limit",
+        poll_interval: float=1
+    ) -> None:
+        """
+        :param limit: The amount of requests allowed per window.
+        :param window: The length (in seconds) of a rate limit window.
+        :param reserves: The amount of requests of a window reserved for \
+            higher priorities, per priority.
+        :param throttle_fallback: How long (in seconds) to pause requests \
+            after a throttle response without a reset header.
+        :param redis_client: Share the quota with other processes through \
+            redis using this client.
+        :param redis_key: The redis key the shared quota is stored at.
+        :param poll_interval: How often (in seconds) to recheck a shared \
+            quota while waiting, since other processes can't notify waiters.
+        """
+        self.reserves = dict(reserves or {})
+        self.throttle_fallback = throttle_fallback
+        self.poll_interval = poll_interval
+
+        if redis_client is None:
+            self._quota = _LocalQuota(limit, window)
+        else:
+            self._quota = _RedisQuota(limit, window, redis_client, redis_key)
+
+        self._waiters: list[tuple[RequestPriority, int]] = []
+        self._sequence = itertools.count()
+        self._condition: asyncio.Condition | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+        self._granted: Counter[RequestPriority] = Counter()
+        self._throttled = 0
+        self._total_wait = 0.0
+
+    @classmethod
+    def from_config(cls) -> 'HypixelRateLimiter':
+        """Create a rate limiter using the configured settings."""
+        settings = _rate_limit_settings()
+
+        reserves = {
+            priority: settings["reserves"].get(priority.name.lower(), 0)
+            for priority in RequestPriority
+        }
+
+        return cls(
+            limit=settings["limit"],
+            window=settings["window"],
+            reserves=reserves,
+            throttle_fallback=settings["throttle_fallback"],
+            redis_client=main_redis_client if settings["shared"] else None
+        )
+
+    def _get_condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+
+        # Conditions are bound to the loop they are first used on
+        if self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._waiters.clear()
+            self._loop = loop
+
+        return self._condition
+
+    async def acquire(self, priority: RequestPriority=RequestPriority.INTERACTIVE) -> None:
+        """
+        Wait until a request of the given priority is allowed to be made.
+        Requests of higher priorities are always served first.
+
+        :param priority: The priority of the request.
+        """
+        condition = self._get_condition()
+        entry = (priority, next(self._sequence))
+        started_at = time.monotonic()
+
+        async with condition:
+            heapq.heappush(self._waiters, entry)
+
+            try:
+                while True:
+                    timeout = None
+
+                    if self._waiters[0] == entry:
+                        timeout = await self._quota.take(self.reserves.get(priority, 0))
+                        if timeout <= 0:
+                            self._granted[priority] += 1
+                            return
+
+                        if isinstance(self._quota, _RedisQuota):
+                            timeout = min(timeout, self.poll_interval)
+
+                    try:
+                        await asyncio.wait_for(condition.wait(), timeout)
+                    except TimeoutError:
+                        pass
+            finally:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._total_wait += time.monotonic() - started_at
+
+                condition.notify_all()
+
+    async def _notify(self) -> None:
+        condition = self._get_condition()
+        async with condition:
+            condition.notify_all()
+
+    async def record_response(self, status: int, headers: Mapping[str, str]) -> None:
+        """
+        Correct the quota using the rate limit headers of a Hypixel response.
+
+        :param status: The HTTP status of the response.
+        :param headers: The headers of the response.
+        """
+        try:
+            remaining = int(headers["RateLimit-Remaining"])
+            reset_in = float(headers["RateLimit-Reset"])
+        except (KeyError, ValueError):
+            if status == 429:
+                await self.throttle()
+            return
+
+        if status == 429:
+            self._throttled += 1
+            remaining = 0
+
+        await self._quota.update(remaining, reset_in)
+        await self._notify()
+
+    async def throttle(self, retry_after: float | None=None) -> None:
+        """
+        Pause every request until the quota resets, after being rate limited.
+
+        :param retry_after: How long (in seconds) until requests may be \
+            made again, defaults to the throttle fallback.
+        """
+        self._throttled += 1
+        await self._quota.update(0, retry_after or self.throttle_fallback)
+
+    def metrics(self) -> RateLimiterMetrics:
+        """Get a snapshot of the rate limiter metrics."""
+        return RateLimiterMetrics(
+            granted=dict(self._granted),
+            waiting=len(self._waiters),
+            throttled=self._throttled,
+            total_wait=self._total_wait
+        )
+
+
+hypixel_rate_limiter = HypixelRateLimiter.from_config()
+"The rate limiter every Hypixel request must go through."
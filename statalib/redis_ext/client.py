@@ -3,7 +3,7 @@ import asyncio
 import os
 import redis.asyncio as redis
 
-def create_client() -> redis.Redis:
+def create_client(decode_responses: bool=True) -> redis.Redis:
     host = os.getenv("REDIS_HOST")
     port = os.getenv("REDIS_PORT")
     
@@ -19,18 +19,19 @@ def create_client() -> redis.Redis:
         host=host,
         port=port,
         password=os.getenv("REDIS_PASSWORD"),
-        decode_responses=True
+        decode_responses=decode_responses
     )
 
 
 class RedisClient:
-    def __init__(self) -> None:
+    def __init__(self, decode_responses: bool=True) -> None:
         self._redis: redis.Redis | None = None
+        self._decode_responses = decode_responses
 
     @property
     def client(self) -> redis.Redis:
         if self._redis is None:
-            self._redis = create_client()
+            self._redis = create_client(self._decode_responses)
         return self._redis
 
     async def reconnect(self, attempt: int=0) -> redis.Redis:
@@ -41,7 +42,7 @@ class RedisClient:
         await asyncio.sleep(delay)
 
         try:
-            new_client = create_client()
+            new_client = create_client(self._decode_responses)
             await new_client.ping()
             logging.info(f"Successfully reconnected to redis.")
             self._redis = new_client
@@ -52,3 +53,6 @@ class RedisClient:
 
 redis_client = RedisClient()
 
+binary_redis_client = RedisClient(decode_responses=False)
+"Client for binary payloads, such as compressed cache entries."
+
@@ -4,6 +4,8 @@ support for custom Minecraft text formatting."""
 from . import usernames
 from . import text
 from . import tools
+from . import tokenizer
+from . import theme_variants
 from .background import BackgroundImageLoader
 from .image import ImageRender
 from .prestige_colors import Prestige, PrestigeColors
@@ -13,6 +15,8 @@ __all__ = [
     'usernames',
     'text',
     'tools',
+    'tokenizer',
+    'theme_variants',
     'BackgroundImageLoader',
     'ImageRender',
     'Prestige',
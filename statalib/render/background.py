@@ -7,7 +7,7 @@ from typing import Any
 from PIL import Image
 
 from .prestige_colors import PrestigeColors
-from .tools import recolor_pixels
+from .theme_variants import theme_variants
 from ..assets import ASSET_LOADER
 from ..cfg import config
 from ..common import REL_PATH
@@ -53,11 +53,7 @@ class ThemeImageLoader:
 
         star_color = PrestigeColors(prestige).primary_prestige_color
 
-        image = self._load_theme_image().convert('RGBA')
-
-        rgb_from = ((213, 213, 213), (214, 214, 214))
-        rgb_to = (rank_info["color_rgb"], star_color)
-        return recolor_pixels(image, rgb_from=rgb_from, rgb_to=rgb_to)
+        return theme_variants.get(self._theme_img_path, rank_info["color_rgb"], star_color)
 
     def load_theme_background(self) -> Image.Image:
         """Load the theme image."""
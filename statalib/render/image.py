@@ -7,9 +7,9 @@ from PIL import Image, UnidentifiedImageError
 
 from ..assets import ASSET_LOADER
 from ..hypixel import PROGRESS_BAR_MAX, RankInfo
-from . import text as imgtext
 from .prestige_colors import Prestige
 from .text import render_mc_text
+from .tokenizer import layout_text
 
 
 class TextOptions(TypedDict):
@@ -161,8 +161,7 @@ class ProgressRender:
 
     def _actual_text_len(self, text: str) -> int:
         """Find the text length while ignoring color coding characters."""
-        return imgtext.get_text_len(
-            imgtext.get_actual_text(Prestige.format_level(text)), font=self.font)
+        return layout_text(Prestige.format_level(text), self.font).length
 
     def draw_progress_bar(
         self,
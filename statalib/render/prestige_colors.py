@@ -2,6 +2,7 @@
 
 from dataclasses import dataclass
 from enum import Enum
+import functools
 import logging
 from typing import final
 
@@ -228,6 +229,7 @@ class Prestige:
         return [(level_str, self.colors.prestige_colors.color.value)]
 
     @staticmethod
+    @functools.lru_cache(maxsize=1024)
     def format_level(level: int) -> str:
         """Standalone method for formatting a level."""
         return Prestige(level).formatted_level
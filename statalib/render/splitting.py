@@ -1,8 +1,14 @@
 """String splitting utilities."""
 
+import functools
 import re
 
 
+@functools.lru_cache(maxsize=32)
+def _split_pattern(split_chars: tuple) -> re.Pattern:
+    return re.compile(f"({'|'.join(map(re.escape, split_chars))})")
+
+
 def split_string(input_string: str, split_chars: tuple | list) -> list[tuple[str, str]]:
     """
     Split a string at all specified substrings and returns both
@@ -21,10 +27,8 @@ def split_string(input_string: str, split_chars: tuple | list) -> list[tuple[str
     (('Hello ', ''), ('World ', '&a'), ('Python ', '&b'), ('Programming', '&c'))
     ```
     """
-    pattern = '|'.join(map(re.escape, split_chars))
-
     # Find the splits and their codes
-    parts = re.split(f"({pattern})", input_string)
+    parts = _split_pattern(tuple(split_chars)).split(input_string)
     if not parts:
         return [(input_string, '')]
 
@@ -5,23 +5,13 @@ from typing import Literal
 from PIL import Image, ImageFont, ImageDraw
 
 from ..assets import ASSET_LOADER
-from .splitting import split_string
-from ..color import COLOR_CODE_MAP, Color, ColorString
+from .tokenizer import calc_shadow_color, layout_text, strip_color_codes
 
 
 dummy_img = Image.new('RGBA', (0, 0))
 dummy_draw = ImageDraw.Draw(dummy_img)
 
 
-def calc_shadow_color(rgb: tuple) -> tuple[int, int, int]:
-    """
-    Calculate the drop shadow RGB value for a given RGB value.
-
-    :param rgb: The RGB value to calculate a shadow color for.
-    """
-    return tuple([int(c * 0.25) for c in rgb])
-
-
 def get_text_len(text: str, font: ImageFont.ImageFont):
     """
     Get the length of a string (accounting for symbols).
@@ -39,11 +29,7 @@ def get_actual_text(text: str) -> str:
     :param text: The text to remove color codes from.
     :return str: The text without color codes.
     """
-    split_chars = tuple(COLOR_CODE_MAP.keys())
-    bits = tuple(split_string(text, split_chars))
-
-    actual_text = ''.join([bit[0] for bit in bits])
-    return actual_text
+    return strip_color_codes(text)
 
 
 def get_start_point(
@@ -113,33 +99,23 @@ def render_mc_text(
     if font is None:
         font = ASSET_LOADER.load_font("main.ttf", font_size)
 
-    split_chars = tuple(COLOR_CODE_MAP.keys())
-    bits = tuple(split_string(text, split_chars))
-
-    actual_text = ''.join([bit[0] for bit in bits])
+    layout = layout_text(text, font, image.mode)
 
     draw = ImageDraw.Draw(image)
 
     x, y = position
     x = get_start_point(
-        text=actual_text,
-        font=font,
         align=align,
-        pos=x
+        pos=x,
+        text_len=layout.length
     )
 
-    for text, color_code in bits:
-        try:
-            color = Color.from_color_code(color_code).rgb
-        except KeyError:
-            color = ColorString.WHITE.value.rgb
-
+    for run, width in zip(layout.runs, layout.widths):
         if shadow_offset is not None:
             off_x, off_y = shadow_offset
-            shadow_color = calc_shadow_color(color)
-            draw.text((x + off_x, y + off_y), text, fill=shadow_color, font=font)
+            draw.text((x + off_x, y + off_y), run.text, fill=run.shadow_rgb, font=font)
 
-        draw.text((x, y), text, fill=color, font=font)
-        x += int(draw.textlength(text, font=font))
+        draw.text((x, y), run.text, fill=run.rgb, font=font)
+        x += width
 
     return x
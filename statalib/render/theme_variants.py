@@ -0,0 +1,317 @@
+"""
+Cache of the recolored variants of dynamically colored themes.
+
+Dynamically colored themes recolor placeholder pixels to the rank color
+and prestige color of the player. As there are only so many rank and
+prestige colors, each variant is recolored once and kept in memory, and
+optionally on disk, rather than being recolored on every render.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Iterable
+
+import numpy as np
+from cachetools import LRUCache
+from PIL import Image
+
+from .prestige_colors import PrestigeColors
+from .tools import recolor_pixels
+from ..accounts import themes
+from ..assets import ASSET_LOADER
+from ..cfg import config
+from ..color import Color
+from ..common import REL_PATH
+from ..player_cache import CacheTierMetrics
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_THEME_VARIANT_SETTINGS = {
+    "memory_size": 32 * 1024 * 1024,  # Bytes, variants are about 1 MiB each
+    "disk": False,  # Variants are stored uncompressed
+    "warm_themes": 3  # The most used themes to warm at startup, requires the disk tier
+}
+"Fallback theme variant settings used when `global.theme_variants` is not configured."
+
+
+PLACEHOLDER_RGB = ((213, 213, 213), (214, 214, 214))
+"The placeholder colors of dynamically colored themes, recolored to the rank and prestige color."
+
+PRESTIGES = range(0, 10100, 100)
+"Every prestige with its own prestige color."
+
+
+def _theme_variant_settings() -> dict:
+    try:
+        configured: dict = config("global.theme_variants") or {}
+    except KeyError:
+        configured = {}
+
+    return {**DEFAULT_THEME_VARIANT_SETTINGS, **configured}
+
+
+def _image_size(image: Image.Image) -> int:
+    return image.width * image.height * len(image.getbands())
+
+
+def rank_colors() -> list[tuple[int, int, int]]:
+    """Get the distinct primary colors of every configured rank."""
+    rank_configs = config("global.ranks")
+    colors = [
+        Color.from_color_code(rank_config["color"]).rgb
+        for rank_group in ("default", "custom")
+        for rank_config in rank_configs[rank_group].values()
+    ]
+    return list(dict.fromkeys(colors))
+
+
+def prestige_colors() -> list[tuple[int, int, int]]:
+    """Get the distinct primary colors of every prestige, lowest prestige first."""
+    colors = [PrestigeColors(prestige).primary_prestige_color for prestige in PRESTIGES]
+    return list(dict.fromkeys(colors))
+
+
+class ThemeVariantCache:
+    """
+    Caches recolored theme variants in up to two tiers:
+
+    1. An in-process LRU, bounded by the total size of the variants.
+    2. Optionally, a directory on disk, kept across restarts. Variants are \
+        stored as raw arrays since decoding a PNG is slower than recoloring.
+
+    A variant found on disk is copied into memory. The disk tier also
+    records the rank and prestige color combinations that were rendered,
+    which are the combinations warmed.
+    """
+    TIERS = ("memory", "disk")
+
+    def __init__(self, memory_size: int, disk_dir: str | None=None) -> None:
+        """
+        :param memory_size: The maximum total size (in bytes) of the variants \
+            held in memory.
+        :param disk_dir: The directory of the disk tier, the tier is \
+            disabled if not provided.
+        """
+        self._memory: LRUCache[tuple, Image.Image] = LRUCache(memory_size, getsizeof=_image_size)
+        self._lock = threading.Lock()
+        self._disk_dir = disk_dir
+        self._combinations: set[tuple[tuple, tuple]] | None = None
+
+        self._metrics = {tier: CacheTierMetrics() for tier in self.TIERS}
+
+    @classmethod
+    def from_config(cls) -> 'ThemeVariantCache':
+        """Create a theme variant cache using the configured settings."""
+        settings = _theme_variant_settings()
+
+        return cls(
+            memory_size=settings["memory_size"],
+            disk_dir=f"{REL_PATH}/database/.cache/theme_variants" if settings["disk"] else None
+        )
+
+    def _disk_path(self, key: tuple) -> str:
+        image_path, rank_rgb, prestige_rgb = key
+
+        # The theme image's modification time invalidates variants of changed themes
+        modified = os.stat(f"{REL_PATH}/assets/{image_path}").st_mtime_ns
+        digest = hashlib.sha256(
+            json.dumps([image_path, modified, rank_rgb, prestige_rgb]).encode()
+        ).hexdigest()
+
+        return f"{self._disk_dir}/{digest[:2]}/{digest}.npy"
+
+    def _read_disk(self, key: tuple) -> Image.Image | None:
+        try:
+            return Image.fromarray(np.load(self._disk_path(key)))
+        except FileNotFoundError:
+            return None
+
+    def _write_disk(self, key: tuple, variant: Image.Image) -> None:
+        path = self._disk_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Written to a temporary file first so readers never see partial variants
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as variant_file:
+            np.save(variant_file, np.asarray(variant))
+        os.replace(tmp_path, path)
+
+    def _combinations_path(self) -> str:
+        return f"{self._disk_dir}/combinations.json"
+
+    def _rendered_combinations(self) -> set[tuple[tuple, tuple]]:
+        # Guarded by the lock
+        if self._combinations is None:
+            try:
+                with open(self._combinations_path(), encoding="utf-8") as combinations_file:
+                    self._combinations = {
+                        (tuple(rank_rgb), tuple(prestige_rgb))
+                        for rank_rgb, prestige_rgb in json.load(combinations_file)
+                    }
+            except (OSError, ValueError):
+                self._combinations = set()
+
+        return self._combinations
+
+    def _record_combination(self, rank_rgb: tuple, prestige_rgb: tuple) -> None:
+        rank_rgb, prestige_rgb = tuple(map(int, rank_rgb)), tuple(map(int, prestige_rgb))
+
+        with self._lock:
+            combinations = self._rendered_combinations()
+            if (rank_rgb, prestige_rgb) in combinations:
+                return
+
+            combinations.add((rank_rgb, prestige_rgb))
+
+            os.makedirs(self._disk_dir, exist_ok=True)
+            tmp_path = f"{self._combinations_path()}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as combinations_file:
+                json.dump(sorted(combinations), combinations_file)
+            os.replace(tmp_path, self._combinations_path())
+
+    def _recolor(self, key: tuple) -> Image.Image:
+        image_path, rank_rgb, prestige_rgb = key
+        variant = recolor_pixels(
+            ASSET_LOADER.load_image(image_path).convert("RGBA"),
+            rgb_from=PLACEHOLDER_RGB,
+            rgb_to=(rank_rgb, prestige_rgb)
+        )
+
+        if self._disk_dir is not None:
+            try:
+                self._write_disk(key, variant)
+                self._record_combination(rank_rgb, prestige_rgb)
+            except OSError as exc:
+                logger.warning(f"Disk theme variant cache unavailable: {exc}")
+
+        return variant
+
+    def _load(self, key: tuple) -> Image.Image:
+        with self._lock:
+            variant = self._memory.get(key)
+
+        if variant is not None:
+            self._metrics["memory"].hits += 1
+            return variant
+
+        self._metrics["memory"].misses += 1
+
+        if self._disk_dir is not None:
+            try:
+                variant = self._read_disk(key)
+            except (OSError, ValueError) as exc:
+                logger.warning(f"Disk theme variant cache unavailable: {exc}")
+
+            if variant is not None:
+                self._metrics["disk"].hits += 1
+            else:
+                self._metrics["disk"].misses += 1
+
+        if variant is None:
+            variant = self._recolor(key)
+
+        with self._lock:
+            try:
+                self._memory[key] = variant
+            except ValueError:
+                pass  # Larger than the whole memory tier
+
+        return variant
+
+    def get(
+        self,
+        image_path: str,
+        rank_rgb: tuple[int, int, int],
+        prestige_rgb: tuple[int, int, int]
+    ) -> Image.Image:
+        """
+        Get the variant of a dynamically colored theme image.
+
+        :param image_path: The path to the theme image relative to the \
+            assets directory.
+        :param rank_rgb: The rank color to recolor the theme to.
+        :param prestige_rgb: The prestige color to recolor the theme to.
+        :return Image.Image: A copy of the variant, safe to draw on.
+        """
+        return self._load((image_path, tuple(rank_rgb), tuple(prestige_rgb))).copy()
+
+    def warm(self, theme_ids: Iterable[str]) -> int:
+        """
+        Recolor the variants of themes ahead of time, for every rank and
+        prestige color combination that was rendered before. Variants are
+        warmed into the disk tier only, so warming doesn't hold variants
+        in memory that may never be used. Without the disk tier, nothing
+        is warmed.
+
+        :param theme_ids: The IDs of the themes, most important first.
+        :return int: The amount of variants warmed.
+        """
+        if self._disk_dir is None:
+            return 0
+
+        background_dirs = sorted(
+            entry.name for entry in os.scandir(f"{REL_PATH}/assets/bg") if entry.is_dir())
+
+        with self._lock:
+            combinations = sorted(self._rendered_combinations())
+
+        warmed = 0
+        for theme_id in theme_ids:
+            for background_dir in background_dirs:
+                image_path = f"bg/{background_dir}/themes/{theme_id}.png"
+                if not ASSET_LOADER.image_file_exists(image_path):
+                    continue
+
+                for rank_rgb, prestige_rgb in combinations:
+                    key = (image_path, rank_rgb, prestige_rgb)
+
+                    if not os.path.exists(self._disk_path(key)):
+                        _ = self._recolor(key)
+                        warmed += 1
+
+        return warmed
+
+    def clear(self) -> None:
+        """Drop every variant held in memory."""
+        with self._lock:
+            self._memory.clear()
+
+    def metrics(self) -> dict[str, CacheTierMetrics]:
+        """Get a snapshot of the metrics of each tier."""
+        return {
+            tier: CacheTierMetrics(metrics.hits, metrics.misses)
+            for tier, metrics in self._metrics.items()
+        }
+
+
+theme_variants = ThemeVariantCache.from_config()
+"The variants of dynamically colored themes used by `ThemeImageLoader`."
+
+
+def warm_theme_variants() -> int:
+    """
+    Warm the variants of the most used dynamically colored themes, as
+    configured by `global.theme_variants.warm_themes`. Nothing is warmed
+    unless the disk tier is enabled.
+
+    :return int: The amount of variants warmed.
+    """
+    settings = _theme_variant_settings()
+
+    limit: int = settings["warm_themes"]
+    if limit <= 0 or not settings["disk"]:
+        return 0
+
+    theme_ids = [
+        theme.id for theme in themes.get_most_used_themes()
+        if theme.dynamic_color and theme.is_legacy()
+    ][:limit]
+
+    warmed = theme_variants.warm(theme_ids)
+    logger.info(f"Warmed {warmed} theme variants of {len(theme_ids)} themes.")
+    return warmed
@@ -0,0 +1,121 @@
+"""
+Tokenizing and measuring of Minecraft color coded text.
+
+The color code pattern is compiled once, and the layout of a text (its
+colored runs and their widths) is memoized per font, since the same
+labels, usernames and levels are rendered over and over.
+"""
+
+import functools
+import re
+from typing import NamedTuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+from ..color import COLOR_CODE_MAP, ColorString
+
+
+COLOR_CODE_PATTERN = re.compile('|'.join(map(re.escape, COLOR_CODE_MAP)))
+"Matches every supported color code."
+
+DEFAULT_RGB = ColorString.WHITE.value.rgb
+"The color of text that isn't preceded by a color code."
+
+
+class TextRun(NamedTuple):
+    """A run of text sharing a single color."""
+    text: str
+    "The text of the run, without color codes."
+    color_code: str
+    "The color code preceding the run, or an empty string if there is none."
+    rgb: tuple[int, int, int]
+    "The RGB color of the run."
+    shadow_rgb: tuple[int, int, int]
+    "The RGB color of the run's drop shadow."
+
+
+class TextLayout(NamedTuple):
+    """The measured runs of a text rendered in a specific font."""
+    runs: tuple[TextRun, ...]
+    "The colored runs of the text, in order."
+    widths: tuple[int, ...]
+    "The horizontal advance (in pixels) after each run."
+    length: float
+    "The length (in pixels) of the whole text without color codes."
+
+
+def calc_shadow_color(rgb: tuple) -> tuple[int, int, int]:
+    """
+    Calculate the drop shadow RGB value for a given RGB value.
+
+    :param rgb: The RGB value to calculate a shadow color for.
+    """
+    return tuple([int(c * 0.25) for c in rgb])
+
+
+def strip_color_codes(text: str) -> str:
+    """
+    Remove color codes from text.
+
+    :param text: The text to remove color codes from.
+    :return str: The text without color codes.
+    """
+    return COLOR_CODE_PATTERN.sub('', text)
+
+
+@functools.lru_cache(maxsize=4096)
+def tokenize(text: str) -> tuple[TextRun, ...]:
+    """
+    Split text into colored runs. A color code only applies to the text
+    directly following it, and empty runs are dropped.
+
+    :param text: The color coded text to tokenize.
+    :return tuple[TextRun, ...]: The colored runs of the text, in order.
+    """
+    runs = []
+    color_code = ''
+    start = 0
+
+    def add_run(end: int) -> None:
+        if end > start:
+            color = COLOR_CODE_MAP.get(color_code, ColorString.WHITE).value.rgb
+            runs.append(
+                TextRun(text[start:end], color_code, color, calc_shadow_color(color)))
+
+    for match in COLOR_CODE_PATTERN.finditer(text):
+        add_run(match.start())
+        color_code = match.group()
+        start = match.end()
+
+    add_run(len(text))
+    return tuple(runs)
+
+
+@functools.lru_cache(maxsize=8)
+def _measuring_draw(mode: str) -> ImageDraw.ImageDraw:
+    return ImageDraw.Draw(Image.new(mode, (0, 0)))
+
+
+@functools.lru_cache(maxsize=4096)
+def layout_text(
+    text: str,
+    font: ImageFont.FreeTypeFont,
+    mode: str='RGBA'
+) -> TextLayout:
+    """
+    Tokenize and measure color coded text.
+
+    :param text: The color coded text to lay out.
+    :param font: The font the text will be rendered in.
+    :param mode: The mode of the image the text will be rendered onto, \
+        which affects glyph hinting.
+    :return TextLayout: The runs of the text and their measurements.
+    """
+    draw = _measuring_draw(mode)
+    runs = tokenize(text)
+
+    return TextLayout(
+        runs=runs,
+        widths=tuple(int(draw.textlength(run.text, font=font)) for run in runs),
+        length=draw.textlength(strip_color_codes(text), font=font)
+    )
@@ -4,7 +4,8 @@ from typing import Literal
 
 from PIL import Image
 
-from .text import render_mc_text, get_actual_text, get_text_len
+from .text import render_mc_text
+from .tokenizer import layout_text
 from .prestige_colors import Prestige
 from ..assets import ASSET_LOADER
 from ..hypixel.ranks import RankInfo
@@ -42,7 +43,7 @@ def render_display_name(
         full_string = f'{formatted_lvl} {full_string}'
 
     if image is None:
-        text_len = get_text_len(get_actual_text(full_string), font)
+        text_len = layout_text(full_string, font).length
         # additional 20 pixels for padding
         image = Image.new('RGBA', (int(text_len) + 20, font_size), (0, 0, 0, 0))
 
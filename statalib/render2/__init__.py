@@ -1,14 +1,26 @@
 """Statalytics' fractyl based rendering library."""
 
-from . import client, placeholders, backgrounds
+from . import assets, cache, client, placeholders, backgrounds, resilience
+from .assets import RendererAssetStore, renderer_assets
+from .cache import RenderCache, render_cache
 from .client import RenderingClient
 from .placeholders import PlaceholderValues, TSpan
+from .resilience import RendererPool, renderer_pool
 
 
 __all__ = [
+    "assets",
+    "cache",
+    "resilience",
     "placeholders",
     "client",
+    "RendererAssetStore",
+    "renderer_assets",
+    "RenderCache",
+    "render_cache",
     "RenderingClient",
+    "RendererPool",
+    "renderer_pool",
     "PlaceholderValues",
     "TSpan",
     "backgrounds"
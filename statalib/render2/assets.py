@@ -0,0 +1,190 @@
+"""
+Content-addressed assets for rendering server requests.
+
+Rather than inlining skins and uploading backgrounds on every render,
+assets are uploaded to the rendering server once under their digest and
+later renders only send references to them:
+
+- `PUT {host}/assets/sha256:<hex>` uploads an asset, the body being its bytes.
+- The `background_image_ref` form field references the background image,
+  replacing the `background_image` file field.
+- Image placeholders reference assets with an `asset:` prefixed href,
+  replacing their inline `data:` URI.
+- Themes bundled with the rendering server are referenced as `theme:<id>`.
+
+If the server doesn't hold a referenced asset (it was restarted, for
+example), it responds with `MISSING_ASSET_STATUS` and the render is sent
+again with every asset inlined.
+"""
+
+import asyncio
+import functools
+import hashlib
+import logging
+import os
+
+from aiohttp import ClientError, ClientSession
+
+from ..cfg import config
+from .backgrounds import THEME_DIR
+from .placeholders import BACKGROUND_ASSET_KEY, PlaceholderValues
+
+
+logger = logging.getLogger(__name__)
+
+
+MISSING_ASSET_STATUS = 424
+"The status the rendering server responds with when a referenced asset is unknown."
+
+
+DEFAULT_RENDERER_ASSET_SETTINGS = {
+    "enabled": False,  # The rendering server must support the asset protocol
+    "theme_refs": True  # Whether the rendering server bundles the themes
+}
+"Fallback renderer asset settings used when `global.renderer_assets` is not configured."
+
+
+def _renderer_asset_settings() -> dict:
+    try:
+        configured: dict = config("global.renderer_assets") or {}
+    except KeyError:
+        configured = {}
+
+    return {**DEFAULT_RENDERER_ASSET_SETTINGS, **configured}
+
+
+def asset_digest(asset: bytes) -> str:
+    """
+    Get the content address of an asset.
+
+    :param asset: The asset bytes.
+    """
+    return f"sha256:{hashlib.sha256(asset).hexdigest()}"
+
+
+@functools.lru_cache(maxsize=1)
+def theme_asset_ids() -> dict[str, str]:
+    """Get the IDs of the bundled themes, by the digest of their image."""
+    if not os.path.isdir(THEME_DIR):
+        return {}
+
+    theme_ids = {}
+    for filename in sorted(os.listdir(THEME_DIR)):
+        theme_id, ext = os.path.splitext(filename)
+        if ext != ".png":
+            continue
+
+        with open(f"{THEME_DIR}/{filename}", "rb") as theme_file:
+            theme_ids[asset_digest(theme_file.read())] = theme_id
+
+    return theme_ids
+
+
+class RendererAssetStore:
+    """
+    Tracks the assets each rendering server holds, uploading each asset
+    once. Concurrent renders needing the same asset share its upload.
+    """
+    def __init__(self, enabled: bool=True, theme_refs: bool=True) -> None:
+        """
+        :param enabled: Whether assets should be sent as references.
+        :param theme_refs: Whether backgrounds matching a bundled theme \
+            should be referenced by their theme ID.
+        """
+        self.enabled = enabled
+        self.theme_refs = theme_refs
+
+        self._known: set[tuple[str, str]] = set()
+        self._uploads: dict[tuple[str, str], asyncio.Task[bool]] = {}
+
+    @classmethod
+    def from_config(cls) -> 'RendererAssetStore':
+        """Create an asset store using the configured settings."""
+        settings = _renderer_asset_settings()
+        return cls(enabled=settings["enabled"], theme_refs=settings["theme_refs"])
+
+    async def _upload(
+        self, session: ClientSession, host: str, digest: str, asset: bytes
+    ) -> bool:
+        try:
+            async with session.put(
+                f"{host}/assets/{digest}",
+                data=asset,
+                headers={"Content-Type": "application/octet-stream"}
+            ) as res:
+                res.raise_for_status()
+        except (ClientError, asyncio.TimeoutError) as exc:
+            logger.warning(f"Failed to upload renderer asset {digest}: {exc}")
+            return False
+
+        self._known.add((host, digest))
+        return True
+
+    async def reference(self, session: ClientSession, host: str, asset: bytes) -> str | None:
+        """
+        Get a reference to an asset, uploading the asset if the rendering
+        server doesn't hold it yet.
+
+        :param session: The session to upload the asset with.
+        :param host: The rendering server to reference the asset on.
+        :param asset: The asset bytes.
+        :return str | None: The reference, or `None` if the asset must be inlined.
+        """
+        digest = asset_digest(asset)
+
+        if self.theme_refs:
+            theme_id = theme_asset_ids().get(digest)
+            if theme_id is not None:
+                return f"theme:{theme_id}"
+
+        key = (host, digest)
+        if key in self._known:
+            return digest
+
+        upload = self._uploads.get(key)
+        if upload is None:
+            upload = asyncio.ensure_future(self._upload(session, host, digest, asset))
+            self._uploads[key] = upload
+            upload.add_done_callback(lambda _: self._uploads.pop(key, None))
+
+        return digest if await asyncio.shield(upload) else None
+
+    async def references(
+        self,
+        session: ClientSession,
+        host: str,
+        placeholder_values: PlaceholderValues,
+        background_image: bytes | None
+    ) -> dict[str, str]:
+        """
+        Get references to every asset of a render.
+
+        :param session: The session to upload assets with.
+        :param host: The rendering server to reference the assets on.
+        :param placeholder_values: The placeholder values of the render.
+        :param background_image: The background image of the render.
+        :return dict[str, str]: The references by image placeholder key, \
+            with the background keyed by `BACKGROUND_ASSET_KEY`.
+        """
+        assets = dict(placeholder_values.inline_images)
+        if background_image is not None:
+            assets[BACKGROUND_ASSET_KEY] = background_image
+
+        refs = await asyncio.gather(*(
+            self.reference(session, host, asset) for asset in assets.values()))
+
+        return {key: ref for key, ref in zip(assets, refs) if ref is not None}
+
+    def forget(self, host: str, refs: dict[str, str]) -> None:
+        """
+        Forget that a rendering server holds assets, so they are uploaded again.
+
+        :param host: The rendering server.
+        :param refs: The references of the assets.
+        """
+        for ref in refs.values():
+            self._known.discard((host, ref))
+
+
+renderer_assets = RendererAssetStore.from_config()
+"The assets held by the rendering servers, shared by every `RenderingClient`."
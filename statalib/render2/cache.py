@@ -0,0 +1,367 @@
+"""
+Content-addressed cache of rendered images, shared by every process.
+
+Renders are keyed by a digest of everything the renderer is sent, so two
+requests for the same image share a cache entry no matter which process,
+client instance or user made them.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable
+
+from cachetools import TTLCache
+from redis.exceptions import RedisError
+
+from ..cfg import config
+from ..common import REL_PATH
+from ..player_cache import CacheTierMetrics
+from ..redis_ext.client import RedisClient, binary_redis_client
+from .placeholders import PlaceholderValues, Size
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_RENDER_CACHE_SETTINGS = {
+    "version": 1,  # Bump when renderer templates change to invalidate every render
+    "memory_size": 64 * 1024 * 1024,  # Bytes
+    "memory_ttl": 600,  # Seconds
+    "redis": False,
+    "redis_ttl": 60 * 60 * 24,  # Seconds
+    "disk": True,
+    "disk_ttl": 60 * 60 * 24  # Seconds
+}
+"Fallback render cache settings used when `global.render_cache` is not configured."
+
+
+def _render_cache_settings() -> dict:
+    try:
+        configured: dict = config("global.render_cache") or {}
+    except KeyError:
+        configured = {}
+
+    return {**DEFAULT_RENDER_CACHE_SETTINGS, **configured}
+
+
+def background_digest(background_image: bytes | None) -> str | None:
+    """
+    Get the digest of a background image.
+
+    :param background_image: The background image bytes.
+    :return str | None: The digest, or `None` if there is no background.
+    """
+    if background_image is None:
+        return None
+
+    return hashlib.blake2b(background_image, digest_size=16).hexdigest()
+
+
+def _normalize(value: Any) -> Any:
+    # Inline images are replaced by their digest to keep the key document small
+    if isinstance(value, str) and value.startswith("data:"):
+        return f"data:{hashlib.blake2b(value.encode(), digest_size=16).hexdigest()}"
+
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+
+    if isinstance(value, list):
+        return [_normalize(v) for v in value]
+
+    return value
+
+
+def render_cache_key(
+    route: str,
+    size: Size,
+    placeholder_values: PlaceholderValues,
+    background_image: bytes | None,
+    version: int=DEFAULT_RENDER_CACHE_SETTINGS["version"]
+) -> str:
+    """
+    Get the content address of a render, a stable digest of everything
+    the renderer is sent.
+
+    :param route: The rendering server route of the render.
+    :param size: The size of the render.
+    :param placeholder_values: The placeholder values of the render.
+    :param background_image: The background image of the render.
+    :param version: The render cache version.
+    """
+    document = json.dumps(
+        [
+            version,
+            route.removeprefix("/"),
+            size,
+            _normalize(placeholder_values.as_dict()),
+            background_digest(background_image)
+        ],
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False
+    )
+
+    return hashlib.sha256(document.encode()).hexdigest()
+
+
+class RenderCache:
+    """
+    Caches rendered images by their content address in up to three tiers:
+
+    1. An in-process LRU, bounded by the total size of the renders.
+    2. Optionally, redis, shared by every process.
+    3. Optionally, a directory on disk, shared by every process on the \
+        host and kept across restarts.
+
+    A render found in a slower tier is copied into the faster tiers.
+    """
+    TIERS = ("memory", "redis", "disk")
+
+    def __init__(
+        self,
+        memory_size: int,
+        memory_ttl: float,
+        redis_client: RedisClient | None=None,
+        redis_ttl: int=60 * 60 * 24,
+        redis_key_prefix: str="statalytics:render:",
+        disk_dir: str | None=None,
+        disk_ttl: float=60 * 60 * 24,
+        version: int=DEFAULT_RENDER_CACHE_SETTINGS["version"]
+    ) -> None:
+        """
+        :param memory_size: The maximum total size (in bytes) of the renders \
+            held in memory.
+        :param memory_ttl: How long (in seconds) renders are held in memory.
+        :param redis_client: The binary redis client to use for the redis \
+            tier, the tier is disabled if not provided.
+        :param redis_ttl: How long (in seconds) renders are kept in redis.
+        :param redis_key_prefix: The prefix of the redis keys of renders.
+        :param disk_dir: The directory of the disk tier, the tier is \
+            disabled if not provided.
+        :param disk_ttl: How long (in seconds) renders are kept on disk.
+        :param version: The render cache version, part of every key.
+        """
+        self._memory: TTLCache[str, bytes] = TTLCache(memory_size, memory_ttl, getsizeof=len)
+        self._redis_client = redis_client
+        self._redis_ttl = redis_ttl
+        self._redis_key_prefix = redis_key_prefix
+
+        self._disk_dir = disk_dir
+        self._disk_ttl = disk_ttl
+        self._disk_writes = 0
+
+        self.version = version
+        "The render cache version, part of every key."
+
+        self._metrics = {tier: CacheTierMetrics() for tier in self.TIERS}
+        self._in_flight: dict[str, asyncio.Future[bytes]] = {}
+
+    @classmethod
+    def from_config(cls) -> 'RenderCache':
+        """Create a render cache using the configured settings."""
+        settings = _render_cache_settings()
+
+        return cls(
+            memory_size=settings["memory_size"],
+            memory_ttl=settings["memory_ttl"],
+            redis_client=binary_redis_client if settings["redis"] else None,
+            redis_ttl=settings["redis_ttl"],
+            disk_dir=f"{REL_PATH}/database/.cache/renders" if settings["disk"] else None,
+            disk_ttl=settings["disk_ttl"],
+            version=settings["version"]
+        )
+
+    def key(
+        self,
+        route: str,
+        size: Size,
+        placeholder_values: PlaceholderValues,
+        background_image: bytes | None
+    ) -> str:
+        """
+        Get the content address of a render, see `render_cache_key`.
+
+        :param route: The rendering server route of the render.
+        :param size: The size of the render.
+        :param placeholder_values: The placeholder values of the render.
+        :param background_image: The background image of the render.
+        """
+        return render_cache_key(
+            route, size, placeholder_values, background_image, self.version)
+
+    def _remember(self, key: str, render: bytes) -> None:
+        try:
+            self._memory[key] = render
+        except ValueError:
+            pass  # Larger than the whole memory tier
+
+    def _disk_path(self, key: str) -> str:
+        return f"{self._disk_dir}/{key[:2]}/{key}.png"
+
+    def _read_disk(self, key: str) -> bytes | None:
+        path = self._disk_path(key)
+
+        try:
+            if time.time() - os.path.getmtime(path) > self._disk_ttl:
+                os.remove(path)
+                return None
+
+            with open(path, "rb") as render_file:
+                return render_file.read()
+        except FileNotFoundError:
+            return None
+
+    def _write_disk(self, key: str, render: bytes) -> None:
+        path = self._disk_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Written to a temporary file first so readers never see partial renders
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as render_file:
+            render_file.write(render)
+        os.replace(tmp_path, path)
+
+    def prune_disk(self) -> int:
+        """
+        Remove the expired renders of the disk tier.
+
+        :return int: The amount of renders removed.
+        """
+        if self._disk_dir is None or not os.path.isdir(self._disk_dir):
+            return 0
+
+        removed = 0
+        expire_before = time.time() - self._disk_ttl
+
+        for dir_entry in os.scandir(self._disk_dir):
+            if not dir_entry.is_dir():
+                continue
+
+            for render_entry in os.scandir(dir_entry.path):
+                try:
+                    if render_entry.stat().st_mtime < expire_before:
+                        os.remove(render_entry.path)
+                        removed += 1
+                except FileNotFoundError:
+                    pass
+
+        return removed
+
+    async def get_or_render(
+        self, key: str, render: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        """
+        Get a render from the cache, or render and cache it on a miss.
+        Concurrent misses of the same render share a single render.
+
+        :param key: The content address of the render.
+        :param render: Renders the image on a miss.
+        """
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            return await asyncio.shield(in_flight)
+
+        cached = await self.get(key)
+        if cached is not None:
+            return cached
+
+        # Another render of the key may have started while checking the tiers
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            return await asyncio.shield(in_flight)
+
+        async def render_and_set() -> bytes:
+            render_bytes = await render()
+            await self.set(key, render_bytes)
+            return render_bytes
+
+        in_flight = asyncio.ensure_future(render_and_set())
+        self._in_flight[key] = in_flight
+        in_flight.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        return await asyncio.shield(in_flight)
+
+    async def get(self, key: str) -> bytes | None:
+        """
+        Get a render from the fastest tier holding it.
+
+        :param key: The content address of the render.
+        :return bytes | None: The rendered image if any tier holds it.
+        """
+        render = self._memory.get(key)
+        if render is not None:
+            self._metrics["memory"].hits += 1
+            return render
+
+        self._metrics["memory"].misses += 1
+
+        if self._redis_client is not None:
+            try:
+                render = await self._redis_client.client.get(f"{self._redis_key_prefix}{key}")
+            except RedisError as exc:
+                logger.warning(f"Redis render cache unavailable: {exc}")
+
+            if render is not None:
+                self._metrics["redis"].hits += 1
+                self._remember(key, render)
+                return render
+
+            self._metrics["redis"].misses += 1
+
+        if self._disk_dir is not None:
+            try:
+                render = await asyncio.to_thread(self._read_disk, key)
+            except OSError as exc:
+                logger.warning(f"Disk render cache unavailable: {exc}")
+
+            if render is not None:
+                self._metrics["disk"].hits += 1
+                self._remember(key, render)
+                return render
+
+            self._metrics["disk"].misses += 1
+
+        return None
+
+    async def set(self, key: str, render: bytes) -> None:
+        """
+        Cache a render in every tier.
+
+        :param key: The content address of the render.
+        :param render: The rendered image.
+        """
+        self._remember(key, render)
+
+        if self._redis_client is not None:
+            try:
+                await self._redis_client.client.set(
+                    f"{self._redis_key_prefix}{key}", render, ex=int(self._redis_ttl))
+            except RedisError as exc:
+                logger.warning(f"Redis render cache unavailable: {exc}")
+
+        if self._disk_dir is not None:
+            try:
+                await asyncio.to_thread(self._write_disk, key, render)
+            except OSError as exc:
+                logger.warning(f"Disk render cache unavailable: {exc}")
+
+            # Expired renders are only removed when read, prune the rest now and then
+            self._disk_writes += 1
+            if self._disk_writes % 256 == 0:
+                await asyncio.to_thread(self.prune_disk)
+
+    def metrics(self) -> dict[str, CacheTierMetrics]:
+        """Get a snapshot of the metrics of each tier."""
+        return {
+            tier: CacheTierMetrics(metrics.hits, metrics.misses)
+            for tier, metrics in self._metrics.items()
+        }
+
+
+render_cache = RenderCache.from_config()
+"The cache in front of `RenderingClient.render`."
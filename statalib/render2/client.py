@@ -1,18 +1,17 @@
 """A client for interacting with the rendering service."""
 
+import asyncio
 import logging
-import os
 from abc import ABC, abstractmethod
 from io import BytesIO
-from typing import Hashable, Sequence
-
-import cachetools.keys
-from aiohttp import ClientSession, ClientTimeout
-from cachetools import TTLCache
-from cachetools_async import cached
+from typing import Sequence
 
 from ..common import Mode
+from ..http_sessions import http_sessions
+from .assets import MISSING_ASSET_STATUS, RendererAssetStore, renderer_assets
+from .cache import RenderCache, render_cache
 from .placeholders import PlaceholderValues, Size
+from .resilience import RendererPool, renderer_pool
 from .backgrounds import load_background_for_user
 
 
@@ -20,16 +19,25 @@ logger = logging.getLogger(__name__)
 
 
 
-def exclude_self_key(*args: Sequence[Hashable], **kwargs: frozenset[Hashable]):
-    return cachetools.keys.hashkey(*args[1:], **kwargs)
-
 class RenderingClient(ABC):
     """Rendering base client."""
-    def __init__(self, route: str) -> None:
+    def __init__(
+        self,
+        route: str,
+        cache: RenderCache=render_cache,
+        assets: RendererAssetStore=renderer_assets,
+        pool: RendererPool=renderer_pool
+    ) -> None:
         """
         :param route: The rendering server route to send requests to.
+        :param cache: The cache renders are shared through.
+        :param assets: The store sending skins and backgrounds by reference.
+        :param pool: The rendering server replicas to send requests to.
         """
         self._route: str = route.removeprefix("/")
+        self._cache = cache
+        self._assets = assets
+        self._pool = pool
 
         self.mode: Mode | None = None
 
@@ -50,28 +58,67 @@ class RenderingClient(ABC):
         return load_background_for_user(discord_user_id, render_name, player_uuid)
 
 
-    async def _make_request(
-        self, placeholder_values: PlaceholderValues, background_image: bytes | None, size: Size
+    async def _request_from(
+        self,
+        host: str,
+        placeholder_values: PlaceholderValues,
+        background_image: bytes | None,
+        size: Size
     ) -> bytes:
+        session = http_sessions.session("renderer")
+        url = f"{host}/{self._route}"
+
+        if self._assets.enabled:
+            refs = await self._assets.references(
+                session, host, placeholder_values, background_image)
+            formdata = placeholder_values.build_form_data(background_image, size, refs)
+
+            async with session.post(url, data=formdata) as res:
+                if res.status != MISSING_ASSET_STATUS:
+                    res.raise_for_status()
+                    return await res.content.read()
+
+            # The server lost some assets, send every asset inline instead
+            logger.info("Rendering server is missing referenced assets, inlining them.")
+            self._assets.forget(host, refs)
+
         formdata = placeholder_values.build_form_data(background_image, size)
 
-        async with ClientSession(timeout=ClientTimeout(total=10)) as session:
-            res = await session.post(
-                f"{os.getenv('RENDERER_HOSTNAME')}/{self._route}", data=formdata
-            )
+        async with session.post(url, data=formdata) as res:
             res.raise_for_status()
 
             render_bytes = await res.content.read()
 
         return render_bytes
 
+    async def _make_request(
+        self,
+        placeholder_values: PlaceholderValues,
+        background_image: bytes | None,
+        size: Size,
+        speculative: bool = False
+    ) -> bytes:
+        return await self._pool.request(
+            lambda host: self._request_from(host, placeholder_values, background_image, size),
+            speculative
+        )
+
 
-    @cached(cache=TTLCache(ttl=600, maxsize=20), key=exclude_self_key)
     async def _make_request_with_cache(
-        self, placeholder_values: PlaceholderValues, background_image: bytes | None, size: Size
+        self,
+        placeholder_values: PlaceholderValues,
+        background_image: bytes | None,
+        size: Size,
+        speculative: bool = False
     ) -> bytes:
-        logger.debug("LRU renderer cache miss.")
-        return await self._make_request(placeholder_values, background_image, size)
+        key = self._cache.key(self._route, size, placeholder_values, background_image)
+
+        async def render() -> bytes:
+            logger.debug("Render cache miss.")
+            return await self._make_request(
+                placeholder_values, background_image, size, speculative)
+
+        return await self._cache.get_or_render(key, render)
 
     async def render(
         self,
@@ -93,6 +140,83 @@ class RenderingClient(ABC):
             self.placeholder_values(), background_image, size
         )
 
+    async def render_many(
+        self,
+        renders: Sequence[tuple[PlaceholderValues, Size]],
+        background_image: bytes | None = None,
+        bypass_cache: bool = False,
+        concurrency: int = 4,
+        speculative: bool = False
+    ) -> list[bytes]:
+        """
+        Render many sets of placeholder values sharing a background image.
+
+        :param renders: The placeholder values and size of each render.
+        :param background_image: The background image to use.
+        :param bypass_cache: Bypass the cache and make new requests.
+        :param concurrency: The maximum amount of requests in flight at once.
+        :param speculative: Whether the renders are made ahead of being \
+            needed, see `RendererPool.request`.
+        :return list[bytes]: The rendered images, in order.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def render(placeholder_values: PlaceholderValues, size: Size) -> bytes:
+            async with semaphore:
+                if bypass_cache:
+                    return await self._make_request(
+                        placeholder_values, background_image, size, speculative)
+
+                return await self._make_request_with_cache(
+                    placeholder_values, background_image, size, speculative)
+
+        return list(await asyncio.gather(*(
+            render(placeholder_values, size) for placeholder_values, size in renders)))
+
+    def placeholder_values_for_modes(self, modes: Sequence[Mode]) -> list[PlaceholderValues]:
+        """
+        Get the placeholder values of each mode, leaving `mode` unchanged.
+
+        :param modes: The modes to get the placeholder values of.
+        """
+        original_mode = self.mode
+
+        try:
+            placeholder_values = []
+            for mode in modes:
+                self.mode = mode
+                placeholder_values.append(self.placeholder_values())
+        finally:
+            self.mode = original_mode
+
+        return placeholder_values
+
+    async def render_modes(
+        self,
+        modes: Sequence[Mode],
+        background_image: bytes | None = None,
+        size: Size="regular",
+        bypass_cache: bool = False,
+        speculative: bool = False
+    ) -> list[bytes]:
+        """
+        Render the placeholder values of every mode.
+
+        :param modes: The modes to render.
+        :param background_image: The background image to use.
+        :param size: The size of the images to render.
+        :param bypass_cache: Bypass the cache and make new requests.
+        :param speculative: Whether the renders are made ahead of being \
+            needed, see `RendererPool.request`.
+        :return list[bytes]: The rendered image of each mode, in order.
+        """
+        renders = [
+            (placeholder_values, size)
+            for placeholder_values in self.placeholder_values_for_modes(modes)
+        ]
+        return await self.render_many(
+            renders, background_image, bypass_cache, speculative=speculative)
+
     async def render_to_buffer(
         self, background_image: bytes | None = None, size: Size="regular", bypass_cache: bool = False
     ) -> BytesIO:
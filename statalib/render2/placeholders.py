@@ -1,15 +1,15 @@
 """Placeholder values for rendering."""
 
-import json
 import typing
 from base64 import b64encode
 from collections.abc import Mapping
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, UTC
 from typing_extensions import override
 
 import aiohttp
 
+from ..codec import dumps
 from ..hypixel.leveling import LevelProgressionTuple
 from ..hypixel.ranks import PlayerRank
 from ..fmt import ordinal
@@ -19,6 +19,9 @@ from ..render import Prestige
 
 Size = typing.Literal["small", "regular", "large"]
 
+BACKGROUND_ASSET_KEY = "background_image"
+"The asset reference key of the background image, see `build_form_data`."
+
 @dataclass(unsafe_hash=True)
 class TSpan:
     """Rich text span."""
@@ -45,6 +48,8 @@ class PlaceholderValues:
     """The shape related placeholder values."""
     text: dict[str, str | TSpan | list[TSpan]]
     """The text related placeholder values."""
+    inline_images: dict[str, bytes] = field(default_factory=dict, compare=False)
+    """The raw bytes of the images inlined as `data:` URIs, by placeholder key."""
 
     @staticmethod
     def new(
@@ -111,6 +116,7 @@ class PlaceholderValues:
         """
         skin_base64 = b64encode(skin_model_img).decode("utf-8")
         self.images[f"{placeholder_key}#href"] = f"data:image/png;base64,{skin_base64}"
+        self.inline_images[f"{placeholder_key}#href"] = skin_model_img
 
     def add_footer_text(self) -> None:
         """Add the standard footer text placeholder value."""
@@ -185,24 +191,40 @@ class PlaceholderValues:
 
 
     def build_form_data(
-        self, background_image: bytes | None, size: Size="regular"
+        self,
+        background_image: bytes | None,
+        size: Size="regular",
+        asset_refs: Mapping[str, str] | None=None
     ) -> aiohttp.FormData:
         """
         Build the form data for the request.
 
         :param background_image: The background image to use.
         :param size: The size of the image to render.
+        :param asset_refs: References to assets the rendering server holds, \
+            sent instead of the assets themselves. Keyed by image placeholder \
+            key, with the background keyed by `BACKGROUND_ASSET_KEY`.
         """
+        asset_refs = asset_refs or {}
+        placeholder_values = self.as_dict()
+
+        image_refs = {k: f"asset:{ref}" for k, ref in asset_refs.items() if k in self.images}
+        if image_refs:
+            placeholder_values["images"] = {**self.images, **image_refs}
+
         data = aiohttp.FormData()
         data.add_field("scale", size, filename="blob", content_type="application/json")
         data.add_field(
             "placeholder_values",
-            json.dumps(self.as_dict()).encode("utf-8"),
+            dumps(placeholder_values),
             filename="blob",
             content_type="application/json",
         )
 
-        if background_image is not None:
+        background_ref = asset_refs.get(BACKGROUND_ASSET_KEY)
+        if background_ref is not None:
+            data.add_field("background_image_ref", background_ref)
+        elif background_image is not None:
             data.add_field(
                 "background_image",
                 background_image,
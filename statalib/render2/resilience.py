@@ -0,0 +1,452 @@
+"""
+Health tracking and routing of requests across rendering server replicas.
+
+Each replica (one per `RENDERER_HOSTNAME`, comma separated) tracks its
+latencies and failures:
+
+- Requests time out after an adaptive timeout derived from the replica's
+  observed p99 latency, rather than a fixed timeout.
+- A circuit breaker stops sending requests to a failing replica for a
+  while, so renders fail fast instead of waiting out timeouts.
+- Requests go to the available replica with the fewest requests in flight.
+- Optionally, a request still running after the replica's p95 latency is
+  hedged by sending it to a second replica, the first response wins.
+- Speculative requests (pre-renders nobody is waiting on yet) only go to
+  healthy replicas, at a lower concurrency, and never trip the breakers.
+
+`RendererUnavailableError` is raised once no replica is available.
+"""
+
+import asyncio
+import bisect
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Literal, TypeVar
+
+from aiohttp import ClientError, ClientResponseError
+
+from ..cfg import config
+from ..errors import RendererUnavailableError
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+DEFAULT_RENDERER_RESILIENCE_SETTINGS = {
+    "min_timeout": 1,  # Seconds
+    "max_timeout": 10,  # Seconds, used until enough latencies are observed
+    "timeout_multiplier": 2,  # Of the observed p99 latency
+    "failure_threshold": 5,  # Consecutive failures opening the breaker
+    "reset_timeout": 30,  # Seconds the breaker stays open for
+    "hedge": False,
+    "max_attempts": 2,  # Replicas tried per request
+    "speculative_concurrency": 2  # Speculative requests in flight at once
+}
+"Fallback renderer resilience settings used when `global.renderer_resilience` is not configured."
+
+
+def _resilience_settings() -> dict:
+    try:
+        configured: dict = config("global.renderer_resilience") or {}
+    except KeyError:
+        configured = {}
+
+    return {**DEFAULT_RENDERER_RESILIENCE_SETTINGS, **configured}
+
+
+class LatencyHistogram:
+    """
+    Cumulative latency histogram for dashboards, along with a window of
+    recent latencies that percentiles are estimated from.
+    """
+    BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+    "The upper bounds (in seconds) of the buckets, the last bucket is unbounded."
+
+    def __init__(self, window: int=256) -> None:
+        """
+        :param window: The amount of recent latencies percentiles are \
+            estimated from.
+        """
+        self.counts = [0] * (len(self.BUCKETS) + 1)
+        self.total = 0.0
+        self._recent: deque[float] = deque(maxlen=window)
+
+    @property
+    def samples(self) -> int:
+        """The amount of recent latencies held."""
+        return len(self._recent)
+
+    def observe(self, latency: float) -> None:
+        """
+        Record a latency.
+
+        :param latency: The latency in seconds.
+        """
+        self.counts[bisect.bisect_left(self.BUCKETS, latency)] += 1
+        self.total += latency
+        self._recent.append(latency)
+
+    def percentile(self, q: float) -> float | None:
+        """
+        Estimate a percentile of the recent latencies.
+
+        :param q: The percentile, between 0 and 100.
+        :return float | None: The latency in seconds, or `None` without samples.
+        """
+        if not self._recent:
+            return None
+
+        ordered = sorted(self._recent)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+    def buckets(self) -> dict[str, int]:
+        """Get the count of each bucket, by upper bound."""
+        bounds = [f"{bound:g}" for bound in self.BUCKETS] + ["+Inf"]
+        return dict(zip(bounds, self.counts))
+
+
+BreakerState = Literal["closed", "open", "half_open"]
+
+
+class CircuitBreaker:
+    """
+    Opens after consecutive failures, rejecting requests until the reset
+    timeout passes. A single probe request is then let through, closing
+    the breaker if it succeeds or opening it again if it fails.
+    """
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        """
+        :param failure_threshold: The consecutive failures opening the breaker.
+        :param reset_timeout: How long (in seconds) the breaker stays open.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.failures = 0
+        "The amount of consecutive failures."
+        self.opened_at: float | None = None
+        "The monotonic time the breaker was last opened at."
+        self._probing = False
+
+    @property
+    def state(self) -> BreakerState:
+        """The current state of the breaker."""
+        if self.opened_at is None:
+            return "closed"
+
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+
+        return "open"
+
+    def allow(self) -> bool:
+        """Whether a request may be sent, claiming the probe if half open."""
+        state = self.state
+
+        if state == "closed":
+            return True
+
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+
+        return False
+
+    def available(self) -> bool:
+        """Whether a request could be sent, without claiming the probe."""
+        state = self.state
+        return state == "closed" or (state == "half_open" and not self._probing)
+
+    @property
+    def probing(self) -> bool:
+        """Whether the probe of a half open breaker is in flight."""
+        return self._probing
+
+    def release(self) -> None:
+        """Release a claimed probe without recording an outcome."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        """Record a successful request, closing the breaker."""
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Record a failed request, opening the breaker past the threshold."""
+        self.failures += 1
+
+        if self._probing or self.failures >= self.failure_threshold:
+            if self.opened_at is None or self._probing:
+                logger.warning(
+                    f"Renderer circuit breaker opened after {self.failures} failures")
+            self.opened_at = time.monotonic()
+
+        self._probing = False
+
+
+@dataclass
+class ReplicaMetrics:
+    """A snapshot of the health of a rendering server replica."""
+    host: str
+    state: BreakerState
+    "The state of the replica's circuit breaker."
+    in_flight: int
+    "The amount of requests currently in flight."
+    requests: int
+    "The total amount of requests sent."
+    failures: int
+    "The total amount of failed requests."
+    hedges: int
+    "The amount of requests hedged to the replica."
+    p50: float | None
+    "The median latency (in seconds) of recent requests."
+    p99: float | None
+    "The p99 latency (in seconds) of recent requests."
+    timeout: float
+    "The current adaptive timeout (in seconds)."
+    latency_buckets: dict[str, int]
+    "The cumulative latency histogram, by bucket upper bound."
+
+
+class RendererReplica:
+    """A rendering server replica and its health."""
+    def __init__(self, host: str, settings: dict) -> None:
+        self.host = host
+        self.settings = settings
+
+        self.latencies = LatencyHistogram()
+        self.breaker = CircuitBreaker(settings["failure_threshold"], settings["reset_timeout"])
+
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.hedges = 0
+
+    @property
+    def timeout(self) -> float:
+        """The adaptive timeout (in seconds) of requests to the replica."""
+        p99 = self.latencies.percentile(99)
+
+        # Too few samples to trust the p99 with
+        if p99 is None or self.latencies.samples < 20:
+            return self.settings["max_timeout"]
+
+        return min(
+            self.settings["max_timeout"],
+            max(self.settings["min_timeout"], p99 * self.settings["timeout_multiplier"])
+        )
+
+    @property
+    def hedge_delay(self) -> float:
+        """How long (in seconds) to wait for a response before hedging."""
+        p95 = self.latencies.percentile(95)
+        return self.timeout / 2 if p95 is None else p95
+
+    def metrics(self) -> ReplicaMetrics:
+        """Get a snapshot of the replica's health."""
+        return ReplicaMetrics(
+            host=self.host,
+            state=self.breaker.state,
+            in_flight=self.in_flight,
+            requests=self.requests,
+            failures=self.failures,
+            hedges=self.hedges,
+            p50=self.latencies.percentile(50),
+            p99=self.latencies.percentile(99),
+            timeout=self.timeout,
+            latency_buckets=self.latencies.buckets()
+        )
+
+
+def _is_service_failure(exc: BaseException) -> bool:
+    # Client errors (4xx) mean the request was bad, not that the replica is unhealthy
+    if isinstance(exc, ClientResponseError):
+        return exc.status >= 500 or exc.status == 429
+
+    return isinstance(exc, (ClientError, asyncio.TimeoutError, OSError))
+
+
+class RendererPool:
+    """Routes rendering requests across the rendering server replicas."""
+    def __init__(
+        self,
+        hosts: list[str] | None=None,
+        settings: dict | None=None
+    ) -> None:
+        """
+        :param hosts: The replica hosts, defaults to the comma separated \
+            `RENDERER_HOSTNAME` environment variable.
+        :param settings: The resilience settings, defaults to the configured \
+            settings.
+        """
+        self._hosts = hosts
+        self.settings = {**DEFAULT_RENDERER_RESILIENCE_SETTINGS, **(settings or {})}
+        self._replicas: dict[str, RendererReplica] = {}
+        self._speculative = asyncio.Semaphore(self.settings["speculative_concurrency"])
+
+    @classmethod
+    def from_config(cls) -> 'RendererPool':
+        """Create a pool using the configured settings."""
+        return cls(settings=_resilience_settings())
+
+    @property
+    def replicas(self) -> list[RendererReplica]:
+        """The replicas of the pool."""
+        hosts = self._hosts
+        if hosts is None:
+            hosts = [
+                host.strip() for host in os.getenv("RENDERER_HOSTNAME", "").split(",")
+                if host.strip()
+            ]
+
+        return [
+            self._replicas.setdefault(host, RendererReplica(host, self.settings))
+            for host in hosts
+        ]
+
+    def _choose(
+        self, exclude: list[RendererReplica], speculative: bool=False
+    ) -> RendererReplica | None:
+        candidates = [
+            replica for replica in self.replicas
+            if replica not in exclude and (
+                replica.breaker.state == "closed" if speculative
+                else replica.breaker.available()
+            )
+        ]
+
+        # Least loaded first, then fastest
+        for replica in sorted(
+            candidates,
+            key=lambda r: (r.in_flight, r.latencies.percentile(50) or 0)
+        ):
+            # Speculative requests never claim the probe of a half open breaker
+            if speculative or replica.breaker.allow():
+                return replica
+
+        return None
+
+    async def _attempt(
+        self,
+        replica: RendererReplica,
+        send: Callable[[str], Awaitable[T]],
+        speculative: bool=False
+    ) -> T:
+        replica.in_flight += 1
+        replica.requests += 1
+        started_at = time.perf_counter()
+
+        # The probe gets the full timeout, a replica which slowed down would
+        # otherwise keep timing out at a timeout adapted to its old latency
+        timeout = self.settings["max_timeout"] if replica.breaker.probing else replica.timeout
+
+        # Speculative requests leave the breaker to the requests users wait on
+        breaker = None if speculative else replica.breaker
+
+        try:
+            result = await asyncio.wait_for(send(replica.host), timeout)
+        except asyncio.TimeoutError:
+            # Observed so the adaptive timeout grows with the replica's latency
+            replica.latencies.observe(time.perf_counter() - started_at)
+            replica.failures += 1
+            if breaker is not None:
+                breaker.record_failure()
+            raise
+        except asyncio.CancelledError:
+            # Lost a hedged race, the replica isn't at fault
+            if breaker is not None:
+                breaker.release()
+            raise
+        except BaseException as exc:
+            if _is_service_failure(exc):
+                replica.failures += 1
+                if breaker is not None:
+                    breaker.record_failure()
+            elif breaker is not None:
+                breaker.record_success()
+            raise
+        else:
+            replica.latencies.observe(time.perf_counter() - started_at)
+            if breaker is not None:
+                breaker.record_success()
+            return result
+        finally:
+            replica.in_flight -= 1
+
+    async def request(
+        self, send: Callable[[str], Awaitable[T]], speculative: bool=False
+    ) -> T:
+        """
+        Send a request to the healthiest replica, failing over to (or
+        hedging with) other replicas.
+
+        :param send: Sends the request to the given host.
+        :param speculative: Whether nobody is waiting on the request yet, \
+            such as a pre-render. Speculative requests are limited to the \
+            `speculative_concurrency` setting, aren't hedged, and don't \
+            open or close the breakers of the replicas.
+        :raises RendererUnavailableError: No replica could handle the request.
+        """
+        if speculative:
+            async with self._speculative:
+                return await self._request(send, speculative=True)
+
+        return await self._request(send)
+
+    async def _request(
+        self, send: Callable[[str], Awaitable[T]], speculative: bool=False
+    ) -> T:
+        tried: list[RendererReplica] = []
+        last_exc: BaseException | None = None
+
+        while len(tried) < self.settings["max_attempts"]:
+            replica = self._choose(tried, speculative)
+            if replica is None:
+                break
+
+            tried.append(replica)
+            attempts = {asyncio.ensure_future(self._attempt(replica, send, speculative))}
+
+            try:
+                if self.settings["hedge"] and not speculative:
+                    done, _ = await asyncio.wait(attempts, timeout=replica.hedge_delay)
+
+                    hedge = None if done else self._choose(tried)
+                    if hedge is not None:
+                        tried.append(hedge)
+                        hedge.hedges += 1
+                        attempts.add(asyncio.ensure_future(self._attempt(hedge, send)))
+
+                while attempts:
+                    done, attempts = await asyncio.wait(
+                        attempts, return_when=asyncio.FIRST_COMPLETED)
+
+                    for attempt in done:
+                        if attempt.exception() is None:
+                            return attempt.result()
+
+                        last_exc = attempt.exception()
+                        if not _is_service_failure(last_exc):
+                            raise last_exc
+            finally:
+                for attempt in attempts:
+                    attempt.cancel()
+
+        raise RendererUnavailableError(
+            "No rendering server is available" if last_exc is None
+            else f"Rendering servers failed: {last_exc!r}"
+        ) from last_exc
+
+    def metrics(self) -> list[ReplicaMetrics]:
+        """Get a snapshot of the health of every replica."""
+        return [replica.metrics() for replica in self.replicas]
+
+
+renderer_pool = RendererPool.from_config()
+"The replicas every `RenderingClient` renders with."
@@ -0,0 +1,158 @@
+"""
+Materialized reset slots used to schedule automatic tracker resets.
+
+A reset slot is the UTC minute of day (0-1439) that a tracked player's
+trackers are reset at. Slots are derived from the player's default reset
+time, or the configured reset time of a linked user, and are refreshed
+whenever one of those inputs changes, so that the due players of a minute
+can be found with a single indexed lookup.
+"""
+
+from datetime import datetime
+from typing import Iterable
+
+from .db import ensure_cursor, Cursor
+
+
+# Integer (minute) version of the reset time formula
+# `reset_hour - timezone + reset_minute / 60`, shifted by a day to account
+# for negative offsets. Negative results never match any time of day.
+_RESET_MINUTE_EXPR = """
+  COALESCE(
+    (configured_reset_times.reset_hour - configured_reset_times.timezone) * 60
+      + configured_reset_times.reset_minute,
+    (default_reset_times.reset_hour - default_reset_times.timezone) * 60
+      + default_reset_times.reset_minute,
+    0
+  ) + 1440
+"""
+
+_RESET_SLOTS_SELECT = f"""
+SELECT DISTINCT uuid, reset_minute % 1440 FROM (
+  SELECT rotational_info.uuid, {_RESET_MINUTE_EXPR} AS reset_minute
+  FROM rotational_info
+  LEFT JOIN linked_accounts
+    ON rotational_info.uuid = linked_accounts.uuid
+  LEFT JOIN configured_reset_times
+    ON linked_accounts.discord_id = configured_reset_times.discord_id
+  LEFT JOIN default_reset_times
+    ON rotational_info.uuid = default_reset_times.uuid
+  {{where}}
+)
+WHERE reset_minute >= 0
+"""
+
+
+def get_reset_slot(utc_now: datetime) -> int:
+    """
+    Get the reset slot (UTC minute of day) of a point in time.
+
+    :param utc_now: The UTC time to get the reset slot of.
+    """
+    return utc_now.hour * 60 + utc_now.minute
+
+
+@ensure_cursor
+def refresh_reset_slots(uuids: Iterable[str], *, cursor: Cursor=None) -> None:
+    """
+    Recalculate the reset slots of the given players. Must be called
+    whenever an input of a player's reset time changes.
+
+    :param uuids: The UUIDs of the players to recalculate.
+    """
+    uuids = list(set(filter(None, uuids)))
+    if not uuids:
+        return
+
+    question_marks = ", ".join("?"*len(uuids))
+
+    cursor.execute(f"DELETE FROM reset_slots WHERE uuid IN ({question_marks})", uuids)
+    cursor.execute(
+        "INSERT INTO reset_slots (uuid, reset_slot) " + _RESET_SLOTS_SELECT.format(
+            where=f"WHERE rotational_info.uuid IN ({question_marks})"),
+        uuids
+    )
+
+
+@ensure_cursor
+def refresh_reset_slots_for_discord_id(discord_id: int, *, cursor: Cursor=None) -> None:
+    """
+    Recalculate the reset slots of the players linked to a Discord user.
+
+    :param discord_id: The Discord user ID of the respective user.
+    """
+    linked_uuids = cursor.execute(
+        "SELECT uuid FROM linked_accounts WHERE discord_id = ?", (discord_id,)
+    ).fetchall()
+
+    refresh_reset_slots([row[0] for row in linked_uuids], cursor=cursor)
+
+
+@ensure_cursor
+def rebuild_reset_slots(*, cursor: Cursor=None) -> None:
+    """Recalculate the reset slots of every tracked player."""
+    cursor.execute("DELETE FROM reset_slots")
+    cursor.execute(
+        "INSERT INTO reset_slots (uuid, reset_slot) " + _RESET_SLOTS_SELECT.format(where=""))
+
+
+_LEGACY_DUE_PLAYERS_QUERY = """
+WITH RECURSIVE Minutes(minute) AS (
+  SELECT 0 UNION ALL SELECT minute + 1 FROM Minutes WHERE minute < 1439
+),
+ResetTimes AS (
+  SELECT
+    rotational_info.uuid,
+    COALESCE(
+      configured_reset_times.reset_hour
+        - configured_reset_times.timezone
+            + configured_reset_times.reset_minute / 60.0,
+      default_reset_times.reset_hour
+        - default_reset_times.timezone
+        + default_reset_times.reset_minute / 60.0,
+      0
+    ) + 24 AS reset_time
+  FROM
+    rotational_info
+  LEFT JOIN linked_accounts
+    ON rotational_info.uuid = linked_accounts.uuid
+  LEFT JOIN configured_reset_times
+    ON linked_accounts.discord_id = configured_reset_times.discord_id
+  LEFT JOIN default_reset_times
+    ON rotational_info.uuid = default_reset_times.uuid
+)
+SELECT DISTINCT minute, uuid
+FROM ResetTimes, Minutes
+WHERE ROUND(reset_time - 24 * CAST(reset_time / 24 AS INTEGER), 3)
+  = ROUND(minute / 60 + (minute % 60) / 60.0, 3);
+"""
+
+
+@ensure_cursor
+def check_reset_slot_consistency(
+    *, cursor: Cursor=None
+) -> dict[int, tuple[set[str], set[str]]]:
+    """
+    Compare the materialized reset slots against the due players found by
+    the original per-minute reset time query, for every minute of the day.
+
+    :return dict: The mismatching slots mapped to a tuple of the players \
+        only due in the original query and the players only due by slot.
+    """
+    expected: dict[int, set[str]] = {}
+    for minute, uuid in cursor.execute(_LEGACY_DUE_PLAYERS_QUERY):
+        expected.setdefault(minute, set()).add(uuid)
+
+    actual: dict[int, set[str]] = {}
+    for minute, uuid in cursor.execute("SELECT reset_slot, uuid FROM reset_slots"):
+        actual.setdefault(minute, set()).add(uuid)
+
+    mismatches = {}
+    for minute in expected.keys() | actual.keys():
+        expected_uuids = expected.get(minute, set())
+        actual_uuids = actual.get(minute, set())
+
+        if expected_uuids != actual_uuids:
+            mismatches[minute] = (expected_uuids - actual_uuids, actual_uuids - expected_uuids)
+
+    return mismatches
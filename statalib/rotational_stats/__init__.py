@@ -16,7 +16,9 @@ from .reset_time import (
 from .lookback import get_max_lookback
 from .managers import RotationalStatsManager
 from .resetting import (
+    AutoResetCandidate,
     RotationalResetting,
+    get_due_auto_reset_candidates,
     has_auto_reset_access,
     reset_rotational_stats_if_whitelisted,
     async_reset_rotational_stats_if_whitelisted
@@ -34,7 +36,9 @@ __all__ = [
     'get_dynamic_reset_time',
     'get_max_lookback',
     'RotationalStatsManager',
+    'AutoResetCandidate',
     'RotationalResetting',
+    'get_due_auto_reset_candidates',
     'has_auto_reset_access',
     'reset_rotational_stats_if_whitelisted',
     'async_reset_rotational_stats_if_whitelisted'
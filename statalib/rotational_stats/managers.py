@@ -9,6 +9,7 @@ from ._utils import get_bedwars_data
 from .reset_time import DefaultResetTimeManager, ResetTime
 from ..aliases import PlayerUUID, HypixelData
 from ..db import ensure_cursor, Cursor
+from ..reset_slots import refresh_reset_slots
 from ..stats_snapshot import BedwarsStatsSnapshot, get_snapshot_data
 
 
@@ -106,10 +107,8 @@ class RotationalStatsManager:
         current_bedwars_data = get_bedwars_data(current_hypixel_data)
 
         # Add tracked rotation data to list
-        bedwars_data_list: list[int] = [
-            current_bedwars_data.get(key, 0)
-            for key in BedwarsStatsSnapshot.keys(include_snapshot_id=False)
-        ]
+        bedwars_data_list = BedwarsStatsSnapshot.from_bedwars_data(
+            current_bedwars_data).as_tuple(include_snapshot_id=False)
 
         # Generate set clause
         stat_keys = BedwarsStatsSnapshot.keys(include_snapshot_id=False)
@@ -135,3 +134,6 @@ class RotationalStatsManager:
                 f"(snapshot_id, {set_clause}) VALUES (?, {question_marks})",
                 (snapshot_id, *bedwars_data_list)
             )
+
+        # The player is now tracked, so a reset slot can be assigned
+        refresh_reset_slots([self._uuid], cursor=cursor)
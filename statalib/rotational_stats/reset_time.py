@@ -7,6 +7,7 @@ from dataclasses import dataclass
 from ..aliases import PlayerUUID
 from ..common import MISSING
 from ..db import ensure_cursor, Cursor
+from ..reset_slots import refresh_reset_slots, refresh_reset_slots_for_discord_id
 from ..accounts.linking import uuid_to_discord_id
 from .. import fmt
 
@@ -66,6 +67,9 @@ class _ResetTimeManagerBase(ABC):
     @abstractmethod
     def _delete_reset_time_data(self, cursor: Cursor) -> None: ...
 
+    @abstractmethod
+    def _refresh_reset_slots(self, cursor: Cursor) -> None: ...
+
 
     @ensure_cursor
     def update(self, new_value: ResetTime, *, cursor: Cursor=None) -> None:
@@ -109,6 +113,8 @@ class _ResetTimeManagerBase(ABC):
                 values_to_update.get("reset_minute", self.__random_default_minute())
             )
 
+        self._refresh_reset_slots(cursor)
+
 
     @ensure_cursor
     def get(self, *, cursor: Cursor=None) -> ResetTime | None:
@@ -127,6 +133,7 @@ class _ResetTimeManagerBase(ABC):
     def remove(self, *, cursor: Cursor=None) -> None:
         """Remove the user's reset time data."""
         self._delete_reset_time_data(cursor)
+        self._refresh_reset_slots(cursor)
 
 
 class ConfiguredResetTimeManager(_ResetTimeManagerBase):
@@ -167,6 +174,9 @@ class ConfiguredResetTimeManager(_ResetTimeManagerBase):
             "DELETE FROM configured_reset_times WHERE discord_id = ?",
             (self._discord_id,))
 
+    def _refresh_reset_slots(self, cursor: Cursor) -> None:
+        refresh_reset_slots_for_discord_id(self._discord_id, cursor=cursor)
+
 
 class DefaultResetTimeManager(_ResetTimeManagerBase):
     """Reset time manager for default reset times."""
@@ -205,6 +215,9 @@ class DefaultResetTimeManager(_ResetTimeManagerBase):
         cursor.execute(
             "DELETE FROM default_reset_times WHERE uuid = ?", (self._player_uuid,))
 
+    def _refresh_reset_slots(self, cursor: Cursor) -> None:
+        refresh_reset_slots([self._player_uuid], cursor=cursor)
+
 
 @ensure_cursor
 def get_dynamic_reset_time(
@@ -2,6 +2,7 @@
 
 import logging
 import calendar
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from uuid import uuid4
 
@@ -16,12 +17,16 @@ from ._types import (
 )
 from ._utils import get_bedwars_data
 from .managers import RotationalStatsManager
+from .reset_time import ResetTime
 from ..aliases import BedwarsData, PlayerUUID, HypixelData
 from ..hypixel.leveling import Leveling
 from ..cfg import config
 from ..db import ensure_cursor, Cursor
+from ..reset_slots import get_reset_slot
 from ..accounts.linking import uuid_to_discord_id
 from ..accounts.permissions import AccountPermissions
+from ..accounts.subscriptions import Subscription
+from ..fmt import comma_separated_to_list
 
 
 logger = logging.getLogger(__name__)
@@ -70,6 +75,117 @@ def has_auto_reset_access(
     return True
 
 
+"""
+This query is designed to find players in the `rotational_info` table whose
+trackers are due to be reset at a given time of day, along with everything
+needed to decide if they have access to automatic resetting.
+
+The query uses data from the `configured_reset_times` table if it is
+available for the linked Discord ID; otherwise, it uses data from
+the `default_reset_times` table. If neither exists, the reset time
+defaults to 0.
+
+The formula `reset_hour - timezone + (reset_minute / 60)` calculates the hour
+of day as a decimal, so it would be 13.5 for 1:30pm UTC 0. The query checks if
+the formula result equals the passed time of day, accounting for the 24-hour
+wrap-around, ensuring that values like 24 are treated as 0.
+"""
+_DUE_AUTO_RESETS_QUERY = """
+SELECT
+  reset_slots.uuid,
+  linked_accounts.discord_id,
+  accounts.permissions,
+  subscriptions_active.package,
+  subscriptions_active.expires,
+  COALESCE(configured_reset_times.timezone, default_reset_times.timezone, 0),
+  COALESCE(configured_reset_times.reset_hour, default_reset_times.reset_hour, 0),
+  COALESCE(configured_reset_times.reset_minute, default_reset_times.reset_minute, 0)
+FROM
+  reset_slots
+LEFT JOIN linked_accounts
+  ON reset_slots.uuid = linked_accounts.uuid
+LEFT JOIN accounts
+  ON linked_accounts.discord_id = accounts.discord_id
+LEFT JOIN subscriptions_active
+  ON linked_accounts.discord_id = subscriptions_active.discord_id
+LEFT JOIN configured_reset_times
+  ON linked_accounts.discord_id = configured_reset_times.discord_id
+LEFT JOIN default_reset_times
+  ON reset_slots.uuid = default_reset_times.uuid
+WHERE reset_slots.reset_slot = ?
+GROUP BY reset_slots.uuid;
+"""
+
+
+@dataclass
+class AutoResetCandidate:
+    """A player whose trackers are due to be automatically reset."""
+    uuid: PlayerUUID
+    "The UUID of the player."
+    reset_time: ResetTime
+    "The dynamic reset time of the player."
+
+
+def _candidate_has_access(
+    row: tuple,
+    auto_reset_config: dict[str, bool | list[str]],
+    cursor: Cursor
+) -> bool:
+    uuid, discord_id, permissions, package, expires = row[:5]
+
+    if not auto_reset_config.get('whitelist_only'):
+        return True
+
+    if uuid in auto_reset_config.get('uuid_whitelist', []):
+        return True
+
+    if discord_id is None:
+        return False
+
+    # Expired subscriptions need updating, leave that to the regular check
+    if expires is not None and expires < datetime.now(UTC).timestamp():
+        return has_auto_reset_access(uuid, auto_reset_config, cursor=cursor)
+
+    user_perms = set(comma_separated_to_list(permissions or ""))
+    user_perms.update(Subscription.get_package_permissions(
+        package or Subscription.default().package))
+
+    if '*' in user_perms and auto_reset_config.get('allow_star_permission', True):
+        return True
+
+    return bool(set(auto_reset_config.get('permission_whitelist', [])) & user_perms)
+
+
+@ensure_cursor
+def get_due_auto_reset_candidates(
+    utc_now: datetime,
+    auto_reset_config: dict[str, bool | list[str]] | None=None,
+    *, cursor: Cursor=None
+) -> list[AutoResetCandidate]:
+    """
+    Get every player with automatic reset access whose trackers are due to
+    be reset at the given time, resolving access and reset times in bulk.
+    Due players are looked up by their materialized reset slot.
+    Equivalent to `has_auto_reset_access` and `get_dynamic_reset_time` for
+    each due player.
+
+    :param utc_now: The current UTC time.
+    :param auto_reset_config: A custom auto reset configuration that should be \
+        respected, otherwise the configured one will be used.
+    :return list: The players that are due to be reset.
+    """
+    if auto_reset_config is None:
+        auto_reset_config = config('apps.bot.tracker_resetting.automatic') or {}
+
+    rows = cursor.execute(
+        _DUE_AUTO_RESETS_QUERY, (get_reset_slot(utc_now),)).fetchall()
+
+    return [
+        AutoResetCandidate(row[0], ResetTime(*row[5:8]))
+        for row in rows if _candidate_has_access(row, auto_reset_config, cursor)
+    ]
+
+
 class RotationalResetting:
     """Class to manage rotational resetting."""
     def __init__(self, uuid: str) -> None:
@@ -87,25 +203,11 @@ class RotationalResetting:
         current_hypixel_data: HypixelData
     ) -> tuple:
         """Calculate the cumulative difference between current and old data."""
-        # Get player bedwars data
-        current_bedwars_data = get_bedwars_data(current_hypixel_data)
-
-        rotational_data_dict = current_rotational_data.data.as_dict(
-            include_snapshot_id=False)
-
-        # Map required data
-        current_bedwars_data_filtered = {
-            k: current_bedwars_data.get(k, 0) for k in rotational_data_dict.keys()
-        }
-
-        # Calculate the differnce between current and old
-        calculated_values = [
-            current - old  # Difference
-            for current, old
-            in zip(current_bedwars_data_filtered.values(), rotational_data_dict.values())
-        ]
+        current_snapshot = BedwarsStatsSnapshot.from_bedwars_data(
+            get_bedwars_data(current_hypixel_data))
 
-        return calculated_values
+        difference = current_snapshot - current_rotational_data.data
+        return difference.as_tuple(include_snapshot_id=False)
 
 
     @ensure_cursor
@@ -179,11 +281,7 @@ class RotationalResetting:
             (current_hypixel_data.get("player") or {}).get("stats", {}).get("Bedwars", {})
         )
 
-        # Create dictionary of session data
-        session_data = {
-            k: hypixel_bedwars_data.get(k, 0) for k in BedwarsStatsSnapshot.keys(False)
-        }
-        snapshot = BedwarsStatsSnapshot(snapshot_id=None, **session_data)
+        snapshot = BedwarsStatsSnapshot.from_bedwars_data(hypixel_bedwars_data)
 
         self.refresh_rotational_data_with_snapshot(rotation_type, snapshot, cursor=cursor)
 
@@ -73,7 +73,7 @@ class SessionManager:
                 f"Snapshot data missing for snapshot ID '{snapshot_id}'"
             )
 
-        session_snapshot_data = BedwarsStatsSnapshot(*session_data)
+        session_snapshot_data = BedwarsStatsSnapshot.from_row(session_data)
         return BedwarsSession(session_info_dict, session_data=session_snapshot_data)
 
     @ensure_cursor
@@ -90,11 +90,8 @@ class SessionManager:
             (hypixel_data.get("player") or {}).get("stats", {}).get("Bedwars", {})
         )
 
-        # Create dictionary of session data
-        session_data = {
-            k: hypixel_bedwars_data.get(k, 0) for k in BedwarsStatsSnapshot.keys(False)
-        }
-        snapshot = BedwarsStatsSnapshot(snapshot_id=uuid4().hex, **session_data)
+        snapshot = BedwarsStatsSnapshot.from_bedwars_data(
+            hypixel_bedwars_data, snapshot_id=uuid4().hex)
 
         self.create_session_from_snapshot(session_id, snapshot, cursor=cursor)
 
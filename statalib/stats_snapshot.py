@@ -1,14 +1,24 @@
 """Bedwars stats snapshot dataclass and related functionality."""
 
-from dataclasses import dataclass
 import sqlite3
 
+import numpy as np
+
+from .common import Mode
 from .db import ensure_cursor
 
 
-@dataclass
 class BedwarsStatsSnapshot:
-    """Bedwars stats snapshot dataclass."""
+    """
+    Bedwars stats snapshot backed by a fixed layout int64 vector.
+
+    Stats are accessed as attributes (`snapshot.wins_bedwars`) and are
+    stored in the order of `BedwarsStatsSnapshot.keys(False)`. Snapshots
+    can be subtracted from each other (`current - old`) in a single
+    vectorized operation.
+    """
+    __slots__ = ("snapshot_id", "_values")
+
     snapshot_id: str
     Experience: int  # pylint: disable=invalid-name
     wins_bedwars: int
@@ -72,47 +82,225 @@ class BedwarsStatsSnapshot:
     four_four_items_purchased_bedwars: int
     two_four_items_purchased_bedwars: int
 
+    def __init__(self, snapshot_id: str | None, *stats: int, **named_stats: int) -> None:
+        """
+        Initialize the snapshot, stats can be passed positionally in the
+        order of `BedwarsStatsSnapshot.keys(False)` and / or by name.
+
+        :param snapshot_id: The ID of the snapshot.
+        """
+        if len(stats) > len(_STAT_KEYS):
+            raise TypeError(
+                f"Expected at most {len(_STAT_KEYS)} stats, got {len(stats)}")
+
+        values = list(stats)
+        for key in _STAT_KEYS[len(stats):]:
+            try:
+                values.append(named_stats.pop(key))
+            except KeyError:
+                raise TypeError(f"Missing stat: '{key}'") from None
+
+        if named_stats:
+            raise TypeError(f"Unexpected stats: {', '.join(named_stats)}")
+
+        self.snapshot_id = snapshot_id
+        self._values = np.fromiter(
+            (value or 0 for value in values), dtype=np.int64, count=len(_STAT_KEYS))
+
+    @classmethod
+    def from_vector(
+        cls, snapshot_id: str | None, values: np.ndarray
+    ) -> 'BedwarsStatsSnapshot':
+        """
+        Create a snapshot from an int64 vector without copying it.
+
+        :param snapshot_id: The ID of the snapshot.
+        :param values: The stats in the order of `BedwarsStatsSnapshot.keys(False)`.
+        """
+        snapshot = cls.__new__(cls)
+        snapshot.snapshot_id = snapshot_id
+        snapshot._values = values
+        return snapshot
+
+    @classmethod
+    def from_row(cls, row: tuple) -> 'BedwarsStatsSnapshot':
+        """
+        Create a snapshot from a `SELECT * FROM bedwars_stats_snapshots` row.
+
+        :param row: The database row, starting with the snapshot ID.
+        """
+        return cls.from_vector(row[0], np.fromiter(
+            (value or 0 for value in row[1:]), dtype=np.int64, count=len(_STAT_KEYS)))
+
+    @classmethod
+    def from_bedwars_data(
+        cls, bedwars_data: dict, snapshot_id: str | None=None
+    ) -> 'BedwarsStatsSnapshot':
+        """
+        Create a snapshot from a player's Hypixel Bedwars stats.
+
+        :param bedwars_data: The `player.stats.Bedwars` Hypixel data.
+        :param snapshot_id: The ID of the snapshot.
+        """
+        return cls.from_vector(snapshot_id, np.fromiter(
+            map(bedwars_data.get, _STAT_KEYS, _ZEROS),
+            dtype=np.int64, count=len(_STAT_KEYS)))
+
+    @property
+    def vector(self) -> np.ndarray:
+        """The underlying int64 stats vector."""
+        return self._values
+
+    def get(self, key: str, default: int=0) -> int:
+        """
+        Get a stat by its key.
+
+        :param key: The key of the stat.
+        :param default: The value to return if the stat isn't tracked.
+        """
+        index = _KEY_INDEX.get(key)
+        if index is None:
+            return default
+        return int(self._values[index])
+
+    def mode_view(self, mode: Mode | str) -> 'SnapshotModeView':
+        """
+        Get a view of the stats of a single mode (solos, doubles, etc).
+
+        :param mode: The mode or mode prefix (`eight_one_`, etc) to view.
+        """
+        prefix = mode if isinstance(mode, str) else mode.prefix
+        return SnapshotModeView(self._values, prefix)
+
+    def __sub__(self, other: 'BedwarsStatsSnapshot') -> 'BedwarsStatsSnapshot':
+        if not isinstance(other, BedwarsStatsSnapshot):
+            return NotImplemented
+        return BedwarsStatsSnapshot.from_vector(None, self._values - other._values)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, BedwarsStatsSnapshot):
+            return NotImplemented
+        return self.snapshot_id == other.snapshot_id \
+            and bool(np.array_equal(self._values, other._values))
+
+    def __repr__(self) -> str:
+        stats = ", ".join(f"{key}={value}" for key, value in self.as_dict(False).items())
+        return f"BedwarsStatsSnapshot(snapshot_id={self.snapshot_id!r}, {stats})"
+
     def as_tuple(self, include_snapshot_id: bool=True) -> tuple:
         """
-        Convert the dataclass to a tuple.
+        Convert the snapshot to a tuple, ready to be used as a database row.
 
         :param include_snapshot_id: Whether or not to include the snapshot ID.
         :return tuple: A tuple containing the snapshot data.
         """
-        result = tuple(self.__dict__.values())
+        values = tuple(self._values.tolist())
 
-        if include_snapshot_id is False:
-            # Remove snapshot ID
-            result = result[1:]
-        return result
+        if include_snapshot_id:
+            return (self.snapshot_id, *values)
+        return values
 
     def as_dict(self, include_snapshot_id: bool=True) -> dict:
         """
-        Convert the dataclass to a dictionary.
+        Convert the snapshot to a dictionary.
 
         :param include_snapshot_id: Whether or not to include the snapshot ID.
         :return dict: A dictionary containing the snapshot data.
         """
-        result = self.__dict__
+        result = dict(zip(_STAT_KEYS, self._values.tolist()))
 
-        if include_snapshot_id is False:
-            result.pop("snapshot_id")
+        if include_snapshot_id:
+            return {"snapshot_id": self.snapshot_id, **result}
         return result
 
     @staticmethod
     def keys(include_snapshot_id: bool=True) -> list[str]:
         """
-        Get the list of keys for the dataclass.
+        Get the list of keys for the snapshot.
 
         :param include_snapshot_id: Whether or not to include the snapshot ID.
-        :return list: A list of keys for the dataclass.
+        :return list: A list of keys for the snapshot.
+        """
+        if include_snapshot_id:
+            return ["snapshot_id", *_STAT_KEYS]
+        return list(_STAT_KEYS)
+
+
+_STAT_KEYS: tuple[str, ...] = tuple(
+    key for key in BedwarsStatsSnapshot.__annotations__ if key != "snapshot_id")
+_KEY_INDEX: dict[str, int] = {key: i for i, key in enumerate(_STAT_KEYS)}
+_ZEROS = (0,) * len(_STAT_KEYS)
+
+
+def _stat_property(index: int) -> property:
+    def getter(self: BedwarsStatsSnapshot) -> int:
+        return int(self._values[index])
+
+    def setter(self: BedwarsStatsSnapshot, value: int) -> None:
+        self._values[index] = value
+
+    return property(getter, setter)
+
+
+for _index, _key in enumerate(_STAT_KEYS):
+    setattr(BedwarsStatsSnapshot, _key, _stat_property(_index))
+
+
+MODE_STAT_KEYS: tuple[str, ...] = tuple(
+    key for key in _STAT_KEYS if f"eight_one_{key}" in _KEY_INDEX)
+"The keys of the stats that are tracked per mode."
+
+_MODE_INDEXES: dict[str, np.ndarray] = {
+    prefix: np.array([_KEY_INDEX[f"{prefix}{key}"] for key in MODE_STAT_KEYS])
+    for prefix in ("", "eight_one_", "eight_two_", "four_three_", "four_four_", "two_four_")
+}
+
+
+class SnapshotModeView:
+    """The stats of a single mode of a `BedwarsStatsSnapshot`."""
+    __slots__ = ("prefix", "_values")
+
+    def __init__(self, snapshot_values: np.ndarray, prefix: str | list[str]) -> None:
         """
-        keys = list(BedwarsStatsSnapshot.__annotations__.keys())
+        :param snapshot_values: The stats vector of the snapshot.
+        :param prefix: The prefix of the mode, modes that aren't tracked \
+            by snapshots (dreams, etc) have no stats.
+        """
+        self.prefix = prefix
+
+        indexes = _MODE_INDEXES.get(prefix) if isinstance(prefix, str) else None
+        self._values: np.ndarray | None = \
+            None if indexes is None else snapshot_values[indexes]
+
+    @property
+    def is_tracked(self) -> bool:
+        """Whether the mode is tracked by snapshots."""
+        return self._values is not None
+
+    def get(self, key: str, default: int=0) -> int:
+        """
+        Get a stat of the mode by its unprefixed key (`wins_bedwars`, etc).
+
+        :param key: The unprefixed key of the stat.
+        :param default: The value to return if the stat isn't tracked.
+        """
+        if self._values is None or key not in _MODE_KEY_INDEX:
+            return default
+        return int(self._values[_MODE_KEY_INDEX[key]])
+
+    def __getitem__(self, key: str) -> int:
+        if self._values is None or key not in _MODE_KEY_INDEX:
+            raise KeyError(key)
+        return int(self._values[_MODE_KEY_INDEX[key]])
+
+    def as_dict(self) -> dict[str, int]:
+        """Convert the mode stats to a dictionary of unprefixed keys."""
+        if self._values is None:
+            return {}
+        return dict(zip(MODE_STAT_KEYS, self._values.tolist()))
 
-        if include_snapshot_id is False:
-            keys.remove("snapshot_id")  # Remove snapshot_id property
 
-        return keys
+_MODE_KEY_INDEX: dict[str, int] = {key: i for i, key in enumerate(MODE_STAT_KEYS)}
 
 
 @ensure_cursor
@@ -139,7 +327,7 @@ def get_snapshot_data(
         # Raise snapshot data missing error instead
         raise NotImplementedError("Data missing")
 
-    snapshot_data = BedwarsStatsSnapshot(*rotation_data)
+    snapshot_data = BedwarsStatsSnapshot.from_row(rotation_data)
     return snapshot_info_dict, snapshot_data
 
 @ensure_cursor
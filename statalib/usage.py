@@ -1,10 +1,171 @@
 """Usage metrics related functionality."""
 
+import asyncio
+import logging
+import threading
+import time
 from datetime import datetime, UTC
 from typing import Literal, TypedDict
 
 from .db import ensure_cursor, Cursor
 
+
+logger = logging.getLogger(__name__)
+
+USAGE_FLUSH_INTERVAL = 15
+"How often (in seconds) buffered command usage should be flushed."
+
+
+@ensure_cursor
+def _write_command_usage(
+    rows: list[tuple[str, int, int]],
+    *, cursor: Cursor=None
+) -> None:
+    cursor.executemany("""
+        INSERT INTO command_metrics (command_id, discord_user_id, times_used)
+        VALUES (?, ?, ?)
+        ON CONFLICT (command_id, discord_user_id)
+        DO UPDATE SET times_used = times_used + excluded.times_used
+    """, rows)
+
+
+class CommandUsageBuffer:
+    """
+    Write-behind buffer that aggregates command usage in memory.
+
+    Usage is flushed to the database periodically (see `USAGE_FLUSH_INTERVAL`)
+    and on shutdown. To bound the amount of usage that can be lost on a crash,
+    a flush is also triggered once too many deltas are pending or the oldest
+    pending delta is too old. Inside of an event loop, that flush runs in a
+    worker thread so recording usage never blocks the loop.
+    """
+    def __init__(self, max_pending: int=1000, max_age: float=60.0) -> None:
+        """
+        :param max_pending: The amount of pending (command, user) pairs \
+            that forces a flush.
+        :param max_age: The age (in seconds) of the oldest pending delta \
+            that forces a flush.
+        """
+        self.max_pending = max_pending
+        self.max_age = max_age
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: dict[tuple[str, int], int] = {}
+        self._flushing: dict[tuple[str, int], int] = {}
+        self._oldest: float | None = None
+
+        self._flush_scheduled = False
+        self._flush_tasks: set[asyncio.Task] = set()
+
+    def add(self, command_id: str, discord_user_id: int, amount: int=1) -> None:
+        """
+        Buffer command usage for a user, triggering a flush if the loss
+        window is exceeded.
+
+        :param command_id: The command ID of the command used.
+        :param discord_user_id: The Discord ID of the given user.
+        :param amount: The amount of times the command was used.
+        """
+        key = (command_id, discord_user_id)
+
+        with self._lock:
+            self._pending[key] = self._pending.get(key, 0) + amount
+
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+
+            should_flush = len(self._pending) >= self.max_pending \
+                or time.monotonic() - self._oldest >= self.max_age
+
+        if should_flush:
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()  # No event loop to block
+            return
+
+        with self._lock:
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+
+        task = loop.create_task(asyncio.to_thread(self.flush))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._on_flush_done)
+
+    def _on_flush_done(self, task: asyncio.Task) -> None:
+        self._flush_tasks.discard(task)
+
+        with self._lock:
+            self._flush_scheduled = False
+
+        # The deltas were put back by the flush, the periodic flush retries them
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Failed to flush command usage: {task.exception()}")
+
+    def pending(
+        self,
+        command_id: str | None=None,
+        discord_user_id: int | None=None
+    ) -> int:
+        """
+        Get the amount of unflushed usage matching the filters.
+
+        :param command_id: Filter by command ID.
+        :param discord_user_id: Filter by entrant.
+        """
+        with self._lock:
+            deltas = list(self._pending.items()) + list(self._flushing.items())
+
+        return sum(
+            amount for (cmd_id, user_id), amount in deltas
+            if (command_id is None or cmd_id == command_id)
+            and (discord_user_id is None or user_id == discord_user_id)
+        )
+
+    def flush(self) -> int:
+        """
+        Write all pending usage to the database in a single batch.
+
+        :return int: The amount of rows written.
+        """
+        with self._flush_lock:
+            with self._lock:
+                self._flushing, self._pending = self._pending, {}
+                self._oldest = None
+
+            if not self._flushing:
+                return 0
+
+            rows = [
+                (command_id, discord_user_id, amount)
+                for (command_id, discord_user_id), amount in self._flushing.items()
+            ]
+
+            try:
+                _write_command_usage(rows)
+            except Exception:
+                # Put the deltas back so they are retried on the next flush
+                with self._lock:
+                    for key, amount in self._flushing.items():
+                        self._pending[key] = self._pending.get(key, 0) + amount
+                    self._oldest = self._oldest or time.monotonic()
+                raise
+            finally:
+                with self._lock:
+                    self._flushing = {}
+
+            return len(rows)
+
+
+command_usage_buffer = CommandUsageBuffer()
+"The process wide command usage buffer."
+
+
 class CommandMetricsRepo:
     """Functionality for retrieving and update command usage."""
     @staticmethod
@@ -16,27 +177,31 @@ class CommandMetricsRepo:
         cursor: Cursor = None
     ) -> None:
         """
-        Update command usage for a user.
+        Update command usage for a user immediately.
     
         :param command_id: The command ID of the command used.
         :param discord_user_id: The Discord ID of the given user.
         """
-        usage_row = cursor.execute(
-            "SELECT * FROM command_metrics WHERE command_id = ? AND discord_user_id = ?",
-            (command_id, discord_user_id)
-        ).fetchone()
+        _write_command_usage([(command_id, discord_user_id, 1)], cursor=cursor)
 
-        if usage_row is None:
-            _ = cursor.execute(
-                "INSERT INTO command_metrics (command_id, discord_user_id, times_used) "
-                + "VALUES (?, ?, ?)", (command_id, discord_user_id, 1))
-            return
+    @staticmethod
+    def record_command_usage(command_id: str, discord_user_id: int) -> None:
+        """
+        Buffer command usage for a user, it is written on the next flush.
 
-        _ = cursor.execute("""
-            UPDATE command_metrics
-            SET times_used = times_used + 1
-            WHERE command_id = ? AND discord_user_id = ?
-        """, (command_id, discord_user_id))
+        :param command_id: The command ID of the command used.
+        :param discord_user_id: The Discord ID of the given user.
+        """
+        command_usage_buffer.add(command_id, discord_user_id)
+
+    @staticmethod
+    def flush_command_usage() -> int:
+        """
+        Write all buffered command usage to the database.
+
+        :return int: The amount of rows written.
+        """
+        return command_usage_buffer.flush()
 
 
     @staticmethod
@@ -68,10 +233,13 @@ class CommandMetricsRepo:
 
         usage_row = cursor.execute(query, tuple(params.values())).fetchone()
 
+        # Include usage that hasn't been flushed yet
+        pending = command_usage_buffer.pending(command_id, discord_user_id)
+
         if usage_row is None:
-            return 0
+            return pending
 
-        return usage_row[0] or 0
+        return (usage_row[0] or 0) + pending
 
 
 @ensure_cursor
@@ -0,0 +1,136 @@
+"""
+A local stand-in for the rendering server speaking the asset protocol of
+`statalib.render2.assets`, used by tests and benchmarks.
+
+Renders are the digest of the resolved placeholder values and background,
+so a render sent by reference matches the same render sent inline.
+"""
+
+import base64
+import hashlib
+import json
+from dataclasses import dataclass, field
+from email.parser import BytesParser
+
+from aiohttp import web
+
+from statalib.render2.assets import MISSING_ASSET_STATUS, asset_digest
+
+
+@dataclass
+class StubStats:
+    renders: int = 0
+    "The amount of renders served."
+    uploads: int = 0
+    "The amount of assets uploaded."
+    missing: int = 0
+    "The amount of renders rejected for referencing unknown assets."
+    bytes_received: int = 0
+    "The total size of the request bodies received."
+    paths: list[str] = field(default_factory=list)
+    "The path of every request, in order."
+
+
+class RendererStub:
+    """The stand-in rendering server."""
+    def __init__(self, themes: dict[str, bytes] | None=None) -> None:
+        """
+        :param themes: The images of the bundled themes, by theme ID.
+        """
+        self.themes = themes or {}
+        self.assets: dict[str, bytes] = {}
+        self.stats = StubStats()
+
+        self._runner: web.AppRunner | None = None
+        self.url: str | None = None
+
+    def _resolve(self, ref: str) -> bytes | None:
+        if ref.startswith("theme:"):
+            return self.themes.get(ref.removeprefix("theme:"))
+        return self.assets.get(ref)
+
+    async def _upload(self, request: web.Request) -> web.Response:
+        body = await request.read()
+        self.stats.bytes_received += len(body)
+        self.stats.paths.append(request.path)
+
+        digest = request.match_info["digest"]
+        if asset_digest(body) != digest:
+            return web.Response(status=400, text="Digest mismatch")
+
+        self.assets[digest] = body
+        self.stats.uploads += 1
+        return web.Response(status=204)
+
+    async def _render(self, request: web.Request) -> web.Response:
+        body = await request.read()
+        self.stats.bytes_received += len(body)
+        self.stats.paths.append(request.path)
+
+        # The body was already read to count its size, so it's parsed by hand
+        message = BytesParser().parsebytes(
+            f"Content-Type: {request.headers['Content-Type']}\r\n\r\n".encode() + body)
+        fields: dict[str, bytes] = {
+            part.get_param("name", header="content-disposition"): part.get_payload(decode=True)
+            for part in message.get_payload()
+        }
+
+        placeholder_values = json.loads(fields["placeholder_values"])
+        background = fields.get("background_image")
+        missing = []
+
+        if "background_image_ref" in fields:
+            ref = fields["background_image_ref"].decode()
+            background = self._resolve(ref)
+            if background is None:
+                missing.append(ref)
+
+        images = placeholder_values["images"]
+        for key, href in images.items():
+            if href.startswith("asset:"):
+                asset = self._resolve(href.removeprefix("asset:"))
+                if asset is None:
+                    missing.append(href.removeprefix("asset:"))
+                else:
+                    images[key] = f"data:image/png;base64,{base64.b64encode(asset).decode()}"
+
+        if missing:
+            self.stats.missing += 1
+            return web.json_response({"missing_assets": missing}, status=MISSING_ASSET_STATUS)
+
+        self.stats.renders += 1
+        render = hashlib.sha256(
+            json.dumps([request.path, fields["scale"].decode(), placeholder_values],
+                       sort_keys=True).encode()
+            + (background or b"")
+        ).digest()
+
+        return web.Response(body=render, content_type="image/png")
+
+    async def start(self, middlewares: list | None=None) -> str:
+        """
+        Start serving on a free local port, returning the server URL.
+
+        :param middlewares: aiohttp middlewares to serve with, simulating \
+            network conditions for example.
+        """
+        app = web.Application(
+            client_max_size=64 * 1024 * 1024, middlewares=middlewares or [])
+        app.router.add_put("/assets/{digest}", self._upload)
+        app.router.add_post("/{route}", self._render)
+
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,8 @@
+import sys
+
+from statalib.common import REL_PATH
+
+
+# Bot modules import each other relative to the bot's directory
+if f"{REL_PATH}/apps/bot" not in sys.path:
+    sys.path.append(f"{REL_PATH}/apps/bot")
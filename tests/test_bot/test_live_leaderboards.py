@@ -0,0 +1,155 @@
+import asyncio
+import time
+import unittest
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import discord
+
+from statalib.hypixel.lbs import LiveLeaderboardsRepo
+from statalib.hypixel.lbs.models import (
+    GuildLeaderboardDelivery,
+    GuildLiveLeaderboard,
+    LeaderboardChunk,
+)
+
+from cogs.commands.bedwars.leaderboards import update
+from helper.leaderboards import RenderedLeaderboard
+from helper.live_leaderboards import LiveLeaderboardDelivery, LiveLeaderboardUpdateReport
+from tests.utils import clean_database
+
+
+def _rendered(*digests: str) -> RenderedLeaderboard:
+    chunks = tuple(LeaderboardChunk(digest, digest.encode()) for digest in digests)
+    return RenderedLeaderboard(
+        title="Wins", images=tuple(c.image for c in chunks), changed=True, chunks=chunks)
+
+
+LIVE_LBS = [
+    GuildLiveLeaderboard(1, 10, "wins_new", 100),
+    GuildLiveLeaderboard(2, 20, "wins_new", 200),
+]
+
+
+def _update(rendered: RenderedLeaderboard, failing: set[int] = frozenset()) -> list[int] | None:
+    """Update the live leaderboards, returning the IDs of the guilds delivered to."""
+    delivered_to: list[int] | None = None
+
+    async def deliver(live_lbs, *_) -> LiveLeaderboardUpdateReport:
+        nonlocal delivered_to
+        delivered_to = [live_lb.guild_id for live_lb in live_lbs]
+
+        return LiveLeaderboardUpdateReport(
+            "wins_new",
+            guilds=len(live_lbs),
+            delivered=[guild_id for guild_id in delivered_to if guild_id not in failing],
+            failed={guild_id: "403" for guild_id in delivered_to if guild_id in failing},
+        )
+
+    delivery = MagicMock()
+    delivery.return_value.deliver = AsyncMock(side_effect=deliver)
+
+    with patch.object(update.helper.leaderboards, "render_leaderboard_path",
+                      AsyncMock(return_value=rendered)), \
+         patch.object(LiveLeaderboardsRepo, "get_all_live_lbs_for_lb_path",
+                      AsyncMock(return_value=LIVE_LBS)), \
+         patch.object(update, "LiveLeaderboardDelivery", delivery):
+        asyncio.run(update.UpdateLiveLb("wins_new", client=None).update())
+
+    return delivered_to
+
+
+class TestUpdateLiveLeaderboard(unittest.TestCase):
+    def setUp(self) -> None:
+        clean_database()
+
+    def test_unchanged_leaderboard_is_skipped(self):
+        self.assertListEqual(_update(_rendered("a", "b")), [1, 2])
+        self.assertIsNone(_update(_rendered("a", "b")))
+
+        # Changed chunks are delivered to every guild
+        self.assertListEqual(_update(_rendered("a", "c")), [1, 2])
+
+        self.assertListEqual(
+            asyncio.run(LiveLeaderboardsRepo.get_leaderboard_chunks("wins_new")),
+            list(_rendered("a", "c").chunks))
+
+    def test_failed_guilds_are_retried(self):
+        self.assertListEqual(_update(_rendered("a", "b"), failing={2}), [1, 2])
+
+        # Only the failed guild is retried, until it is delivered to
+        self.assertListEqual(_update(_rendered("a", "b"), failing={2}), [2])
+        self.assertListEqual(_update(_rendered("a", "b")), [2])
+        self.assertIsNone(_update(_rendered("a", "b")))
+
+    def test_stale_deliveries_are_refreshed(self):
+        rendered = _rendered("a", "b")
+        stale_at = time.time() - update.MAX_DELIVERY_AGE
+
+        asyncio.run(LiveLeaderboardsRepo.set_guild_deliveries(
+            "wins_new", [1], GuildLeaderboardDelivery(rendered.digest, stale_at)))
+        asyncio.run(LiveLeaderboardsRepo.set_guild_deliveries(
+            "wins_new", [2], GuildLeaderboardDelivery(rendered.digest, time.time())))
+
+        self.assertListEqual(_update(rendered), [1])
+
+
+def _text_channel() -> MagicMock:
+    channel = MagicMock(spec=discord.TextChannel)
+    channel.get_partial_message.return_value.edit = AsyncMock()
+    return channel
+
+
+def _client(storage_channel: MagicMock | None) -> tuple[MagicMock, dict[int, MagicMock]]:
+    guild_channels = {live_lb.guild_id: _text_channel() for live_lb in LIVE_LBS}
+
+    client = MagicMock()
+    client.get_channel.return_value = storage_channel
+    client.get_guild.side_effect = lambda guild_id: SimpleNamespace(
+        unavailable=False, get_channel=lambda _: guild_channels[guild_id])
+
+    return client, guild_channels
+
+
+class TestLiveLeaderboardDelivery(unittest.TestCase):
+    def _deliver(self, client: MagicMock) -> LiveLeaderboardUpdateReport:
+        delivery = LiveLeaderboardDelivery(
+            client, "wins_new", _rendered("a", "b"), storage_channel_id=1)
+        return asyncio.run(delivery.deliver(LIVE_LBS, datetime.now(UTC)))
+
+    def test_uploads_to_storage_channel(self):
+        storage_channel = _text_channel()
+        storage_channel.send = AsyncMock(return_value=SimpleNamespace(attachments=[
+            SimpleNamespace(filename=f"lb-{i}.png", url=f"https://cdn/lb-{i}.png")
+            for i in range(2)
+        ]))
+        client, guild_channels = _client(storage_channel)
+
+        report = self._deliver(client)
+
+        storage_channel.send.assert_awaited_once()
+        self.assertEqual(report.uploads, 1)
+        self.assertListEqual(sorted(report.delivered), [1, 2])
+
+        # Every guild shows the stored images, none depend on another guild
+        for channel in guild_channels.values():
+            edit = channel.get_partial_message.return_value.edit
+            self.assertListEqual(edit.await_args.kwargs["attachments"], [])
+            self.assertListEqual(
+                [embed.image.url for embed in edit.await_args.kwargs["embeds"]],
+                ["https://cdn/lb-0.png", "https://cdn/lb-1.png"])
+
+    def test_guilds_upload_without_storage_channel(self):
+        client, guild_channels = _client(storage_channel=None)
+
+        report = self._deliver(client)
+
+        self.assertEqual(report.uploads, 2)
+        for channel in guild_channels.values():
+            edit = channel.get_partial_message.return_value.edit
+            self.assertEqual(len(edit.await_args.kwargs["attachments"]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
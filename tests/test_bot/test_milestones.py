@@ -0,0 +1,43 @@
+import unittest
+
+from statalib import sessions
+
+from calc.milestones import MilestonesStats
+from tests.utils import clean_database, MockData
+
+
+session_hypixel_data = {
+    "player": {"uuid": MockData.uuid, "stats": {"Bedwars": {
+        "wins_bedwars": 10, "losses_bedwars": 10
+    }}}
+}
+current_hypixel_data = {
+    "player": {"uuid": MockData.uuid, "stats": {"Bedwars": {
+        "wins_bedwars": 14, "losses_bedwars": 11
+    }}}
+}
+
+
+class TestMilestones(unittest.TestCase):
+    def setUp(self) -> None:
+        clean_database()
+
+    def test_milestones_with_session(self):
+        manager = sessions.SessionManager(MockData.uuid)
+        manager.create_session(1, session_hypixel_data)
+
+        stats = MilestonesStats(manager.get_session(1), current_hypixel_data)
+        wins = stats.get_wins()
+
+        # 4 wins per loss in the session, so 2 WLR is reached at 30 wins and 15 losses
+        self.assertEqual(wins.target_ratio, 2)
+        self.assertEqual(wins.value_at_ratio, 30)
+        self.assertEqual(wins.x_until_target_ratio, 16)
+
+    def test_milestones_without_session(self):
+        stats = MilestonesStats(None, current_hypixel_data)
+        self.assertEqual(stats.get_wins().target_value, 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
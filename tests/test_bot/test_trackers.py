@@ -0,0 +1,47 @@
+import sqlite3
+import unittest
+from datetime import datetime, UTC
+from unittest.mock import patch
+
+import statalib
+
+import trackers
+from tests.utils import clean_database
+
+
+def _fake_reset(uuid: str, hypixel_data: dict, timezone: datetime) -> int:
+    with statalib.db.transaction() as conn:
+        conn.execute("INSERT INTO themes_data (discord_id) VALUES (?)", (hypixel_data["id"],))
+
+    if uuid == "bad":
+        raise KeyError("missing rotation")
+    return hypixel_data["id"] % 2
+
+
+class TestWriteResetBatch(unittest.TestCase):
+    def setUp(self) -> None:
+        clean_database()
+
+    def test_failing_player_only_rolls_back_itself(self):
+        now = datetime.now(UTC)
+        batch = [
+            ("good", {"id": 1}, now),
+            ("bad", {"id": 2}, now),
+            ("good", {"id": 3}, now),
+        ]
+
+        with patch.object(trackers, "reset_player_trackers", _fake_reset):
+            conflicts, errors = trackers.write_reset_batch(batch)
+
+        self.assertEqual(conflicts, 2)
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], KeyError)
+
+        with sqlite3.connect(statalib.config.DB_FILE_PATH) as conn:
+            ids = [row[0] for row in conn.execute(
+                "SELECT discord_id FROM themes_data ORDER BY discord_id")]
+        self.assertListEqual(ids, [1, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+from json import JSONDecodeError
+
+from statalib.codec import JsonCodec, available_codecs, get_codec
+from statalib.hypixel.projection import (
+    ProjectedHypixelData,
+    decode_hypixel_data,
+    project_hypixel_data
+)
+
+from tests.test_statalib.test_projection import RAW_HYPIXEL_DATA
+
+
+class TestJsonCodec(unittest.TestCase):
+    def test_codecs_round_trip(self):
+        document = {"a": [1, 2.5, None, True], "b": {"c": "é"}}
+
+        for codec in available_codecs().values():
+            with self.subTest(codec=codec.name):
+                self.assertDictEqual(codec.loads(codec.dumps(document)), document)
+                self.assertDictEqual(codec.loads(codec.dumps(document).decode()), document)
+
+    def test_decode_errors_are_json_decode_errors(self):
+        for codec in available_codecs().values():
+            with self.subTest(codec=codec.name):
+                with self.assertRaises(JSONDecodeError):
+                    codec.loads(b"{not json")
+
+    def test_unavailable_codec_falls_back_to_stdlib(self):
+        with self.assertLogs("statalib.codec", "WARNING"):
+            self.assertIs(type(get_codec("not-a-codec")), JsonCodec)
+
+    def test_typed_decoding_into_projection(self):
+        projected = project_hypixel_data(RAW_HYPIXEL_DATA)
+
+        for codec in available_codecs().values():
+            with self.subTest(codec=codec.name):
+                payload = codec.dumps(RAW_HYPIXEL_DATA)
+                self.assertDictEqual(
+                    project_hypixel_data(codec.loads_typed(payload, ProjectedHypixelData)),
+                    projected)
+
+        self.assertDictEqual(decode_hypixel_data(JsonCodec().dumps(RAW_HYPIXEL_DATA)), projected)
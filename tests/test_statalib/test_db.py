@@ -0,0 +1,189 @@
+import asyncio
+import sqlite3
+import unittest
+
+from statalib import config, db, errors
+from statalib.accounts import Account
+
+from tests.utils import clean_database, MockData
+
+
+class TestConnectionPool(unittest.TestCase):
+    def setUp(self) -> None:
+        clean_database()
+        self.pool = db.ConnectionPool(config.DB_FILE_PATH, size=2)
+
+    def tearDown(self) -> None:
+        asyncio.run(self.pool.aclose())
+
+    def test_pragmas_applied(self):
+        with self.pool.connection() as conn:
+            journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            synchronous = conn.execute("PRAGMA synchronous").fetchone()[0]
+
+        self.assertEqual(journal_mode, "wal")
+        self.assertEqual(synchronous, 1)  # NORMAL
+
+    def test_connection_reused(self):
+        with self.pool.connection() as conn_1:
+            pass
+        with self.pool.connection() as conn_2:
+            pass
+
+        self.assertIs(conn_1, conn_2)
+
+        metrics = self.pool.metrics()
+        self.assertEqual(metrics.checkouts, 2)
+        self.assertEqual(metrics.open_connections, 1)
+        self.assertEqual(metrics.in_use, 0)
+
+    def test_nested_checkout_reuses_connection(self):
+        with self.pool.connection() as outer:
+            with self.pool.connection() as inner:
+                self.assertIs(outer, inner)
+
+        self.assertEqual(self.pool.metrics().reentrant_checkouts, 1)
+
+    def test_nested_checkout_rolls_back_savepoint(self):
+        with self.pool.connection() as conn:
+            conn.execute("INSERT INTO linked_accounts VALUES (?, ?)", (1, "a"))
+
+            with self.assertRaises(ValueError):
+                with self.pool.connection() as nested:
+                    nested.execute("INSERT INTO linked_accounts VALUES (?, ?)", (2, "b"))
+                    raise ValueError
+
+        with self.pool.connection() as conn:
+            rows = conn.execute("SELECT discord_id FROM linked_accounts").fetchall()
+
+        self.assertListEqual(rows, [(1,)])
+
+    def test_exception_rolls_back(self):
+        with self.assertRaises(ValueError):
+            with self.pool.connection() as conn:
+                conn.execute("INSERT INTO linked_accounts VALUES (?, ?)", (1, "a"))
+                raise ValueError
+
+        with self.pool.connection() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM linked_accounts").fetchone()[0]
+
+        self.assertEqual(count, 0)
+
+    def test_checkout_timeout(self):
+        pool = db.ConnectionPool(config.DB_FILE_PATH, size=1, checkout_timeout=0.01)
+        conn = pool._checkout()
+
+        with self.assertRaises(errors.DatabasePoolTimeoutError):
+            pool._checkout()
+
+        pool._checkin(conn)
+        self.assertEqual(pool.metrics().timeouts, 1)
+        pool.close()
+
+    def test_async_connection(self):
+        async def run() -> tuple[int, int]:
+            async with self.pool.async_connection() as conn:
+                await conn.execute("INSERT INTO linked_accounts VALUES (?, ?)", (1, "a"))
+
+            async with self.pool.async_connection() as conn:
+                cursor = await conn.execute("SELECT COUNT(*) FROM linked_accounts")
+                count = (await cursor.fetchone())[0]
+
+            return count, self.pool.metrics().open_connections
+
+        count, open_connections = asyncio.run(run())
+        self.assertEqual(count, 1)
+        self.assertEqual(open_connections, 1)
+
+
+class TestInteractionScope(unittest.TestCase):
+    def setUp(self) -> None:
+        clean_database()
+        self.pool = db.ConnectionPool(config.DB_FILE_PATH, size=2)
+
+    def tearDown(self) -> None:
+        asyncio.run(self.pool.aclose())
+
+    @staticmethod
+    def _count_linked() -> int:
+        with sqlite3.connect(config.DB_FILE_PATH) as conn:
+            return conn.execute("SELECT COUNT(*) FROM linked_accounts").fetchone()[0]
+
+    def test_single_checkout_and_commit_on_suspend(self):
+        counts = []
+
+        async def handler() -> str:
+            for discord_id in (1, 2):
+                with self.pool.connection() as conn:
+                    conn.execute(
+                        "INSERT INTO linked_accounts VALUES (?, ?)", (discord_id, "a"))
+
+            # Nothing is committed until the handler suspends
+            counts.append(self._count_linked())
+            await asyncio.sleep(0)
+            counts.append(self._count_linked())
+            return "done"
+
+        result = asyncio.run(self.pool.run_in_scope(handler()))
+
+        self.assertEqual(result, "done")
+        self.assertListEqual(counts, [0, 2])
+        self.assertEqual(self.pool.metrics().checkouts, 1)
+        self.assertEqual(self.pool.metrics().reentrant_checkouts, 2)
+
+    def test_exception_rolls_back_uncommitted(self):
+        async def handler() -> None:
+            with self.pool.connection() as conn:
+                conn.execute("INSERT INTO linked_accounts VALUES (?, ?)", (1, "a"))
+            raise ValueError
+
+        with self.assertRaises(ValueError):
+            asyncio.run(self.pool.run_in_scope(handler()))
+
+        self.assertEqual(self._count_linked(), 0)
+        self.assertEqual(self.pool.metrics().in_use, 0)
+
+    def test_child_tasks_use_own_connection(self):
+        async def child() -> sqlite3.Connection:
+            with self.pool.connection() as conn:
+                return conn
+
+        async def handler() -> tuple[sqlite3.Connection, sqlite3.Connection]:
+            with self.pool.connection() as conn:
+                pass
+            return conn, await asyncio.create_task(child())
+
+        scoped, child_conn = asyncio.run(self.pool.run_in_scope(handler()))
+        self.assertIsNot(scoped, child_conn)
+
+    def test_runs_unscoped_when_pool_is_busy(self):
+        conn = self.pool._checkout()
+
+        async def handler() -> None:
+            with self.pool.connection():
+                pass
+
+        asyncio.run(self.pool.run_in_scope(handler()))
+        self.pool._checkin(conn)
+
+        # The scope leaves the last connection free, so only the call checked out
+        self.assertEqual(self.pool.metrics().checkouts, 2)
+
+
+class TestEnsureCursor(unittest.TestCase):
+    def setUp(self) -> None:
+        clean_database()
+
+    def test_writes_are_committed(self):
+        Account(MockData.discord_id).create()
+
+        with sqlite3.connect(config.DB_FILE_PATH) as conn:
+            count = conn.execute("SELECT COUNT(*) FROM accounts").fetchone()[0]
+
+        self.assertEqual(count, 1)
+
+    def test_uses_configured_pool(self):
+        checkouts = db.get_pool().metrics().checkouts
+        Account(MockData.discord_id).load()
+
+        self.assertGreater(db.get_pool().metrics().checkouts, checkouts)
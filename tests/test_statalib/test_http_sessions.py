@@ -0,0 +1,41 @@
+import asyncio
+import unittest
+
+from aiohttp_client_cache import CacheBackend
+
+from statalib.http_sessions import SessionRegistry
+
+
+class TestSessionRegistry(unittest.TestCase):
+    def test_sessions_are_shared(self):
+        async def run() -> None:
+            registry = SessionRegistry()
+            cache = CacheBackend()
+
+            session = registry.session("hypixel")
+            cached_session = registry.cached_session("hypixel", cache)
+
+            self.assertIs(registry.session("hypixel"), session)
+            self.assertIs(registry.cached_session("hypixel", cache), cached_session)
+            self.assertIsNot(registry.session("renderer"), session)
+
+            # Cached and uncached sessions share the upstream's connections
+            self.assertIs(cached_session.connector, session.connector)
+            self.assertEqual(session.connector.limit_per_host, 20)
+
+            await registry.close()
+            self.assertTrue(session.closed)
+            self.assertTrue(session.connector is None or session.connector.closed)
+
+        asyncio.run(run())
+
+    def test_closed_session_is_recreated(self):
+        async def run() -> None:
+            registry = SessionRegistry()
+            session = registry.session("default")
+            await registry.close()
+
+            self.assertIsNot(registry.session("default"), session)
+            await registry.close()
+
+        asyncio.run(run())
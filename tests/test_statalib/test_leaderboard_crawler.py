@@ -0,0 +1,195 @@
+import asyncio
+import random
+import unittest
+from unittest.mock import patch
+
+from statalib.hypixel.lbs import (
+    CrawlStats,
+    LeaderboardCrawler,
+    LeaderboardData,
+    LeaderboardSnapshot,
+    LiveLeaderboardsRepo
+)
+from statalib.hypixel.lbs.models import (
+    LEADERBOARD_TYPES,
+    GuildLeaderboardDelivery,
+    GuildLiveLeaderboard,
+    LeaderboardChunk,
+    leaderboard_chunk_digest
+)
+
+from tests.utils import clean_database
+
+
+def _leaderboard(leaders: list[str], path: str="wins_new") -> LeaderboardData:
+    return LeaderboardData(
+        info=LEADERBOARD_TYPES[path],
+        count=len(leaders),
+        leaders=tuple(leaders)
+    )
+
+
+class _FakeCrawler(LeaderboardCrawler):
+    def __init__(self, concurrency: int) -> None:
+        super().__init__(concurrency)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _fetch_player_data(self, uuid: str, stats: CrawlStats):
+        if uuid in self._profiles:
+            stats.reused += 1
+            return self._profiles[uuid]
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        await asyncio.sleep(random.uniform(0, 0.01))
+
+        self.in_flight -= 1
+        stats.requests += 1
+
+        player_data = {
+            "uuid": uuid,
+            "displayname": f"name-{uuid}",
+            "stats": {"Bedwars": {"wins_bedwars": int(uuid)}}
+        }
+        self._profiles[uuid] = player_data
+        return player_data
+
+
+async def _crawl(crawler: LeaderboardCrawler, leaderboard: LeaderboardData) -> list:
+    return [entry async for entry in crawler.crawl(leaderboard)]
+
+
+class TestLeaderboardCrawler(unittest.TestCase):
+    def test_entries_are_yielded_in_order(self):
+        crawler = _FakeCrawler(concurrency=4)
+        leaders = [str(i) for i in range(30)]
+
+        entries = asyncio.run(_crawl(crawler, _leaderboard(leaders)))
+
+        self.assertListEqual([entry.uuid for entry in entries], leaders)
+        self.assertListEqual([entry.value for entry in entries], [f"{i:,}" for i in range(30)])
+        self.assertLessEqual(crawler.max_in_flight, 4)
+        self.assertGreater(crawler.max_in_flight, 1)
+
+        self.assertEqual(crawler.last_stats.players, 30)
+        self.assertEqual(crawler.last_stats.requests, 30)
+
+    def test_players_are_reused_between_crawls(self):
+        crawler = _FakeCrawler(concurrency=4)
+
+        asyncio.run(_crawl(crawler, _leaderboard(["1", "2", "3"])))
+        asyncio.run(_crawl(crawler, _leaderboard(["3", "4", "1"])))
+
+        self.assertEqual(crawler.last_stats.requests, 1)
+        self.assertEqual(crawler.last_stats.reused, 2)
+
+    def test_closing_early_cancels_remaining_fetches(self):
+        crawler = _FakeCrawler(concurrency=2)
+
+        async def take_first():
+            crawl = crawler.crawl(_leaderboard([str(i) for i in range(20)]))
+            first = await anext(crawl)
+            await crawl.aclose()
+            await asyncio.sleep(0.05)
+            return first
+
+        self.assertEqual(asyncio.run(take_first()).uuid, "0")
+        self.assertEqual(crawler.last_stats.players, 1)
+        self.assertLess(crawler.last_stats.requests, 20)
+
+
+class TestLeaderboardSnapshot(unittest.TestCase):
+    def test_shared_leaders_are_fetched_once(self):
+        crawler = _FakeCrawler(concurrency=4)
+        leaderboards = [
+            _leaderboard(["1", "2", "3", "4"], "wins_new"),
+            _leaderboard(["3", "1", "5", "6"], "final_kills_new"),
+            _leaderboard(["7"], "bedwars_level")
+        ]
+
+        async def fetch_bedwars_leaderboards():
+            return leaderboards
+
+        with patch(
+            "statalib.hypixel.lbs.snapshot.fetch_bedwars_leaderboards",
+            fetch_bedwars_leaderboards
+        ):
+            snapshot = asyncio.run(
+                LeaderboardSnapshot.fetch(["wins_new", "final_kills_new"], crawler))
+
+        self.assertEqual(snapshot.leader_slots, 8)
+        self.assertEqual(crawler.last_stats.requests, 6)
+
+        self.assertListEqual(
+            [entry.uuid for entry in snapshot.entries("final_kills_new")],
+            ["3", "1", "5", "6"])
+        self.assertListEqual(
+            [entry.value for entry in snapshot.entries("wins_new")],
+            ["1", "2", "3", "4"])
+
+        with self.assertRaises(ValueError):
+            snapshot.entries("bedwars_level")
+
+
+class TestLeaderboardChunks(unittest.TestCase):
+    def setUp(self) -> None:
+        clean_database()
+
+    def test_digest_changes_with_rendered_data(self):
+        crawler = _FakeCrawler(concurrency=4)
+        info = LEADERBOARD_TYPES["wins_new"]
+        entries = asyncio.run(_crawl(crawler, _leaderboard([str(i) for i in range(10)])))
+
+        digest = leaderboard_chunk_digest(info, entries, 1, True)
+
+        self.assertEqual(leaderboard_chunk_digest(info, list(entries), 1, True), digest)
+        self.assertNotEqual(leaderboard_chunk_digest(info, entries, 11, True), digest)
+        self.assertNotEqual(leaderboard_chunk_digest(info, entries, 1, False), digest)
+        self.assertNotEqual(leaderboard_chunk_digest(info, entries[::-1], 1, True), digest)
+        self.assertNotEqual(
+            leaderboard_chunk_digest(LEADERBOARD_TYPES["final_kills_new"], entries, 1, True),
+            digest)
+
+    def test_chunks_round_trip(self):
+        chunks = [LeaderboardChunk("a", b"first"), LeaderboardChunk("b", b"second")]
+
+        async def round_trip() -> tuple[list, list]:
+            await LiveLeaderboardsRepo.set_leaderboard_chunks("wins_new", chunks)
+            first = await LiveLeaderboardsRepo.get_leaderboard_chunks("wins_new")
+
+            await LiveLeaderboardsRepo.set_leaderboard_chunks("wins_new", chunks[:1])
+            second = await LiveLeaderboardsRepo.get_leaderboard_chunks("wins_new")
+            return first, second
+
+        first, second = asyncio.run(round_trip())
+
+        self.assertListEqual(first, chunks)
+        self.assertListEqual(second, chunks[:1])
+        self.assertListEqual(asyncio.run(
+            LiveLeaderboardsRepo.get_leaderboard_chunks("final_kills_new")), [])
+
+    def test_guild_deliveries(self):
+        for guild_id in (1, 2):
+            asyncio.run(LiveLeaderboardsRepo.set_live_leaderboard(
+                GuildLiveLeaderboard(guild_id, guild_id * 10, "wins_new", guild_id * 100)))
+
+        self.assertDictEqual(
+            asyncio.run(LiveLeaderboardsRepo.get_guild_deliveries("wins_new")), {})
+
+        asyncio.run(LiveLeaderboardsRepo.set_guild_deliveries(
+            "wins_new", [1, 2], GuildLeaderboardDelivery("a", 100.5)))
+        asyncio.run(LiveLeaderboardsRepo.set_guild_deliveries(
+            "wins_new", [2], GuildLeaderboardDelivery("b", 200.5)))
+
+        self.assertDictEqual(
+            asyncio.run(LiveLeaderboardsRepo.get_guild_deliveries("wins_new")),
+            {1: GuildLeaderboardDelivery("a", 100.5), 2: GuildLeaderboardDelivery("b", 200.5)})
+
+        # Removed and replaced live leaderboards haven't been delivered to
+        asyncio.run(LiveLeaderboardsRepo.unset_live_leaderboard(1, "wins_new"))
+        asyncio.run(LiveLeaderboardsRepo.set_live_leaderboard(
+            GuildLiveLeaderboard(2, 20, "wins_new", 201)))
+        self.assertDictEqual(
+            asyncio.run(LiveLeaderboardsRepo.get_guild_deliveries("wins_new")), {})
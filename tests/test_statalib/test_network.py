@@ -0,0 +1,123 @@
+import asyncio
+import unittest
+
+from statalib.network import HypixelRateLimiter, RequestPriority, SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_calls_are_coalesced(self):
+        flights = SingleFlight()
+        calls = []
+
+        async def fetch(value: int) -> int:
+            calls.append(value)
+            await asyncio.sleep(0.01)
+            return value
+
+        async def run() -> list[int]:
+            results = await asyncio.gather(
+                *(flights.do("a", lambda: fetch(1)) for _ in range(3)),
+                flights.do("b", lambda: fetch(2)))
+
+            # Completed calls are not reused
+            results.append(await flights.do("a", lambda: fetch(3)))
+            return results
+
+        self.assertListEqual(asyncio.run(run()), [1, 1, 1, 2, 3])
+        self.assertListEqual(calls, [1, 2, 3])
+        self.assertEqual(flights.calls, 5)
+        self.assertEqual(flights.saved_calls, 2)
+        self.assertEqual(flights.in_flight, 0)
+
+    def test_exception_is_shared(self):
+        flights = SingleFlight()
+
+        async def fail() -> None:
+            await asyncio.sleep(0)
+            raise ValueError
+
+        async def run() -> list:
+            return await asyncio.gather(
+                flights.do("a", fail), flights.do("a", fail), return_exceptions=True)
+
+        results = asyncio.run(run())
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+
+    def test_cancelled_caller_does_not_cancel_others(self):
+        flights = SingleFlight()
+
+        async def fetch() -> str:
+            await asyncio.sleep(0.01)
+            return "data"
+
+        async def run() -> str:
+            first = asyncio.create_task(flights.do("a", fetch))
+            second = asyncio.create_task(flights.do("a", fetch))
+            await asyncio.sleep(0)
+
+            first.cancel()
+            return await second
+
+        self.assertEqual(asyncio.run(run()), "data")
+
+
+class TestHypixelRateLimiter(unittest.TestCase):
+    def test_reserves_hold_back_lower_priorities(self):
+        limiter = HypixelRateLimiter(
+            limit=3, window=60, reserves={RequestPriority.LEADERBOARD: 2})
+
+        async def run() -> bool:
+            await limiter.acquire(RequestPriority.LEADERBOARD)
+
+            # Only the reserved quota is left
+            with self.assertRaises(TimeoutError):
+                await asyncio.wait_for(limiter.acquire(RequestPriority.LEADERBOARD), 0.05)
+
+            await limiter.acquire(RequestPriority.INTERACTIVE)
+            await limiter.acquire(RequestPriority.INTERACTIVE)
+            return limiter.metrics().waiting == 0
+
+        self.assertTrue(asyncio.run(run()))
+        self.assertDictEqual(limiter.metrics().granted, {
+            RequestPriority.LEADERBOARD: 1, RequestPriority.INTERACTIVE: 2})
+
+    def test_higher_priorities_are_served_first(self):
+        limiter = HypixelRateLimiter(limit=3, window=60)
+        order = []
+
+        async def request(priority: RequestPriority) -> None:
+            await limiter.acquire(priority)
+            order.append(priority)
+
+        async def run() -> None:
+            await limiter.record_response(
+                200, {"RateLimit-Remaining": "0", "RateLimit-Reset": "0.05"})
+
+            await asyncio.gather(
+                request(RequestPriority.LEADERBOARD),
+                request(RequestPriority.TRACKER_RESET),
+                request(RequestPriority.INTERACTIVE))
+
+        asyncio.run(asyncio.wait_for(run(), 1))
+        self.assertListEqual(order, [
+            RequestPriority.INTERACTIVE,
+            RequestPriority.TRACKER_RESET,
+            RequestPriority.LEADERBOARD
+        ])
+
+    def test_headers_correct_quota(self):
+        limiter = HypixelRateLimiter(limit=100, window=60)
+
+        async def run() -> None:
+            await limiter.record_response(
+                200, {"RateLimit-Remaining": "1", "RateLimit-Reset": "60"})
+            await limiter.acquire()
+
+            with self.assertRaises(TimeoutError):
+                await asyncio.wait_for(limiter.acquire(), 0.05)
+
+            # A throttle response pauses every request
+            await limiter.record_response(429, {})
+
+        asyncio.run(run())
+        self.assertEqual(limiter.metrics().throttled, 1)
@@ -0,0 +1,65 @@
+import asyncio
+import unittest
+
+from statalib.player_cache import (
+    TieredPlayerCache,
+    compress_player_data,
+    decompress_player_data
+)
+
+from tests.utils import MockData
+
+
+hypixel_data = {"success": True, "player": {"stats": {"Bedwars": {"wins_bedwars": 5}}}}
+
+
+class TestTieredPlayerCache(unittest.TestCase):
+    def test_compression_round_trip(self):
+        cached = decompress_player_data(compress_player_data(hypixel_data, 1.5))
+
+        self.assertDictEqual(cached.hypixel_data, hypixel_data)
+        self.assertEqual(cached.fetched_at, 1.5)
+
+    def test_memory_tier(self):
+        cache = TieredPlayerCache(memory_size=10, memory_ttl=60)
+
+        async def run() -> list:
+            results = [await cache.get(MockData.uuid)]
+            await cache.set(MockData.uuid, hypixel_data)
+            results.append(await cache.get(MockData.uuid))
+
+            await cache.invalidate(MockData.uuid)
+            results.append(await cache.get(MockData.uuid))
+            return results
+
+        self.assertListEqual(asyncio.run(run()), [None, hypixel_data, None])
+
+        metrics = cache.metrics()
+        self.assertEqual(metrics["memory"].hits, 1)
+        self.assertEqual(metrics["memory"].misses, 2)
+        self.assertEqual(metrics["redis"].hits + metrics["redis"].misses, 0)
+
+    def test_stale_entries(self):
+        cache = TieredPlayerCache(memory_size=10, memory_ttl=60, stale_grace=60)
+
+        async def run() -> list:
+            await cache.set(MockData.uuid, hypixel_data)
+            (await cache.get_entry(MockData.uuid)).fetched_at -= 90
+
+            results = [await cache.get(MockData.uuid)]
+            results.append((await cache.get_entry(MockData.uuid)).hypixel_data)
+
+            # Past the grace period
+            (await cache.get_entry(MockData.uuid)).fetched_at -= 60
+            results.append(await cache.get_entry(MockData.uuid))
+            return results
+
+        self.assertListEqual(asyncio.run(run()), [None, hypixel_data, None])
+
+    def test_cold_tier_metrics(self):
+        cache = TieredPlayerCache(memory_size=10, memory_ttl=60)
+        cache.record_cold_lookup(True)
+        cache.record_cold_lookup(False)
+        cache.record_cold_lookup(False)
+
+        self.assertAlmostEqual(cache.metrics()["cold"].hit_rate, 1 / 3)
@@ -0,0 +1,79 @@
+import unittest
+
+from statalib.common import ModesEnum
+from statalib.hypixel import BedwarsStats, get_quests_data, get_rank_info
+from statalib.hypixel.projection import project_hypixel_data
+
+from tests.utils import MockData
+
+
+RAW_HYPIXEL_DATA = {
+    "success": True,
+    "player": {
+        "uuid": MockData.uuid.replace("-", ""),
+        "displayname": "Player",
+        "newPackageRank": "MVP_PLUS",
+        "rankPlusColor": "GOLD",
+        "networkExp": 123456.5,
+        "karma": 1000,
+        "stats": {
+            "Bedwars": {
+                "Experience": 500_000,
+                "wins_bedwars": 40,
+                "losses_bedwars": 10,
+                "final_kills_bedwars": 120,
+                "eight_one_wins_bedwars": 5
+            },
+            "SkyWars": {"wins": 5, "kills": 30},
+            "Duels": {"wins": 100}
+        },
+        "quests": {
+            "bedwars_daily_win": {"completions": [{"time": 1}, {"time": 2}]},
+            "skywars_solo_win": {"completions": [{"time": 3}]}
+        },
+        "achievements": {"bedwars_level": 145, "skywars_you_re_a_star": 10},
+        "socialMedia": {
+            "links": {"DISCORD": "player"},
+            "prompt": True
+        }
+    }
+}
+
+
+class TestHypixelProjection(unittest.TestCase):
+    def setUp(self) -> None:
+        self.projected = project_hypixel_data(RAW_HYPIXEL_DATA)
+
+    def test_unused_data_is_dropped(self):
+        player = self.projected["player"]
+
+        self.assertListEqual(list(player["stats"]), ["Bedwars"])
+        self.assertListEqual(list(player["quests"]), ["bedwars_daily_win"])
+        self.assertDictEqual(player["achievements"], {"bedwars_level": 145})
+        self.assertDictEqual(player["socialMedia"], {"links": {"DISCORD": "player"}})
+        self.assertNotIn("networkExp", player)
+        self.assertNotIn("karma", player)
+
+    def test_consumers_are_unaffected(self):
+        raw_stats = BedwarsStats(RAW_HYPIXEL_DATA, ModesEnum.OVERALL.value)
+        projected_stats = BedwarsStats(self.projected, ModesEnum.OVERALL.value)
+
+        for attr, value in vars(raw_stats).items():
+            if isinstance(value, (int, float, str)):
+                self.assertEqual(value, getattr(projected_stats, attr), attr)
+
+        raw_player = RAW_HYPIXEL_DATA["player"]
+        self.assertEqual(get_rank_info(raw_player), get_rank_info(self.projected["player"]))
+        self.assertDictEqual(
+            get_quests_data(raw_player), get_quests_data(self.projected["player"]))
+
+    def test_projection_is_idempotent(self):
+        self.assertDictEqual(project_hypixel_data(self.projected), self.projected)
+
+    def test_responses_without_player(self):
+        self.assertDictEqual(
+            project_hypixel_data({"success": True, "player": None}),
+            {"success": True, "player": None})
+
+        throttled = {"success": False, "cause": "Key throttle", "throttle": True}
+        self.assertDictEqual(project_hypixel_data(throttled), throttled)
@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from PIL import ImageChops
+
+from statalib.assets import ASSET_LOADER
+from statalib.common import REL_PATH
+from statalib.render.theme_variants import PLACEHOLDER_RGB, ThemeVariantCache
+from statalib.render.tools import recolor_pixels
+
+
+THEME_PATH = "bg/total/themes/mosaic.png"
+RANK_RGB = (85, 255, 255)
+PRESTIGE_RGB = (255, 170, 0)
+
+
+def _recolored():
+    return recolor_pixels(
+        ASSET_LOADER.load_image(THEME_PATH).convert("RGBA"),
+        rgb_from=PLACEHOLDER_RGB, rgb_to=(RANK_RGB, PRESTIGE_RGB))
+
+
+class TestThemeVariantCache(unittest.TestCase):
+    def assertImagesEqual(self, first, second):
+        self.assertEqual(first.mode, second.mode)
+        self.assertIsNone(ImageChops.difference(first, second).getbbox())
+
+    def test_variants_are_recolored_once(self):
+        cache = ThemeVariantCache(64 * 1024 * 1024)
+
+        with patch(
+            "statalib.render.theme_variants.recolor_pixels", wraps=recolor_pixels
+        ) as recolor:
+            first = cache.get(THEME_PATH, RANK_RGB, PRESTIGE_RGB)
+            second = cache.get(THEME_PATH, list(RANK_RGB), PRESTIGE_RGB)
+
+        self.assertEqual(recolor.call_count, 1)
+        self.assertImagesEqual(first, _recolored())
+        self.assertImagesEqual(first, second)
+
+        # Callers draw on the variants, which mustn't touch the cached variant
+        first.paste((0, 0, 0, 255), (0, 0, first.width, first.height))
+        self.assertImagesEqual(cache.get(THEME_PATH, RANK_RGB, PRESTIGE_RGB), second)
+
+        metrics = cache.metrics()
+        self.assertEqual(metrics["memory"].hits, 2)
+        self.assertEqual(metrics["memory"].misses, 1)
+
+    def test_disk_tier_survives_restarts(self):
+        with tempfile.TemporaryDirectory() as disk_dir:
+            expected = ThemeVariantCache(64 * 1024 * 1024, disk_dir).get(
+                THEME_PATH, RANK_RGB, PRESTIGE_RGB)
+
+            cache = ThemeVariantCache(64 * 1024 * 1024, disk_dir)
+            with patch("statalib.render.theme_variants.recolor_pixels") as recolor:
+                variant = cache.get(THEME_PATH, RANK_RGB, PRESTIGE_RGB)
+
+            recolor.assert_not_called()
+            self.assertImagesEqual(variant, expected)
+            self.assertEqual(cache.metrics()["disk"].hits, 1)
+
+    def test_warm_requires_disk_tier(self):
+        cache = ThemeVariantCache(64 * 1024 * 1024)
+        _ = cache.get(THEME_PATH, RANK_RGB, PRESTIGE_RGB)
+
+        self.assertEqual(cache.warm(["mosaic"]), 0)
+
+    def test_warm_rendered_combinations(self):
+        background_dirs = [
+            entry.name for entry in os.scandir(f"{REL_PATH}/assets/bg")
+            if ASSET_LOADER.image_file_exists(f"bg/{entry.name}/themes/mosaic.png")
+        ]
+
+        with tempfile.TemporaryDirectory() as disk_dir:
+            _ = ThemeVariantCache(64 * 1024 * 1024, disk_dir).get(
+                THEME_PATH, RANK_RGB, PRESTIGE_RGB)
+
+            # Only the rendered combination is warmed, into the disk tier
+            cache = ThemeVariantCache(64 * 1024 * 1024, disk_dir)
+            self.assertEqual(cache.warm(["mosaic"]), len(background_dirs) - 1)
+            self.assertEqual(cache.warm(["mosaic"]), 0)
+
+            with patch("statalib.render.theme_variants.recolor_pixels") as recolor:
+                for background_dir in background_dirs:
+                    _ = cache.get(
+                        f"bg/{background_dir}/themes/mosaic.png", RANK_RGB, PRESTIGE_RGB)
+
+            recolor.assert_not_called()
+            self.assertEqual(cache.metrics()["disk"].hits, len(background_dirs))
+
+if __name__ == "__main__":
+    unittest.main()
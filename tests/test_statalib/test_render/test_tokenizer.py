@@ -0,0 +1,46 @@
+import unittest
+
+from statalib.assets import ASSET_LOADER
+from statalib.render.splitting import split_string
+from statalib.render.text import get_text_len
+from statalib.render.tokenizer import layout_text, strip_color_codes, tokenize
+
+
+class TestTokenizer(unittest.TestCase):
+    def test_runs_match_split_string(self):
+        texts = (
+            "Hello &aWorld &bPython &cProgramming",
+            "&6[MVP&c++&6] Tester",
+            "&a&bX",
+            "no codes & no colors",
+            "&Zunknown&",
+            ""
+        )
+        codes = ("&0", "&1", "&2", "&3", "&4", "&5", "&6", "&7",
+                 "&8", "&9", "&a", "&b", "&c", "&d", "&e", "&f")
+
+        for text in texts:
+            with self.subTest(text=text):
+                expected = [bit for bit in split_string(text, codes) if bit[0]]
+                runs = [(run.text, run.color_code) for run in tokenize(text)]
+
+                self.assertListEqual(runs, expected)
+                self.assertEqual(
+                    strip_color_codes(text), ''.join(bit[0] for bit in expected))
+
+    def test_run_colors(self):
+        plain, colored = tokenize("a&cb")
+
+        self.assertEqual(plain.rgb, (255, 255, 255))
+        self.assertEqual(colored.rgb, (255, 85, 85))
+        self.assertEqual(colored.shadow_rgb, (63, 21, 21))
+
+    def test_layout_measures_runs(self):
+        font = ASSET_LOADER.load_font("main.ttf", 20)
+        layout = layout_text("&aHello &bWorld", font)
+
+        self.assertTupleEqual(
+            layout.widths,
+            (int(get_text_len("Hello ", font)), int(get_text_len("World", font))))
+        self.assertEqual(layout.length, get_text_len("Hello World", font))
+        self.assertIs(layout_text("&aHello &bWorld", font), layout)
@@ -0,0 +1,128 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+
+from statalib import ModesEnum
+from statalib.render2 import PlaceholderValues, RenderCache, RenderingClient, TSpan
+from statalib.render2.cache import render_cache_key
+
+
+def _placeholders(**text) -> PlaceholderValues:
+    return PlaceholderValues.new(
+        text={"title#text": [TSpan("Wins", fill="#FFFFFF")], **text},
+        images={"skin_model#href": "data:image/png;base64,AAAA"}
+    )
+
+
+class _CountingClient(RenderingClient):
+    def __init__(self, cache: RenderCache) -> None:
+        super().__init__("/bedwars", cache)
+        self.requests = 0
+
+    async def _make_request(
+        self, placeholder_values, background_image, size, speculative=False
+    ) -> bytes:
+        self.requests += 1
+        await asyncio.sleep(0.01)
+        return placeholder_values.text.get("mode#text", "render").encode()
+
+    def placeholder_values(self) -> PlaceholderValues:
+        if self.mode is None:
+            return _placeholders()
+        return _placeholders(**{"mode#text": self.mode.id})
+
+
+class TestRenderCacheKey(unittest.TestCase):
+    def test_key_is_stable(self):
+        first = render_cache_key("bedwars", "regular", _placeholders(a="1", b="2"), b"bg")
+        second = render_cache_key("/bedwars", "regular", _placeholders(b="2", a="1"), b"bg")
+
+        self.assertEqual(first, second)
+
+    def test_key_covers_every_input(self):
+        key = render_cache_key("bedwars", "regular", _placeholders(), b"bg")
+
+        self.assertNotEqual(render_cache_key("session", "regular", _placeholders(), b"bg"), key)
+        self.assertNotEqual(render_cache_key("bedwars", "large", _placeholders(), b"bg"), key)
+        self.assertNotEqual(render_cache_key("bedwars", "regular", _placeholders(), b"bg2"), key)
+        self.assertNotEqual(render_cache_key("bedwars", "regular", _placeholders(), None), key)
+        self.assertNotEqual(render_cache_key("bedwars", "regular", _placeholders(a="1"), b"bg"), key)
+        self.assertNotEqual(
+            render_cache_key("bedwars", "regular", _placeholders(), b"bg", version=2), key)
+
+
+class TestRenderCache(unittest.TestCase):
+    def test_memory_tier(self):
+        cache = RenderCache(memory_size=10, memory_ttl=60)
+
+        async def run() -> list:
+            results = [await cache.get("a")]
+            await cache.set("a", b"12345")
+            await cache.set("b", b"12345678901")  # Larger than the whole tier
+            results.append(await cache.get("a"))
+            results.append(await cache.get("b"))
+            return results
+
+        self.assertListEqual(asyncio.run(run()), [None, b"12345", None])
+
+        metrics = cache.metrics()
+        self.assertEqual(metrics["memory"].hits, 1)
+        self.assertEqual(metrics["memory"].misses, 2)
+
+    def test_disk_tier_is_shared(self):
+        with tempfile.TemporaryDirectory() as disk_dir:
+            writer = RenderCache(memory_size=1024, memory_ttl=60, disk_dir=disk_dir, disk_ttl=60)
+            reader = RenderCache(memory_size=1024, memory_ttl=60, disk_dir=disk_dir, disk_ttl=60)
+
+            asyncio.run(writer.set("abcd", b"render"))
+
+            self.assertEqual(asyncio.run(reader.get("abcd")), b"render")
+            self.assertEqual(asyncio.run(reader.get("abcd")), b"render")
+
+            metrics = reader.metrics()
+            self.assertEqual(metrics["disk"].hits, 1)
+            self.assertEqual(metrics["memory"].hits, 1)
+
+            # Expired renders are pruned
+            path = reader._disk_path("abcd")
+            os.utime(path, (time.time() - 120, time.time() - 120))
+
+            self.assertEqual(reader.prune_disk(), 1)
+            self.assertFalse(os.path.exists(path))
+
+    def test_client_renders_once(self):
+        cache = RenderCache(memory_size=1024, memory_ttl=60)
+        client, other_client = _CountingClient(cache), _CountingClient(cache)
+
+        async def run() -> list[bytes]:
+            return [
+                await client.render(b"bg"),
+                await other_client.render(b"bg"),
+                await client.render(b"bg", bypass_cache=True),
+            ]
+
+        self.assertListEqual(asyncio.run(run()), [b"render"] * 3)
+        self.assertEqual(client.requests + other_client.requests, 2)
+
+    def test_render_modes(self):
+        cache = RenderCache(memory_size=1024, memory_ttl=60)
+        client = _CountingClient(cache)
+        modes = [ModesEnum.SOLOS.value, ModesEnum.DOUBLES.value, ModesEnum.FOURS.value]
+
+        async def run() -> tuple[list[bytes], bytes]:
+            prerender = asyncio.ensure_future(client.render_modes(modes, b"bg"))
+            await asyncio.sleep(0)
+
+            # Selecting a mode while it is being pre-rendered shares the render
+            client.mode = ModesEnum.DOUBLES.value
+            selected = await client.render(b"bg")
+            return await prerender, selected
+
+        renders, selected = asyncio.run(run())
+
+        self.assertListEqual(renders, [b"solos", b"doubles", b"fours"])
+        self.assertEqual(selected, b"doubles")
+        self.assertEqual(client.requests, 3)
+        self.assertEqual(client.mode, ModesEnum.DOUBLES.value)
@@ -0,0 +1,82 @@
+import asyncio
+import os
+import unittest
+from unittest.mock import patch
+
+from statalib.http_sessions import close_sessions
+from statalib.render2 import PlaceholderValues, RenderCache, RendererAssetStore, RenderingClient
+from statalib.render2.assets import asset_digest
+
+from tests.renderer_stub import RendererStub
+
+
+SKIN = b"skin" * 1000
+BACKGROUND = b"background" * 1000
+THEME = b"theme" * 1000
+
+
+class _SkinClient(RenderingClient):
+    def placeholder_values(self) -> PlaceholderValues:
+        placeholder_values = PlaceholderValues.new(text={"title#text": "Wins"})
+        placeholder_values.add_skin_model(SKIN)
+        return placeholder_values
+
+
+def _render_many(stub: RendererStub, store: RendererAssetStore, backgrounds: list, between=None):
+    async def run() -> list[bytes]:
+        with patch.dict(os.environ, {"RENDERER_HOSTNAME": await stub.start()}):
+            client = _SkinClient("bedwars", RenderCache(1, 1), store)
+            renders = []
+
+            try:
+                for background in backgrounds:
+                    renders.append(await client.render(background, bypass_cache=True))
+                    if between is not None:
+                        between()
+            finally:
+                await close_sessions()
+                await stub.stop()
+
+            return renders
+
+    return asyncio.run(run())
+
+
+class TestRendererAssets(unittest.TestCase):
+    def test_assets_are_uploaded_once(self):
+        inline_stub, stub = RendererStub(), RendererStub()
+
+        inline = _render_many(inline_stub, RendererAssetStore(enabled=False), [BACKGROUND] * 3)
+        by_ref = _render_many(stub, RendererAssetStore(theme_refs=False), [BACKGROUND] * 3)
+
+        self.assertListEqual(by_ref, inline)
+        self.assertEqual(stub.stats.uploads, 2)
+        self.assertEqual(stub.stats.renders, 3)
+        self.assertLess(stub.stats.bytes_received, inline_stub.stats.bytes_received / 2)
+
+    def test_themes_are_referenced_by_id(self):
+        stub = RendererStub(themes={"cold_feet": THEME})
+
+        with patch(
+            "statalib.render2.assets.theme_asset_ids",
+            return_value={asset_digest(THEME): "cold_feet"}
+        ):
+            renders = _render_many(stub, RendererAssetStore(), [THEME])
+
+        inline = _render_many(RendererStub(), RendererAssetStore(enabled=False), [THEME])
+
+        self.assertListEqual(renders, inline)
+        self.assertNotIn(f"/assets/{asset_digest(THEME)}", stub.stats.paths)
+
+    def test_missing_assets_fall_back_to_inline(self):
+        stub = RendererStub()
+        store = RendererAssetStore(theme_refs=False)
+
+        # The server forgets every asset after each render, the second render
+        # misses them and the third uploads them again
+        renders = _render_many(stub, store, [BACKGROUND] * 3, stub.assets.clear)
+
+        self.assertEqual(len(set(renders)), 1)
+        self.assertEqual(stub.stats.missing, 1)
+        self.assertEqual(stub.stats.renders, 3)
+        self.assertEqual(stub.stats.uploads, 4)
@@ -0,0 +1,256 @@
+import asyncio
+import os
+import unittest
+from unittest.mock import patch
+
+from aiohttp import ClientConnectionError, web
+
+from statalib.errors import RendererUnavailableError
+from statalib.http_sessions import close_sessions
+from statalib.render2 import PlaceholderValues, RenderCache, RendererAssetStore, RenderingClient
+from statalib.render2.resilience import CircuitBreaker, LatencyHistogram, RendererPool
+
+from tests.renderer_stub import RendererStub
+
+
+class _Client(RenderingClient):
+    def placeholder_values(self) -> PlaceholderValues:
+        return PlaceholderValues.new(text={"title#text": "Wins"})
+
+
+def _failing_middleware():
+    @web.middleware
+    async def fail(request: web.Request, handler):
+        return web.Response(status=503)
+
+    return fail
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles_and_buckets(self):
+        histogram = LatencyHistogram()
+        self.assertIsNone(histogram.percentile(99))
+
+        for i in range(1, 101):
+            histogram.observe(i / 100)
+
+        self.assertAlmostEqual(histogram.percentile(50), 0.51)
+        self.assertAlmostEqual(histogram.percentile(99), 1.0)
+
+        buckets = histogram.buckets()
+        self.assertEqual(buckets["0.025"], 2)
+        self.assertEqual(buckets["1"], 50)
+        self.assertEqual(buckets["+Inf"], 0)
+        self.assertEqual(sum(buckets.values()), 100)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_and_probes(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "closed")
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
+        self.assertFalse(breaker.allow())
+
+        # Only a single probe is let through once the reset timeout passes
+        breaker.opened_at -= 30
+        self.assertEqual(breaker.state, "half_open")
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
+
+        breaker.opened_at -= 30
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, "closed")
+
+
+class TestRendererPool(unittest.TestCase):
+    def test_adaptive_timeout(self):
+        pool = RendererPool(["a"], {"min_timeout": 0.1, "max_timeout": 10})
+        replica = pool.replicas[0]
+        self.assertEqual(replica.timeout, 10)
+
+        for _ in range(50):
+            replica.latencies.observe(0.2)
+
+        self.assertAlmostEqual(replica.timeout, 0.4)
+
+    def test_timeout_adapts_to_slower_replica(self):
+        pool = RendererPool(["a"], {
+            "min_timeout": 0.05, "max_timeout": 2, "failure_threshold": 100, "max_attempts": 1})
+        replica = pool.replicas[0]
+
+        for _ in range(30):
+            replica.latencies.observe(0.01)
+        self.assertAlmostEqual(replica.timeout, 0.05)
+
+        async def send(host: str) -> str:
+            await asyncio.sleep(0.15)
+            return host
+
+        async def run() -> int:
+            for attempt in range(1, 10):
+                try:
+                    await pool.request(send)
+                    return attempt
+                except RendererUnavailableError:
+                    continue
+
+        # Timeouts are observed, so the timeout grows until the replica keeps up
+        self.assertLess(asyncio.run(run()), 5)
+        self.assertGreater(replica.timeout, 0.15)
+
+    def test_probe_uses_max_timeout(self):
+        pool = RendererPool(["a"], {
+            "min_timeout": 0.05, "max_timeout": 2, "failure_threshold": 1, "max_attempts": 1})
+        replica = pool.replicas[0]
+
+        for _ in range(30):
+            replica.latencies.observe(0.01)
+
+        replica.breaker.record_failure()
+        replica.breaker.opened_at -= replica.breaker.reset_timeout
+
+        async def send(host: str) -> str:
+            await asyncio.sleep(0.15)
+            return host
+
+        self.assertEqual(asyncio.run(pool.request(send)), "a")
+        self.assertEqual(replica.breaker.state, "closed")
+
+    def test_fails_over_and_fails_fast(self):
+        pool = RendererPool(["bad", "good"], {"failure_threshold": 2})
+        sent = []
+
+        async def send(host: str) -> str:
+            sent.append(host)
+            if host == "bad":
+                raise ClientConnectionError()
+            return host
+
+        async def run():
+            return [await pool.request(send) for _ in range(4)]
+
+        self.assertListEqual(asyncio.run(run()), ["good"] * 4)
+
+        # The bad replica's breaker opens, so it isn't tried anymore
+        self.assertEqual(sent.count("bad"), 2)
+        states = {metrics.host: metrics.state for metrics in pool.metrics()}
+        self.assertDictEqual(states, {"bad": "open", "good": "closed"})
+
+        for _ in range(2):
+            pool.replicas[1].breaker.record_failure()
+        with self.assertRaises(RendererUnavailableError):
+            asyncio.run(pool.request(send))
+
+    def test_client_errors_do_not_open_breaker(self):
+        pool = RendererPool(["a", "b"], {"failure_threshold": 1})
+
+        async def send(host: str) -> str:
+            raise ValueError(host)
+
+        with self.assertRaises(ValueError):
+            asyncio.run(pool.request(send))
+
+        self.assertTrue(all(metrics.state == "closed" for metrics in pool.metrics()))
+        self.assertEqual(sum(metrics.requests for metrics in pool.metrics()), 1)
+
+    def test_hedges_slow_requests(self):
+        pool = RendererPool(["slow", "fast"], {"hedge": True})
+        pool.replicas[1].in_flight = 1  # Routes to the slow replica first
+
+        for replica in pool.replicas:
+            for _ in range(50):
+                replica.latencies.observe(0.01)
+
+        async def send(host: str) -> str:
+            await asyncio.sleep(5 if host == "slow" else 0)
+            return host
+
+        async def run():
+            return await asyncio.wait_for(pool.request(send), 1)
+
+        self.assertEqual(asyncio.run(run()), "fast")
+
+        slow, fast = pool.metrics()
+        self.assertEqual(fast.hedges, 1)
+        self.assertEqual(slow.in_flight, 0)
+        self.assertEqual(slow.state, "closed")
+
+    def test_speculative_requests_leave_breaker_alone(self):
+        pool = RendererPool(["a", "b"], {"failure_threshold": 1, "hedge": True})
+        sent = []
+
+        async def fail(host: str) -> str:
+            sent.append(host)
+            raise ClientConnectionError()
+
+        with self.assertRaises(RendererUnavailableError):
+            asyncio.run(pool.request(fail, speculative=True))
+
+        self.assertTrue(all(metrics.state == "closed" for metrics in pool.metrics()))
+
+        # Half open breakers keep their probe for interactive requests
+        pool.replicas[0].breaker.record_failure()
+        pool.replicas[0].breaker.opened_at -= pool.replicas[0].breaker.reset_timeout
+        sent.clear()
+
+        async def send(host: str) -> str:
+            sent.append(host)
+            return host
+
+        self.assertEqual(asyncio.run(pool.request(send, speculative=True)), "b")
+        self.assertListEqual(sent, ["b"])
+        self.assertEqual(pool.replicas[0].breaker.state, "half_open")
+        self.assertFalse(pool.replicas[0].breaker.probing)
+
+    def test_speculative_concurrency(self):
+        pool = RendererPool(["a"], {"speculative_concurrency": 2})
+        in_flight = peak = 0
+
+        async def send(host: str) -> str:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return host
+
+        async def run():
+            await asyncio.gather(*(pool.request(send, speculative=True) for _ in range(6)))
+
+        asyncio.run(run())
+        self.assertEqual(peak, 2)
+
+    def test_client_renders_with_healthy_replica(self):
+        bad, good = RendererStub(), RendererStub()
+
+        async def run() -> list[bytes]:
+            hosts = f"{await bad.start([_failing_middleware()])},{await good.start()}"
+            pool = RendererPool(settings={"failure_threshold": 1})
+
+            with patch.dict(os.environ, {"RENDERER_HOSTNAME": hosts}):
+                client = _Client(
+                    "bedwars", RenderCache(1, 1), RendererAssetStore(enabled=False), pool)
+
+                try:
+                    return [await client.render(bypass_cache=True) for _ in range(3)]
+                finally:
+                    await close_sessions()
+                    await bad.stop()
+                    await good.stop()
+
+        renders = asyncio.run(run())
+
+        self.assertEqual(len(set(renders)), 1)
+        self.assertEqual(good.stats.renders, 3)
+        self.assertEqual(len(bad.stats.paths), 0)  # Rejected by the middleware
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+
+from statalib import db, reset_slots
+from statalib.accounts import Account
+from statalib.rotational_stats import (
+    ConfiguredResetTimeManager,
+    DefaultResetTimeManager,
+    ResetTime,
+    RotationalStatsManager
+)
+
+from tests.utils import clean_database, MockData, link_mock_data
+
+
+def _slots(uuid: str=MockData.uuid) -> list[int]:
+    with db.transaction() as conn:
+        rows = conn.execute(
+            "SELECT reset_slot FROM reset_slots WHERE uuid = ? ORDER BY reset_slot",
+            (uuid,)).fetchall()
+    return [row[0] for row in rows]
+
+
+class TestResetSlots(unittest.TestCase):
+    def setUp(self) -> None:
+        clean_database()
+        RotationalStatsManager(MockData.uuid).initialize_rotational_tracking({})
+        DefaultResetTimeManager(MockData.uuid).update(ResetTime(-5, 23, 30))
+
+    def test_default_reset_time(self):
+        # 23:30 at UTC-5 is 04:30 UTC
+        self.assertListEqual(_slots(), [4*60 + 30])
+
+        DefaultResetTimeManager(MockData.uuid).update(ResetTime(reset_hour=1))
+        self.assertListEqual(_slots(), [6*60 + 30])
+
+    def test_untracked_player_has_no_slot(self):
+        DefaultResetTimeManager(MockData.uuid_2).update(ResetTime(0, 1, 0))
+        self.assertListEqual(_slots(MockData.uuid_2), [])
+
+    def test_linking_and_configured_reset_time(self):
+        ConfiguredResetTimeManager(MockData.discord_id).update(ResetTime(2, 12, 15))
+        self.assertListEqual(_slots(), [4*60 + 30])
+
+        link_mock_data()
+        self.assertListEqual(_slots(), [10*60 + 15])
+
+        ConfiguredResetTimeManager(MockData.discord_id).remove()
+        self.assertListEqual(_slots(), [4*60 + 30])
+
+        ConfiguredResetTimeManager(MockData.discord_id).update(ResetTime(2, 12, 15))
+        Account(MockData.discord_id).linking.unlink_account()
+        self.assertListEqual(_slots(), [4*60 + 30])
+
+    def test_relinking_refreshes_previous_player(self):
+        RotationalStatsManager(MockData.uuid_2).initialize_rotational_tracking({})
+        ConfiguredResetTimeManager(MockData.discord_id).update(ResetTime(0, 12, 0))
+
+        link_mock_data()
+        Account(MockData.discord_id).linking.set_linked_player(MockData.uuid_2)
+
+        self.assertListEqual(_slots(), [4*60 + 30])
+        self.assertListEqual(_slots(MockData.uuid_2), [12*60])
+
+    def test_consistent_with_reset_time_query(self):
+        players = {
+            f"uuid-{i}": reset_time for i, reset_time in enumerate(
+                [(-12, 0, 0), (-5, 23, 59), (0, 0, 1), (3, 2, 45), (14, 13, 7), (12, 23, 0)])
+        }
+
+        with db.transaction() as conn:
+            cursor = conn.cursor()
+            for uuid, reset_time in players.items():
+                cursor.execute(
+                    "INSERT INTO rotational_info (uuid, rotation, last_reset_timestamp, "
+                    "snapshot_id) VALUES (?, 'daily', 0, ?)", (uuid, uuid))
+                cursor.execute(
+                    "INSERT INTO default_reset_times VALUES (?, ?, ?, ?)",
+                    (uuid, *reset_time))
+
+            # Inserted directly, so they are inconsistent until rebuilt
+            self.assertTrue(reset_slots.check_reset_slot_consistency(cursor=cursor))
+
+            reset_slots.rebuild_reset_slots(cursor=cursor)
+            self.assertDictEqual(reset_slots.check_reset_slot_consistency(cursor=cursor), {})
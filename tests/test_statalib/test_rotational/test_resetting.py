@@ -3,6 +3,10 @@ from datetime import datetime, UTC
 
 from statalib.accounts import Account
 from statalib.rotational_stats import (
+    ConfiguredResetTimeManager,
+    DefaultResetTimeManager,
+    ResetTime,
+    get_due_auto_reset_candidates,
     has_auto_reset_access,
     RotationalStatsManager,
     RotationType,
@@ -88,3 +92,48 @@ class TestRotationalResetting(unittest.TestCase):
 
         result = self.manager.get_rotational_data(RotationType.DAILY)
         assert result.data.final_kills_bedwars == 1  # New data
+
+
+class TestDueAutoResetCandidates(unittest.TestCase):
+    manager = RotationalStatsManager(MockData.uuid)
+
+    def setUp(self) -> None:
+        clean_database()
+        self.manager.initialize_rotational_tracking(mock_hypixel_data_1)
+        DefaultResetTimeManager(MockData.uuid).update(ResetTime(-5, 23, 30))
+
+    def _due_uuids(self, hour: int, minute: int, cfg: dict) -> list[str]:
+        utc_now = datetime(2024, 1, 1, hour, minute, tzinfo=UTC)
+        return [c.uuid for c in get_due_auto_reset_candidates(utc_now, cfg)]
+
+    def test_default_reset_time_wraps_around(self):
+        cfg = auto_reset_config.copy()
+        cfg["uuid_whitelist"] = [MockData.uuid]
+
+        # 23:30 at UTC-5 is 04:30 UTC
+        self.assertListEqual(self._due_uuids(4, 30, cfg), [MockData.uuid])
+        self.assertListEqual(self._due_uuids(23, 30, cfg), [])
+
+    def test_configured_reset_time_overrides_default(self):
+        link_mock_data()
+        ConfiguredResetTimeManager(MockData.discord_id).update(ResetTime(0, 12, 0))
+        Account(MockData.discord_id).permissions \
+            .add_permission("automatic_tracker_reset")
+
+        candidates = get_due_auto_reset_candidates(
+            datetime(2024, 1, 1, 12, 0, tzinfo=UTC), auto_reset_config)
+
+        self.assertEqual(len(candidates), 1)
+        self.assertEqual(candidates[0].reset_time, ResetTime(0, 12, 0))
+        self.assertListEqual(self._due_uuids(4, 30, auto_reset_config), [])
+
+    def test_access_matches_has_auto_reset_access(self):
+        link_mock_data()
+        self.assertListEqual(self._due_uuids(4, 30, auto_reset_config), [])
+
+        Account(MockData.discord_id).permissions.add_permission("*")
+        self.assertListEqual(self._due_uuids(4, 30, auto_reset_config), [MockData.uuid])
+
+        cfg = auto_reset_config.copy()
+        cfg["allow_star_permission"] = False
+        self.assertListEqual(self._due_uuids(4, 30, cfg), [])
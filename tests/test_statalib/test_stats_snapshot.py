@@ -0,0 +1,63 @@
+import unittest
+
+from statalib import ModesEnum
+from statalib.hypixel import CumulativeStats
+from statalib.stats_snapshot import BedwarsStatsSnapshot
+
+
+def _snapshot(snapshot_id: str, offset: int=0) -> BedwarsStatsSnapshot:
+    stats = [i + offset for i in range(len(BedwarsStatsSnapshot.keys(False)))]
+    return BedwarsStatsSnapshot(snapshot_id, *stats)
+
+
+class TestBedwarsStatsSnapshot(unittest.TestCase):
+    def test_construction(self):
+        positional = _snapshot("a")
+        named = BedwarsStatsSnapshot("a", **positional.as_dict(include_snapshot_id=False))
+
+        self.assertEqual(positional, named)
+        self.assertEqual(named.Experience, 0)
+        self.assertEqual(named.two_four_items_purchased_bedwars, 60)
+        self.assertIsInstance(named.wins_bedwars, int)
+
+        with self.assertRaises(TypeError):
+            BedwarsStatsSnapshot("a", Experience=1)
+
+    def test_from_row_and_as_tuple(self):
+        row = ("a", None, *range(1, len(BedwarsStatsSnapshot.keys(False))))
+        snapshot = BedwarsStatsSnapshot.from_row(row)
+
+        self.assertEqual(snapshot.as_tuple(), ("a", 0, *row[2:]))
+        self.assertEqual(snapshot.as_dict()["snapshot_id"], "a")
+        self.assertEqual(snapshot.snapshot_id, "a")  # as_dict must not mutate
+
+    def test_subtraction(self):
+        current = _snapshot("a", offset=10)
+        current.wins_bedwars = 100
+        difference = current - _snapshot("b")
+
+        self.assertIsNone(difference.snapshot_id)
+        self.assertEqual(difference.wins_bedwars, 99)
+        self.assertEqual(difference.Experience, 10)
+
+    def test_mode_view(self):
+        snapshot = BedwarsStatsSnapshot.from_bedwars_data(
+            {"eight_one_wins_bedwars": 5, "wins_bedwars": 7})
+
+        self.assertEqual(snapshot.mode_view(ModesEnum.SOLOS.value)["wins_bedwars"], 5)
+        self.assertEqual(snapshot.mode_view("").get("wins_bedwars"), 7)
+
+        dreams = snapshot.mode_view(ModesEnum.DREAMS_OVERALL.value)
+        self.assertFalse(dreams.is_tracked)
+        self.assertEqual(dreams.get("wins_bedwars"), 0)
+
+    def test_cumulative_stats(self):
+        bedwars_data = {key: value * 2 for key, value in _snapshot("a").as_dict(False).items()}
+        hypixel_data = {"player": {"stats": {"Bedwars": bedwars_data}}}
+
+        overall = CumulativeStats(hypixel_data, _snapshot("a"))
+        self.assertEqual(overall.wins_cum, _snapshot("a").wins_bedwars)
+        self.assertEqual(overall.most_played_cum, "4v4")
+
+        solos = CumulativeStats(hypixel_data, _snapshot("a"), ModesEnum.SOLOS.value)
+        self.assertEqual(solos.final_kills_cum, _snapshot("a").eight_one_final_kills_bedwars)
@@ -0,0 +1,69 @@
+import asyncio
+import unittest
+
+from statalib.usage import CommandMetricsRepo, CommandUsageBuffer, command_usage_buffer
+
+from tests.utils import clean_database, MockData
+
+
+class TestCommandUsageBuffer(unittest.TestCase):
+    def setUp(self) -> None:
+        clean_database()
+        command_usage_buffer.flush()
+
+    def tearDown(self) -> None:
+        command_usage_buffer.flush()
+
+    def test_buffered_usage_is_counted(self):
+        CommandMetricsRepo.record_command_usage("session", MockData.discord_id)
+        CommandMetricsRepo.record_command_usage("session", MockData.discord_id)
+        CommandMetricsRepo.record_command_usage("bedwars", MockData.discord_id_2)
+
+        self.assertEqual(CommandMetricsRepo.get_usage(), 3)
+        self.assertEqual(CommandMetricsRepo.get_usage(command_id="session"), 2)
+        self.assertEqual(
+            CommandMetricsRepo.get_usage(discord_user_id=MockData.discord_id_2), 1)
+
+    def test_flush_aggregates_rows(self):
+        CommandMetricsRepo.update_command_usage("session", MockData.discord_id)
+        for _ in range(3):
+            CommandMetricsRepo.record_command_usage("session", MockData.discord_id)
+        CommandMetricsRepo.record_command_usage("bedwars", MockData.discord_id)
+
+        self.assertEqual(CommandMetricsRepo.flush_command_usage(), 2)
+        self.assertEqual(command_usage_buffer.pending(), 0)
+        self.assertEqual(CommandMetricsRepo.get_usage(command_id="session"), 4)
+        self.assertEqual(CommandMetricsRepo.get_usage(command_id="bedwars"), 1)
+
+    def test_max_pending_forces_flush(self):
+        buffer = CommandUsageBuffer(max_pending=2)
+        buffer.add("session", MockData.discord_id)
+        self.assertEqual(buffer.pending(), 1)
+
+        buffer.add("bedwars", MockData.discord_id)
+        self.assertEqual(buffer.pending(), 0)
+        self.assertEqual(CommandMetricsRepo.get_usage(), 2)
+
+    def test_max_age_forces_flush(self):
+        buffer = CommandUsageBuffer(max_age=0)
+        buffer.add("session", MockData.discord_id)
+
+        self.assertEqual(buffer.pending(), 0)
+        self.assertEqual(CommandMetricsRepo.get_usage(), 1)
+
+    def test_forced_flush_does_not_block_event_loop(self):
+        buffer = CommandUsageBuffer(max_pending=2)
+
+        async def run() -> int:
+            buffer.add("session", MockData.discord_id)
+            buffer.add("bedwars", MockData.discord_id)
+
+            # The flush runs in a worker thread rather than inside of add
+            self.assertEqual(buffer.pending(), 2)
+            self.assertEqual(CommandMetricsRepo.get_usage(), 0)
+
+            while buffer.pending():
+                await asyncio.sleep(0.01)
+            return CommandMetricsRepo.get_usage()
+
+        self.assertEqual(asyncio.run(run()), 2)